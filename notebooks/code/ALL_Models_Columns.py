@@ -15,29 +15,29 @@ Project: AI-Liver-Diseases-Diagnosis-System
 
 
 Description:
-    This script automatically downloads ALL serialized machine learning models
-    from the AiLDS GitHub repository (including Cancer, Fatty Liver, Gate, and Hepatitis 3-modules).
+    This script loads ALL serialized machine learning models through the local
+    model registry (including Cancer, Fatty Liver, Gate, and Hepatitis 3-modules).
 
     It extracts and displays the exact feature signature (input columns) required
     for each model to ensure strict alignment between the web interface and the AI backend.
-"""
 
-import joblib
-import os
-import requests
-import sys
+    The signature is read from the feature manifest written at train time
+    (models/<artifact>.features.json) without loading the model; artifacts
+    without a manifest fall back to probing the unpickled model.
+"""
 
+from model_registry import MODEL_FILES, get_registry
+from feature_manifest import read_feature_manifest
 
-REPO_BASE_URL = "https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/models/"
 
-# Registry of all models found in the 'models/' directory
+# Display name -> logical name in the shared model registry (models/ directory)
 MODEL_REGISTRY = {
-    "1. Gate Model (Dispatcher)": "gate_model.pkl",
-    "2. Liver Cancer Model": "cancer_model.pkl",
-    "3. Fatty Liver Model": "fatty_liver_model.pkl",
-    "4. Hepatitis C Stage Model": "hepatitisC_stage_model.pkl",
-    "5. Hepatitis C Status Model": "hepatitisC_status_model.pkl",
-    "6. Hepatitis Complications": "hepatitis_complications.pkl"
+    "1. Gate Model (Dispatcher)": "gate",
+    "2. Liver Cancer Model": "cancer",
+    "3. Fatty Liver Model": "fatty_liver",
+    "4. Hepatitis C Stage Model": "hcv_stage",
+    "5. Hepatitis C Status Model": "hcv_status",
+    "6. Hepatitis Complications": "hcv_complications"
 }
 
 LOCAL_DIR = "models/"
@@ -46,32 +46,18 @@ LOCAL_DIR = "models/"
 # CORE FUNCTIONS
 # ==========================================
 
-def fetch_model(filename):
-    """Downloads the model from GitHub if it does not exist locally."""
-    local_path = os.path.join(LOCAL_DIR, filename)
-    url = REPO_BASE_URL + filename
-
-    if not os.path.exists(local_path):
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        try:
-            print(f"  Downloading {filename}...")
-            response = requests.get(url)
-            response.raise_for_status()
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f" Error downloading {filename}: {e}")
-            return False
-    return True
-
-def get_feature_names(file_path):
+def get_feature_names(name):
     """
-    Intelligently extracts feature names from various model types
-    (Sklearn Pipeline, XGBoost, RandomForest, etc.).
+    Returns the feature order from the model's manifest, or intelligently
+    extracts it from various model types (Sklearn Pipeline, XGBoost,
+    RandomForest, etc.) when no manifest exists.
     """
+    manifest = read_feature_manifest(name, LOCAL_DIR)
+    if manifest is not None:
+        return [f['name'] for f in manifest['features']]
+
     try:
-        model = joblib.load(file_path)
+        model = get_registry(LOCAL_DIR).get(name)
         features = []
 
         # Case A: Scikit-Learn Estimators (Standard)
@@ -104,20 +90,17 @@ def get_feature_names(file_path):
 def run_full_audit():
     print(f"\n{'='*70}")
     print(f" AiLDS Full System Model Inspector")
-    print(f"   Target Repository: {REPO_BASE_URL}")
+    print(f"   Model Directory: {LOCAL_DIR}")
     print(f"{'='*70}\n")
 
-    for display_name, filename in MODEL_REGISTRY.items():
-        local_path = os.path.join(LOCAL_DIR, filename)
-
-        # 1. Download
-        if not fetch_model(filename):
-            continue
+    for display_name, name in MODEL_REGISTRY.items():
+        filename = MODEL_FILES[name]
 
-        # 2. Extract
-        features = get_feature_names(local_path)
+        # 1. Read the signature (manifest, else load & extract)
+        manifest = read_feature_manifest(name, LOCAL_DIR)
+        features = get_feature_names(name)
 
-        # 3. Report
+        # 2. Report
         print(f"   {display_name}")
         print(f"   File: {filename}")
 
@@ -125,8 +108,14 @@ def run_full_audit():
             print(f"   Input Features Required: {len(features)}")
             print(f"   Feature Order:")
             # Print features in a neat grid or list
-            for i, feat in enumerate(features, 1):
-                print(f"      {i:02d}. {feat}")
+            if manifest is not None:
+                for i, feat in enumerate(manifest['features'], 1):
+                    print(f"      {i:02d}. {feat['name']:<40} {feat['dtype']:<8} [{feat['min']:g}, {feat['max']:g}]")
+                for feat, sources in manifest['engineered'].items():
+                    print(f"      * {feat} <- {', '.join(sources)}")
+            else:
+                for i, feat in enumerate(features, 1):
+                    print(f"      {i:02d}. {feat}")
         else:
             print(f"     Warning: Could not extract features automatically.")
             print(f"       Debug Info: {features}")
@@ -0,0 +1,91 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Dataset load benchmark: `pd.read_csv` vs the memory-mapped columnar cache
+    (dataset_store.load_dataset) for every file in data/processed/.
+    Every measurement runs in a fresh Python process with pandas already
+    imported. Reported: median time to a usable DataFrame, time including a
+    full pass over every column, and the resident memory added.
+
+    The cache is built first if missing (`python dataset_store.py`).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import read_rss_mb
+
+REPEATS = 5
+
+def child(filename, method):
+    """Loads one dataset in this (fresh) process and prints timing/memory as JSON."""
+    import numpy as np
+    import pandas as pd
+    from dataset_store import DATA_DIR, load_dataset
+
+    rss_before = read_rss_mb()
+    start = time.perf_counter()
+    if method == 'csv':
+        df = pd.read_csv(os.path.join(DATA_DIR, filename))
+    else:
+        df = load_dataset(filename)
+    opened = time.perf_counter() - start
+
+    # Full pass: forces every mapped page in
+    for column in df.columns:
+        np.nansum(pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64))
+    touched = time.perf_counter() - start
+    print(json.dumps({'open': opened, 'touched': touched, 'rss_mb': read_rss_mb() - rss_before}))
+
+def measure(filename, method):
+    runs = []
+    for _ in range(REPEATS):
+        out = subprocess.run(
+            [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', filename, method],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r['open'])
+    return runs[len(runs) // 2]
+
+def run_benchmark():
+    from dataset_store import build_cache, processed_files, read_schema
+
+    print(f"Dataset load benchmark (median of {REPEATS} fresh processes per cell)\n")
+    print(f"{'Dataset':<40} | {'Method':<6} | {'Open (ms)':>9} | {'Open + full pass (ms)':>21} | "
+          f"{'RSS added (MB)':>14} | {'Speedup':>7}")
+    print("-" * 112)
+    for filename in processed_files():
+        if read_schema(filename) is None:
+            build_cache(filename)
+        csv = measure(filename, 'csv')
+        mmap = measure(filename, 'mmap')
+        for method, r in (('csv', csv), ('mmap', mmap)):
+            speedup = f"{csv['open'] / r['open']:>6.1f}x" if method == 'mmap' else ''
+            print(f"{filename:<40} | {method:<6} | {r['open']*1000:>9.2f} | {r['touched']*1000:>21.2f} | "
+                  f"{r['rss_mb']:>14.2f} | {speedup:>7}")
+    print("-" * 112)
+    print("Open = time to a usable DataFrame; full pass = open + reading every column once.")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        run_benchmark()
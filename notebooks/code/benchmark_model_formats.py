@@ -0,0 +1,91 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Startup benchmark: pickle (joblib) vs native XGBoost (UBJSON + sidecar).
+    Every measurement runs in a fresh Python process, so "cold load" includes
+    the library imports each format drags in (sklearn for Pipelines, etc.).
+    Reported: median cold-load time, pure deserialization time and the
+    resident memory added by the load.
+
+    Run `python native_models.py --export` first.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import read_rss_mb
+
+REPEATS = 3
+
+def child(name, fmt):
+    """Loads one model in this (fresh) process and prints timing/memory as JSON."""
+    from model_registry import MODEL_FILES
+
+    # 1. Cold: imports the format needs + first load
+    rss_before = read_rss_mb()
+    start = time.perf_counter()
+    if fmt == 'pickle':
+        import joblib
+        load = lambda: joblib.load(os.path.join('models', MODEL_FILES[name]))
+    else:
+        from native_models import load_native_model
+        load = lambda: load_native_model(name)
+    load()
+    cold = time.perf_counter() - start
+    rss = read_rss_mb() - rss_before
+
+    # 2. Deserialize only: repeat the load with every module already imported
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    print(json.dumps({'cold': cold, 'deserialize': sorted(timings)[2], 'rss_mb': rss}))
+
+def measure(name, fmt):
+    runs = []
+    for _ in range(REPEATS):
+        out = subprocess.run(
+            [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', name, fmt],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r['cold'])
+    return runs[len(runs) // 2]
+
+def run_benchmark():
+    from model_registry import MODEL_FILES
+
+    print(f"Cold-load benchmark (median of {REPEATS} fresh processes per cell)\n")
+    print(f"{'Model':<18} | {'Format':<6} | {'Cold load (ms)':>14} | {'Deserialize (ms)':>16} | {'RSS added (MB)':>14}")
+    print("-" * 82)
+    for name in MODEL_FILES:
+        for fmt in ('pickle', 'native'):
+            r = measure(name, fmt)
+            print(f"{name:<18} | {fmt:<6} | {r['cold']*1000:>14.1f} | "
+                  f"{r['deserialize']*1000:>16.2f} | {r['rss_mb']:>14.1f}")
+    print("-" * 82)
+    print("Cold load includes library imports; Deserialize is a repeat load in the same process.")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        run_benchmark()
@@ -0,0 +1,92 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Load test for inference_service.py.
+    Opens N concurrent keep-alive connections, each sending single-patient
+    requests back to back, and reports throughput, p50/p99 latency and the
+    average micro-batch size the service formed (from GET /stats).
+
+    Usage (service must be running):
+        python benchmark_service.py --endpoint hcv --concurrency 64 --requests 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_inputs import sample_inputs
+
+async def http_call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    header = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    for line in header.decode('latin-1').split('\r\n'):
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+async def client(host, port, path, rows, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for row in rows:
+        start = time.perf_counter()
+        await http_call(reader, writer, 'POST', path, {'features': row.tolist()})
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def run_load_test(host, port, endpoint, concurrency, requests_per_client):
+    reader, writer = await asyncio.open_connection(host, port)
+    before = (await http_call(reader, writer, 'GET', '/stats'))[endpoint]
+
+    rows = sample_inputs(endpoint, concurrency * requests_per_client).to_numpy(dtype=float)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, f'/predict/{endpoint}',
+               rows[i * requests_per_client:(i + 1) * requests_per_client], latencies)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    after = (await http_call(reader, writer, 'GET', '/stats'))[endpoint]
+    writer.close()
+
+    ms = np.array(latencies) * 1000
+    batches = after['batches'] - before['batches']
+    print(f"Endpoint:        /predict/{endpoint}")
+    print(f"Concurrency:     {concurrency} clients x {requests_per_client} requests")
+    print(f"Throughput:      {len(ms) / elapsed:,.0f} requests/s")
+    print(f"Latency:         p50 {np.percentile(ms, 50):.2f} ms | p99 {np.percentile(ms, 99):.2f} ms")
+    print(f"Model calls:     {batches} (avg batch {(after['requests'] - before['requests']) / max(batches, 1):.1f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the AiLDS inference service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--endpoint', default='hcv', choices=['gate', 'fatty_liver', 'cancer', 'hcv'])
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=50, help="Requests per client")
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.host, args.port, args.endpoint, args.concurrency, args.requests))
@@ -0,0 +1,116 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Single-patient latency (p50 / p99): the current DataFrame path used by the
+    test_* scripts (`pd.DataFrame([...], columns=...)` + `predict_proba`) vs the
+    FastPredictor path (plain vector -> preallocated buffer -> inplace_predict).
+    Each call scores a different patient, cycling through resampled rows.
+
+    --cache: replays every model's processed dataset once, row by row in file
+    order (real panels, no resampling), through FastPredictor with and without
+    the split-bin cache, and reports hits / misses / evictions and total time.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_registry import MODEL_FILES, get_registry
+from model_inputs import input_columns, load_panel, panel_dataset, sample_inputs
+from fast_predictor import CACHE_SIZE, FastPredictor, get_fast_predictor
+from benchmark_utils import time_calls, latency_summary
+
+CALLS = 2000
+
+def run_benchmark():
+    registry = get_registry('models')
+
+    print(f"Single-patient latency over {CALLS} calls per path\n")
+    print(f"{'Model':<18} | {'DataFrame p50':>13} | {'DataFrame p99':>13} | "
+          f"{'Fast p50':>9} | {'Fast p99':>9} | {'p50 Speedup':>11}")
+    print("-" * 90)
+    for name in MODEL_FILES:
+        model = registry.get(name)
+        fast = get_fast_predictor(name, cache_size=0)  # Uncached: resampled rows repeat
+        columns = fast.feature_names
+        rows = sample_inputs(name, CALLS).to_numpy(dtype=np.float64)
+
+        # Parity on every sampled row
+        expected = model.predict_proba(pd.DataFrame(rows, columns=columns))
+        got = np.array([fast.predict_proba_one(r) for r in rows])
+        if not np.allclose(expected, got, atol=1e-6):
+            raise ValueError(f"FastPredictor output for '{name}' differs from predict_proba.")
+
+        state = {'i': 0}
+        def next_row():
+            state['i'] = (state['i'] + 1) % CALLS
+            return rows[state['i']]
+
+        df_path = latency_summary(time_calls(
+            lambda: model.predict_proba(pd.DataFrame([next_row()], columns=columns)), CALLS))
+        fast_path = latency_summary(time_calls(lambda: fast.predict_proba_one(next_row()), CALLS))
+
+        print(f"{name:<18} | {df_path['p50_ms']:>10.3f} ms | {df_path['p99_ms']:>10.3f} ms | "
+              f"{fast_path['p50_ms']:>6.3f} ms | {fast_path['p99_ms']:>6.3f} ms | "
+              f"{df_path['p50_ms'] / fast_path['p50_ms']:>10.1f}x")
+    print("-" * 90)
+
+def cache_report(cache_size=CACHE_SIZE):
+    """Split-bin cache on each model's real dataset rows, replayed once in file order."""
+    registry = get_registry('models')
+    print(f"Split-bin cache (maxsize {cache_size}), one pass over each processed dataset\n")
+    print(f"{'Model':<18} | {'Rows':>6} | {'Key feats':>9} | {'Hits':>6} | {'Misses':>6} | {'Evictions':>9} | "
+          f"{'Hit rate':>8} | {'Uncached (ms)':>13} | {'Cached (ms)':>11} | {'Exact'}")
+    print("-" * 118)
+    for name in MODEL_FILES:
+        model = registry.get(name)
+        rows = load_panel(panel_dataset(name))[input_columns(name)].to_numpy(dtype=np.float64)
+        plain, cached = FastPredictor(model), FastPredictor(model, cache_size)
+
+        # Warm both paths (thread buffers, booster) so the timings cover scoring only
+        plain.predict_proba_one(rows[0])
+        cached.predict_proba_one(rows[0])
+        cached.cache.clear()
+
+        start = time.perf_counter()
+        expected = [plain.predict_proba_one(r) for r in rows]
+        uncached_s = time.perf_counter() - start
+        start = time.perf_counter()
+        got = [cached.predict_proba_one(r) for r in rows]
+        cached_s = time.perf_counter() - start
+
+        s = cached.cache.stats()
+        exact = all(np.array_equal(a, b) for a, b in zip(expected, got))
+        print(f"{name:<18} | {len(rows):>6} | {s['key_features']:>9} | {s['hits']:>6} | {s['misses']:>6} | "
+              f"{s['evictions']:>9} | {s['hit_rate']*100:>7.1f}% | {uncached_s*1000:>13.1f} | "
+              f"{cached_s*1000:>11.1f} | {exact}")
+    print("-" * 118)
+    print("Exact: every cached probability equals the uncached one bit for bit.")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Single-patient latency: DataFrame path vs FastPredictor")
+    parser.add_argument('--cache', action='store_true', help="split-bin cache report on real dataset rows")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    if args.cache:
+        cache_report(args.cache_size)
+    else:
+        run_benchmark()
@@ -0,0 +1,188 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Inference micro-benchmark suite for every artifact in models/ plus the
+    full LiverDiseasePredictor path ('hcv').
+    Each target runs in a fresh Python process and reports:
+        - cold load:  imports + first load of the artifact
+        - warm-up:    the first predict call (batch of 1)
+        - steady state p50 / p99 latency at batch sizes 1, 16, 256, 10k
+        - throughput: rows per second at each batch size (from p50)
+        - peak RSS of the process
+    Results are written as JSON together with the library versions, so two
+    runs (e.g. before / after a model or xgboost upgrade) can be compared.
+
+    Usage:
+        python benchmark_suite.py --output bench.json
+        python benchmark_suite.py --only gate hcv --output new.json --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import read_peak_rss_mb, time_calls, latency_summary
+
+BATCH_SIZES = [1, 16, 256, 10000]
+MIN_SECONDS = 0.5      # Steady-state time budget per batch size
+MIN_CALLS = 20
+REGRESSION_THRESHOLD = 0.20  # p50 slowdown flagged by --compare
+
+def targets():
+    from model_registry import MODEL_FILES
+    return list(MODEL_FILES) + ['hcv']
+
+def _load(name):
+    """Returns the predict function of a target; it takes a batch DataFrame in the input column order."""
+    if name == 'hcv':
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+        from test_HC_ALL_models import LiverDiseasePredictor
+        predictor = LiverDiseasePredictor(model_path='models')
+        if not predictor.load_models():
+            raise RuntimeError("LiverDiseasePredictor could not load its models.")
+        return predictor.predict_batch
+    from model_registry import get_registry
+    return get_registry('models').get(name).predict_proba
+
+def child(name, batch_sizes):
+    """Benchmarks one target in this (fresh) process and prints the result as JSON."""
+    import contextlib
+    import io
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predict = _load(name)
+    cold = time.perf_counter() - start
+
+    from model_inputs import sample_inputs
+    inputs = sample_inputs(name, max(batch_sizes))
+
+    first_row = inputs.iloc[:1]
+    start = time.perf_counter()
+    predict(first_row)
+    warmup = time.perf_counter() - start
+
+    batches = {}
+    for size in batch_sizes:
+        batch = inputs.iloc[:size]
+        stats = latency_summary(time_calls(lambda: predict(batch), MIN_CALLS, warmup=2, min_seconds=MIN_SECONDS))
+        stats['rows_per_second'] = size / (stats['p50_ms'] / 1000)
+        batches[str(size)] = stats
+
+    print(json.dumps({
+        'cold_load_ms': cold * 1000,
+        'warmup_ms': warmup * 1000,
+        'batches': batches,
+        'peak_rss_mb': read_peak_rss_mb(),
+    }))
+
+def environment():
+    import numpy, pandas, sklearn, xgboost
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'sklearn': sklearn.__version__,
+        'xgboost': xgboost.__version__,
+    }
+
+def run_suite(names=None, batch_sizes=BATCH_SIZES, output=None):
+    names = names or targets()
+    results = {}
+    for name in names:
+        out = subprocess.run(
+            [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--child', name,
+             '--batch-sizes', *map(str, batch_sizes)],
+            capture_output=True, text=True
+        )
+        if out.returncode != 0:
+            results[name] = {'error': out.stderr.strip().splitlines()[-1] if out.stderr.strip() else 'failed'}
+            continue
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'batch_sizes': batch_sizes,
+        'results': results,
+    }
+    print_report(report)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {output}")
+    return report
+
+def print_report(report):
+    sizes = report['batch_sizes']
+    header = ' | '.join(f"{'p50 @' + str(s):>10}" for s in sizes)
+    print(f"{'Model':<18} | {'Cold (ms)':>9} | {'Warm-up':>8} | {header} | {'Rows/s @' + str(sizes[-1]):>12} | {'Peak RSS':>8}")
+    print("-" * (75 + 13 * len(sizes)))
+    for name, r in report['results'].items():
+        if 'error' in r:
+            print(f"{name:<18} | FAILED ({r['error']})")
+            continue
+        cells = ' | '.join(f"{r['batches'][str(s)]['p50_ms']:>7.3f} ms" for s in sizes)
+        print(f"{name:<18} | {r['cold_load_ms']:>9.1f} | {r['warmup_ms']:>5.1f} ms | {cells} | "
+              f"{r['batches'][str(sizes[-1])]['rows_per_second']:>12,.0f} | {r['peak_rss_mb']:>5.0f} MB")
+    print("-" * (75 + 13 * len(sizes)))
+
+def compare(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Lists (model, batch size, baseline p50, new p50) for every p50 slower than baseline by > threshold."""
+    regressions = []
+    for name, r in report['results'].items():
+        base = baseline['results'].get(name)
+        if not base or 'error' in r or 'error' in base:
+            continue
+        for size, stats in r['batches'].items():
+            if size in base['batches']:
+                old, new = base['batches'][size]['p50_ms'], stats['p50_ms']
+                if new > old * (1 + threshold):
+                    regressions.append((name, size, old, new))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inference benchmark suite for all AiLDS models")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--only', nargs='+', default=None, help="Subset of targets (model names or 'hcv')")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=BATCH_SIZES)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', default=None, help="Baseline JSON from a previous run")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.batch_sizes)
+        sys.exit(0)
+
+    report = run_suite(args.only, args.batch_sizes, args.output)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        print(f"\nComparison with {args.compare} (threshold +{args.threshold * 100:.0f}% p50):")
+        for name, size, old, new in regressions:
+            print(f"  REGRESSION {name} @ batch {size}: {old:.3f} ms -> {new:.3f} ms ({new / old:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("  No regressions.")
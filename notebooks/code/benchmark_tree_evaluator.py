@@ -0,0 +1,65 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Parity and latency benchmark: compiled NumPy tree evaluator vs
+    `model.predict_proba` for every model in `models/`, at batch sizes 1, 32 and 10k.
+    Both paths receive the same pre-built input (DataFrame for the sklearn path,
+    float array in model column order for the compiled path).
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_registry import MODEL_FILES, get_registry
+from model_inputs import sample_inputs
+from tree_compiler import CompiledModel
+from benchmark_utils import time_calls, latency_summary
+
+BATCH_SIZES = [1, 32, 10000]
+TOLERANCE = 1e-5
+
+def run_benchmark():
+    registry = get_registry('models')
+
+    print(f"{'Model':<18} | {'Trees':>5} | {'Depth':>5} | {'Batch':>6} | {'predict_proba p50 (ms)':>22} | "
+          f"{'Compiled p50 (ms)':>17} | {'Speedup':>7}")
+    print("-" * 100)
+    for name in MODEL_FILES:
+        model = registry.get(name)
+        compiled = CompiledModel.from_model(model)
+
+        # 1. Parity
+        X_check = sample_inputs(name, 2000, seed=7)
+        diff = np.abs(compiled.predict_proba(X_check) - model.predict_proba(X_check)).max()
+        if diff > TOLERANCE:
+            raise ValueError(f"Compiled '{name}' differs from predict_proba by {diff:.2e}")
+
+        # 2. Latency
+        for n in BATCH_SIZES:
+            df = sample_inputs(name, n)
+            X = df.to_numpy(dtype=np.float64)
+            repeats = 200 if n < 1000 else 10
+            base = latency_summary(time_calls(lambda: model.predict_proba(df), repeats))
+            fast = latency_summary(time_calls(lambda: compiled.predict_proba(X), repeats))
+            print(f"{name:<18} | {len(compiled.trees.roots):>5} | {compiled.trees.max_depth:>5} | {n:>6} | "
+                  f"{base['p50_ms']:>22.3f} | {fast['p50_ms']:>17.3f} | {base['p50_ms'] / fast['p50_ms']:>6.1f}x")
+        print(f"{'':<18}   parity max |diff| = {diff:.2e}")
+    print("-" * 100)
+
+if __name__ == "__main__":
+    run_benchmark()
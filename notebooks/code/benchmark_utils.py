@@ -0,0 +1,77 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Small timing and memory helpers shared by the benchmark scripts.
+"""
+
+import time
+import numpy as np
+
+def read_rss_mb():
+    """Current resident set size in MB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def read_memory_mb(pid='self'):
+    """RSS, PSS and USS (private pages only) of a process in MB, from /proc/<pid>/smaps_rollup (Linux)."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                values[key] = int(rest.split()[0]) / 1024
+    return {
+        'rss_mb': values['Rss'],
+        'pss_mb': values['Pss'],
+        'uss_mb': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+def read_peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def time_calls(fn, repeats=100, warmup=3, min_seconds=0.0):
+    """
+    Calls fn() repeatedly and returns per-call latencies in seconds.
+    Runs at least `repeats` calls and keeps going until `min_seconds` elapsed.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while len(timings) < repeats or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+def latency_summary(timings):
+    """p50 / p99 / mean in milliseconds for an array of per-call latencies (seconds)."""
+    ms = np.asarray(timings) * 1000
+    return {
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'mean_ms': float(ms.mean()),
+        'calls': int(len(ms)),
+    }
@@ -0,0 +1,154 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Gate-first cascade scheduler.
+    The Gate Model scores the whole batch once; only gate-positive rows
+    (Liver Patient, label 0) are dispatched to the Fatty Liver, Cancer and
+    Hepatitis C models, each as a single batched call. Results are scattered
+    back into the original row order (NaN / -1 / '' for rows the gate stopped).
+
+    Input batch: dict of aligned per-model panels (one row per patient)
+        'gate'        : N x 10 (required)
+        'fatty_liver' : N x 13 (optional)
+        'cancer'      : N x 8  (optional)
+        'hcv'         : N x 15 (optional, LiverDiseasePredictor raw columns)
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+from test_HC_ALL_models import LiverDiseasePredictor
+from model_registry import get_registry
+from model_inputs import sample_inputs
+
+# Gate label for a liver patient (LabelEncoder: 1 (Patient) -> 0, 2 (Healthy) -> 1)
+GATE_PATIENT_LABEL = 0
+
+# Downstream single-model stages (batch keys = model registry names)
+DOWNSTREAM_MODELS = ['fatty_liver', 'cancer']
+
+class CascadeEngine:
+    def __init__(self, model_path='models'):
+        self.model_path = model_path
+        self.models = {}
+        self.hcv = LiverDiseasePredictor(model_path=model_path)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Per-stage counters: rows seen, rows dispatched, model calls and wall time."""
+        self.stats = {
+            stage: {'rows_in': 0, 'rows_dispatched': 0, 'rows_skipped': 0, 'calls': 0, 'seconds': 0.0}
+            for stage in ['gate'] + DOWNSTREAM_MODELS + ['hcv']
+        }
+
+    def load_models(self):
+        registry = get_registry(self.model_path)
+        for key in ['gate'] + DOWNSTREAM_MODELS:
+            self.models[key] = registry.get(key)
+        return self.hcv.load_models()
+
+    def _record(self, stage, n_in, n_dispatched, start):
+        s = self.stats[stage]
+        s['rows_in'] += n_in
+        s['rows_dispatched'] += n_dispatched
+        s['rows_skipped'] += n_in - n_dispatched
+        s['calls'] += 1 if n_dispatched else 0
+        s['seconds'] += time.perf_counter() - start
+
+    def run(self, batch):
+        """Runs the cascade over a batch and returns a dict of result arrays in input order."""
+        if not self.models and not self.load_models():
+            return None
+
+        # 1. Gate (whole batch, one call)
+        start = time.perf_counter()
+        X_gate = np.asarray(batch['gate'], dtype=float)
+        n = len(X_gate)
+        proba = self.models['gate'].predict_proba(X_gate)
+        gate_label = np.argmax(proba, axis=1).astype(np.int8)
+        gate_proba = proba[:, GATE_PATIENT_LABEL]
+        self._record('gate', n, n, start)
+
+        # 2. Index mask of gate-positive rows
+        positive_idx = np.flatnonzero(gate_label == GATE_PATIENT_LABEL)
+        results = {'gate_label': gate_label, 'gate_patient_proba': gate_proba, 'positive_idx': positive_idx}
+
+        # 3. Dispatch gate-positive rows to each downstream model (one call each)
+        for key in DOWNSTREAM_MODELS:
+            if key not in batch:
+                continue
+            start = time.perf_counter()
+            label = np.full(n, -1, dtype=np.int8)
+            proba = np.full(n, np.nan)
+            if positive_idx.size:
+                X = np.asarray(batch[key], dtype=float)[positive_idx]
+                p = self.models[key].predict_proba(X)[:, 1]
+                proba[positive_idx] = p
+                label[positive_idx] = (p > 0.5).astype(np.int8)
+            results[f'{key}_label'] = label
+            results[f'{key}_proba'] = proba
+            self._record(key, n, positive_idx.size, start)
+
+        # 4. Hepatitis C (stage, status and complications in one batch)
+        if 'hcv' in batch:
+            start = time.perf_counter()
+            hcv = np.zeros(n, dtype=self.hcv.result_dtype)
+            hcv['stage'] = -1
+            for field in ('ascites_risk', 'death_risk', 'apri', 'albi'):
+                hcv[field] = np.nan
+            if positive_idx.size:
+                hcv[positive_idx] = self.hcv.predict_batch(np.asarray(batch['hcv'], dtype=float)[positive_idx])
+            results['hcv'] = hcv
+            self._record('hcv', n, positive_idx.size, start)
+
+        return results
+
+    def report(self):
+        """Prints per-stage counters and how much downstream compute the gate saved."""
+        print(f"{'Stage':<13} | {'Rows In':>9} | {'Dispatched':>10} | {'Skipped':>9} | {'Calls':>5} | {'Time (ms)':>9}")
+        print("-" * 72)
+        for stage, s in self.stats.items():
+            if not s['rows_in']:
+                continue
+            print(f"{stage:<13} | {s['rows_in']:>9} | {s['rows_dispatched']:>10} | "
+                  f"{s['rows_skipped']:>9} | {s['calls']:>5} | {s['seconds']*1000:>9.1f}")
+        print("-" * 72)
+
+        downstream = [s for k, s in self.stats.items() if k != 'gate' and s['rows_in']]
+        rows_in = sum(s['rows_in'] for s in downstream)
+        if rows_in:
+            skipped = sum(s['rows_skipped'] for s in downstream)
+            print(f"Gate saved {skipped}/{rows_in} downstream row evaluations ({skipped / rows_in * 100:.1f}%).")
+
+def sample_batch(n, seed=42):
+    """Builds an N-row demo batch by resampling each processed dataset."""
+    return {
+        key: sample_inputs(key, n, seed).to_numpy(dtype=float)
+        for key in ['gate'] + DOWNSTREAM_MODELS + ['hcv']
+    }
+
+if __name__ == "__main__":
+    engine = CascadeEngine(model_path='models')
+    if not engine.load_models():
+        sys.exit(1)
+
+    batch = sample_batch(10000)
+    results = engine.run(batch)
+    print(f"Gate-positive patients: {len(results['positive_idx'])} / {len(batch['gate'])}\n")
+    engine.report()
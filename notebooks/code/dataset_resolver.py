@@ -0,0 +1,183 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Local dataset resolver shared by every trainer.
+    - Logical dataset names map to files in data/processed/ (the directory
+      is owned by dataset_store.py: repository-relative, AILDS_DATA_DIR).
+    - Every file is verified against data/processed/checksums.json (SHA-256
+      + size) before it is read; a mismatch raises ValueError. Scripts that
+      regenerate a registered dataset (ingest_nhanes.py) refresh its entry
+      with `update_checksums`.
+    - Reading goes through the memory-mapped columnar cache of
+      dataset_store.py: each CSV is parsed once, later loads map the cache.
+    - Only a MISSING file is downloaded from GitHub (e.g. a bare Colab
+      runtime), then verified. AILDS_OFFLINE=1 turns the download off.
+
+    Usage:
+        from dataset_resolver import resolve
+        from dataset_store import load_dataset
+        df = load_dataset(resolve('hepatitis_c_stage'))
+
+        python dataset_resolver.py                   -> verify every dataset
+        python dataset_resolver.py --build-checksums -> rewrite checksums.json after a data update
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dataset_store import DATA_DIR, load_columns, load_dataset
+from model_registry import sha256_file
+
+CHECKSUM_FILENAME = 'checksums.json'
+REMOTE_BASE_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/data/processed/'
+
+# Logical dataset name -> file in data/processed/
+DATASETS = {
+    'liver_patients_19k': 'Liver_Patient_Dataset_Cleaned_19k.csv',
+    'fatty_liver': 'FattyLiver.csv',
+    'cancer_1500': 'The_Cancer_data_1500.csv',
+    'hepatitis_c': 'HepatitisC.csv',
+    'hepatitis_c_stage': 'hepatitisC_Stage.csv',
+    'hepatitis_c_status': 'hepatitisC_status.csv',
+}
+
+# Registry model name -> dataset its trainer reads
+MODEL_DATASETS = {
+    'gate': 'liver_patients_19k',
+    'fatty_liver': 'fatty_liver',
+    'cancer': 'cancer_1500',
+    'hcv_stage': 'hepatitis_c_stage',
+    'hcv_status': 'hepatitis_c_status',
+    'hcv_complications': 'hepatitis_c',
+}
+
+_VERIFIED = {}  # path -> (size, mtime_ns) of the last verified version
+
+def offline():
+    return os.environ.get('AILDS_OFFLINE', '') not in ('', '0')
+
+def _filename(name):
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset '{name}' (expected one of {list(DATASETS)})")
+    return DATASETS[name]
+
+def read_checksums():
+    path = os.path.join(DATA_DIR, CHECKSUM_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _write_checksums(checksums):
+    with open(os.path.join(DATA_DIR, CHECKSUM_FILENAME), 'w') as f:
+        json.dump(checksums, f, indent=2)
+        f.write('\n')
+
+def _checksum_entry(filename):
+    path = os.path.join(DATA_DIR, filename)
+    _VERIFIED.pop(path, None)
+    return {'sha256': sha256_file(path), 'bytes': os.path.getsize(path)}
+
+def build_checksums():
+    """Writes checksums.json with the SHA-256 and size of every registered dataset."""
+    checksums = {filename: _checksum_entry(filename) for filename in DATASETS.values()}
+    _write_checksums(checksums)
+    return checksums
+
+def registered_filename(path):
+    """File name of `path` if it is a registered dataset inside DATA_DIR, else None."""
+    filename = os.path.basename(path)
+    if filename in DATASETS.values() and os.path.realpath(os.path.dirname(os.path.abspath(path))) == os.path.realpath(DATA_DIR):
+        return filename
+    return None
+
+def update_checksums(filenames):
+    """Refreshes the checksums.json entries of registered dataset files that were regenerated."""
+    checksums = read_checksums()
+    for filename in filenames:
+        if filename not in DATASETS.values():
+            raise KeyError(f"{filename} is not a registered dataset (expected one of {list(DATASETS.values())})")
+        checksums[filename] = _checksum_entry(filename)
+    _write_checksums(checksums)
+    return checksums
+
+def _download(filename, path):
+    if offline():
+        raise FileNotFoundError(f"{path} is missing and downloads are disabled (AILDS_OFFLINE).")
+    print(f"{filename} not found locally. Downloading from {REMOTE_BASE_URL}...")
+    import requests
+    response = requests.get(REMOTE_BASE_URL + filename, timeout=60)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.part', 'wb') as f:
+        f.write(response.content)
+    os.replace(path + '.part', path)  # Never leave a truncated CSV behind
+
+def verify(name):
+    """Checks a dataset file against checksums.json (once per file version per process)."""
+    filename = _filename(name)
+    path = os.path.join(DATA_DIR, filename)
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    if _VERIFIED.get(path) == stamp:
+        return path
+
+    expected = read_checksums().get(filename)
+    if expected is None:
+        raise ValueError(f"{filename} has no entry in {CHECKSUM_FILENAME}; run `python dataset_resolver.py --build-checksums`.")
+    if stat.st_size != expected['bytes'] or sha256_file(path) != expected['sha256']:
+        raise ValueError(f"Checksum mismatch for {path}: the file differs from {CHECKSUM_FILENAME}.")
+    _VERIFIED[path] = stamp
+    return path
+
+def resolve(name):
+    """Verified file name of a dataset in DATA_DIR (downloaded first only if missing), for dataset_store."""
+    filename = _filename(name)
+    path = os.path.join(DATA_DIR, filename)
+    if not os.path.exists(path):
+        _download(filename, path)
+    verify(name)
+    return filename
+
+def preload(names):
+    """Verifies datasets and builds their columnar caches up front (e.g. before forking trainer processes)."""
+    for name in names:
+        load_columns(resolve(name))
+
+def clear_cache():
+    _VERIFIED.clear()
+
+if __name__ == "__main__":
+    if '--build-checksums' in sys.argv:
+        for filename, entry in build_checksums().items():
+            print(f"{filename:<40} {entry['bytes']:>10,} bytes  {entry['sha256'][:16]}...")
+        print(f"Wrote {os.path.join(DATA_DIR, CHECKSUM_FILENAME)}")
+    else:
+        print(f"{'Dataset':<20} | {'File':<38} | {'Rows':>7} | {'First load (ms)':>15} | {'Cached (ms)':>11}")
+        print("-" * 104)
+        for name, filename in DATASETS.items():
+            start = time.perf_counter()
+            df = load_dataset(resolve(name))
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            load_dataset(resolve(name))
+            cached = time.perf_counter() - start
+            print(f"{name:<20} | {filename:<38} | {len(df):>7} | {first * 1000:>15.1f} | {cached * 1000:>11.2f}")
+        print("-" * 104)
+        print(f"All datasets verified against {os.path.join(DATA_DIR, CHECKSUM_FILENAME)}")
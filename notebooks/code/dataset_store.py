@@ -0,0 +1,153 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Memory-mapped columnar cache for the processed datasets, and the one
+    loader every trainer reads them through (`load_dataset`).
+    Each CSV in `data/processed/` is parsed once and written to
+    `data/cache/<dataset>/` as one `.npy` file per column plus `schema.json`.
+    Both directories are found relative to this repository, so scripts may
+    run from any working directory (override with AILDS_DATA_DIR; the cache
+    then sits next to it).
+    Compact dtypes are chosen per column, without losing any value:
+        - int8  : integer-valued columns that fit (flags such as Sex, Ascites,
+                  Edema, and small labels such as Stage / Diagnosis)
+        - int16 / int32 : other integer-valued columns without missing values
+        - float32 : fractional columns whose values all survive a float32 round trip
+        - float64 : every other fractional column / missing / non-numeric entries (NaN)
+    Later loads open every column with `np.load(mmap_mode='r')`: nothing is
+    parsed or copied, pages are read from disk on first access.
+
+    The cache is rebuilt automatically when the source CSV changes (size or
+    modification time differs from the schema) or the cache format changes.
+    Checksum verification of the CSVs lives in dataset_resolver.py.
+
+    Usage:
+        python dataset_store.py          -> build / refresh the cache for every processed CSV
+        python dataset_store.py --clear  -> delete data/cache
+"""
+
+import json
+import os
+import shutil
+import sys
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.environ.get('AILDS_DATA_DIR', os.path.join(REPO_ROOT, 'data', 'processed'))
+CACHE_DIR = os.path.join(os.path.dirname(DATA_DIR), 'cache')
+SCHEMA_FILENAME = 'schema.json'
+CACHE_FORMAT = 2  # Bumped when the on-disk layout or dtype rules change
+
+def cache_dir(filename):
+    return os.path.join(CACHE_DIR, os.path.splitext(filename)[0])
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {'bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def compact_dtype(values):
+    """Smallest dtype that holds a float64 column exactly (the cache never rounds a value)."""
+    if len(values) and not np.isnan(values).any() and np.array_equal(values, np.round(values)):
+        low, high = values.min(), values.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return dtype
+    if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+        return np.float32
+    return np.float64
+
+def build_cache(filename):
+    """Parses data/processed/<filename> once and writes the columnar cache. Returns the schema."""
+    source = os.path.join(DATA_DIR, filename)
+    df = pd.read_csv(source)
+    target = cache_dir(filename)
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(target)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64)
+        dtype = compact_dtype(values)
+        column_file = f'{i:03d}.npy'
+        np.save(os.path.join(target, column_file), values.astype(dtype))
+        columns.append({'name': name, 'file': column_file, 'dtype': np.dtype(dtype).name})
+
+    schema = {'format': CACHE_FORMAT, 'source': filename, 'rows': len(df), 'columns': columns,
+              **_source_stamp(source)}
+    # Schema last: a half-written cache is never considered valid
+    with open(os.path.join(target, SCHEMA_FILENAME), 'w') as f:
+        json.dump(schema, f, indent=2)
+    return schema
+
+def read_schema(filename):
+    """Returns the cached schema if it matches the current source file, else None."""
+    path = os.path.join(cache_dir(filename), SCHEMA_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        schema = json.load(f)
+    stamp = _source_stamp(os.path.join(DATA_DIR, filename))
+    if schema.get('format') != CACHE_FORMAT:
+        return None
+    if schema['bytes'] != stamp['bytes'] or schema['mtime_ns'] != stamp['mtime_ns']:
+        return None
+    return schema
+
+def load_columns(filename):
+    """
+    Opens a processed dataset as {column name: read-only memmap}, building the
+    cache first if needed. Zero-copy: no parsing, no data read until accessed.
+    """
+    schema = read_schema(filename) or build_cache(filename)
+    target = cache_dir(filename)
+    return {c['name']: np.load(os.path.join(target, c['file']), mmap_mode='r') for c in schema['columns']}
+
+def load_dataset(filename, columns=None):
+    """
+    DataFrame view of the cached dataset (optionally only some columns).
+    Column headers are kept exactly as in the CSV; missing/non-numeric
+    entries are NaN, so callers keep their own dropna() step. The columns
+    are read-only memmaps: assigning a column is fine, writing into one
+    in place is not (pandas copies on write only for shared blocks).
+    """
+    data = load_columns(filename)
+    if columns is not None:
+        data = {c: data[c] for c in columns}
+    return pd.DataFrame(data, copy=False)
+
+def processed_files():
+    return sorted(f for f in os.listdir(DATA_DIR) if f.endswith('.csv'))
+
+if __name__ == "__main__":
+    if '--clear' in sys.argv:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"Removed {CACHE_DIR}")
+        sys.exit(0)
+
+    print(f"{'Dataset':<42} | {'Rows':>6} | {'int8':>4} | {'int16+':>6} | {'float32':>7} | {'float64':>7} | "
+          f"{'CSV (KB)':>8} | {'Cache (KB)':>10}")
+    print("-" * 110)
+    for filename in processed_files():
+        schema = read_schema(filename) or build_cache(filename)
+        dtypes = [c['dtype'] for c in schema['columns']]
+        cache_kb = sum(os.path.getsize(os.path.join(cache_dir(filename), c['file'])) for c in schema['columns']) / 1024
+        print(f"{filename:<42} | {schema['rows']:>6} | {dtypes.count('int8'):>4} | "
+              f"{dtypes.count('int16') + dtypes.count('int32'):>6} | {dtypes.count('float32'):>7} | "
+              f"{dtypes.count('float64'):>7} | {schema['bytes'] / 1024:>8.0f} | {cache_kb:>10.0f}")
+    print("-" * 110)
+    print(f"Cache directory: {CACHE_DIR}")
@@ -0,0 +1,239 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Low-latency single-patient inference path (interactive clinician UI).
+    Takes a plain vector in the model's recorded feature order
+    (`feature_names_in_`), writes it into a preallocated float32 row buffer
+    (applying the Pipeline StandardScaler in a preallocated float64 scratch
+    buffer when needed) and calls the booster's `inplace_predict` directly.
+    No DataFrame construction, no column alignment, no DMatrix.
+
+    Thread safety: the row buffers are per thread (threading.local), so one
+    FastPredictor can be shared by request threads; `get_fast_predictor`
+    hands out one instance per registry model.
+
+    Split-bin cache (exact): trees only compare a feature against its split
+    thresholds, so two patients whose float32 inputs fall into the same
+    threshold interval for every feature get identical outputs. The row is
+    mapped to its per-feature bin indices (number of the feature's thresholds
+    <= value, -1 for missing) and that compact key fronts an LRU cache of
+    probabilities. Features the model never splits on are not part of the key.
+    `predictor.cache.stats()` reports hits, misses and evictions.
+
+    backend='onnx': the same single-patient interface over the exported
+    onnxruntime graph (models/onnx, onnx_models.py), with configurable
+    intra-op threads. No split-bin cache (the graph exposes no booster).
+
+    Usage:
+        get_fast_predictor('gate').predict_proba_one(vector)   -> cached (DEFAULT_CACHE_SIZES)
+        get_fast_predictor('cancer', cache_size=4096)          -> cache any model explicitly
+        get_fast_predictor('cancer', backend='onnx', onnx_threads=2)
+        python test_cancer_model.py --backend onnx --onnx-threads 2
+"""
+
+import argparse
+from collections import OrderedDict
+import os
+import sys
+import threading
+import numpy as np
+
+# Bin signatures kept per cached model (one small probability array each)
+CACHE_SIZE = 4096
+
+# Models cached by default in get_fast_predictor. Replaying the processed datasets row by row
+# (benchmark_single_row.py --cache): gate 87.5% and fatty_liver 93.8% hits; cancer and the HCV
+# models 0-2% (continuous labs), where every call would only add the ~10 us key computation.
+DEFAULT_CACHE_SIZES = {'gate': CACHE_SIZE, 'fatty_liver': CACHE_SIZE}
+
+class SplitBinCache:
+    """LRU cache keyed by the per-feature split-bin indices of a float32 model-order row."""
+
+    def __init__(self, booster, maxsize=CACHE_SIZE):
+        from tree_compiler import compile_booster
+        thresholds = compile_booster(booster).split_thresholds()
+        self.key_features = np.array([f for f, t in enumerate(thresholds) if len(t)], dtype=np.intp)
+        # Padded (key features x max thresholds) matrix; NaN padding never compares >= a value
+        width = max([len(thresholds[f]) for f in self.key_features], default=0)
+        self.thresholds = np.full((len(self.key_features), width), np.nan, dtype=np.float32)
+        for i, f in enumerate(self.key_features):
+            self.thresholds[i, :len(thresholds[f])] = thresholds[f]
+
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def key(self, row):
+        """Bin signature of one float32 row (bytes)."""
+        values = row[self.key_features]
+        bins = np.count_nonzero(values[:, None] >= self.thresholds, axis=1).astype(np.int16)
+        bins[np.isnan(values)] = -1
+        return bins.tobytes()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / total if total else 0.0,
+                'key_features': len(self.key_features),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+class FastPredictor:
+    def __init__(self, model, cache_size=0):
+        from native_models import NativeModel, split_model
+        if isinstance(model, NativeModel):
+            booster, mean, scale = model.booster, model.mean_, model.scale_
+            self.feature_names = list(model.feature_names_in_)
+            self.classes = np.asarray(model.classes_)
+        else:
+            classifier, scaler, self.feature_names = split_model(model)
+            booster = classifier.get_booster()
+            mean = None if scaler is None else scaler.mean_
+            scale = None if scaler is None else scaler.scale_
+            self.classes = np.asarray(classifier.classes_)
+
+        # Private single-threaded copy: thread start-up costs more than one row of trees
+        self.booster = booster.copy()
+        self.booster.set_param({'nthread': 1})
+        self.mean = mean
+        self.scale = scale
+        self.cache = SplitBinCache(self.booster, cache_size) if cache_size else None
+
+        self._local = threading.local()
+
+    def _buffers(self):
+        """This thread's (row, scratch) buffers, allocated on its first call."""
+        local = self._local
+        if not hasattr(local, 'row'):
+            n = len(self.feature_names)
+            local.row = np.empty((1, n), dtype=np.float32)
+            local.scratch = np.empty(n, dtype=np.float64)
+        return local.row, local.scratch
+
+    def _fill(self, vector):
+        row, scratch = self._buffers()
+        if self.mean is None:
+            row[0] = vector
+        else:
+            np.subtract(vector, self.mean, out=scratch)
+            np.divide(scratch, self.scale, out=scratch)
+            row[0] = scratch
+        return row
+
+    def predict_proba_one(self, vector):
+        """Class probabilities for one patient (length = number of classes)."""
+        row = self._fill(vector)
+        if self.cache is not None:
+            key = self.cache.key(row[0])
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.copy()
+
+        proba = self.booster.inplace_predict(row, validate_features=False)[0]
+        if np.ndim(proba) == 0:
+            proba = np.array([1.0 - proba, proba])
+        if self.cache is not None:
+            self.cache.put(key, proba.copy())
+        return proba
+
+    def predict_one(self, vector):
+        """Predicted class label for one patient."""
+        return self.classes[np.argmax(self.predict_proba_one(vector))]
+
+class OnnxFastPredictor:
+    """FastPredictor interface over an onnxruntime graph (onnx_models.OnnxModel)."""
+
+    def __init__(self, onnx_model):
+        self.model = onnx_model
+        self.feature_names = [str(c) for c in onnx_model.feature_names_in_]
+        self.classes = np.asarray(onnx_model.classes_)
+        self.cache = None
+        self._local = threading.local()
+
+    def predict_proba_one(self, vector):
+        """Class probabilities for one patient (length = number of classes)."""
+        local = self._local
+        if not hasattr(local, 'row'):
+            local.row = np.empty((1, len(self.feature_names)), dtype=np.float64)  # Graph input is float64
+        local.row[0] = vector
+        return self.model.predict_proba(local.row)[0]
+
+    def predict_one(self, vector):
+        """Predicted class label for one patient."""
+        return self.classes[np.argmax(self.predict_proba_one(vector))]
+
+def parse_backend_args(argv=None):
+    """--backend / --onnx-threads of the single-model test scripts, as get_fast_predictor kwargs."""
+    parser = argparse.ArgumentParser(description="Single-patient inference backend")
+    parser.add_argument('--backend', default='native', choices=['native', 'onnx'],
+                        help="'native' = registry models, 'onnx' = onnxruntime graphs from models/onnx")
+    parser.add_argument('--onnx-threads', type=int, default=1, help="onnxruntime intra-op threads")
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return vars(args)
+
+_PREDICTORS = {}
+_PREDICTORS_LOCK = threading.Lock()
+
+def get_fast_predictor(name, model_path='models', cache_size=None, backend='native', onnx_threads=1):
+    """One predictor per model, backend and settings, built on first use."""
+    if backend == 'onnx':
+        key = (name, model_path, backend, onnx_threads)
+    elif backend == 'native':
+        if cache_size is None:
+            cache_size = DEFAULT_CACHE_SIZES.get(name, 0)
+        key = (name, model_path, backend, cache_size)
+    else:
+        raise ValueError(f"Unknown backend '{backend}' (expected 'native' or 'onnx').")
+
+    if key not in _PREDICTORS:
+        with _PREDICTORS_LOCK:
+            if key not in _PREDICTORS:
+                if backend == 'onnx':
+                    from onnx_models import load_onnx_model
+                    model = load_onnx_model(name, os.path.join(model_path, 'onnx'), onnx_threads)
+                    _PREDICTORS[key] = OnnxFastPredictor(model)
+                else:
+                    from model_registry import get_registry
+                    _PREDICTORS[key] = FastPredictor(get_registry(model_path).get(name), cache_size)
+    return _PREDICTORS[key]
@@ -0,0 +1,146 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Feature-signature manifests, written next to every model artifact at
+    train time (<artifact>.features.json, e.g. gate_model.features.json):
+        - features:     input order as the classifier sees it, with dtype and
+                        the valid (training) range of every column
+        - engineered:   engineered feature -> raw columns it depends on
+        - preprocessing: 'standard_scaler' when a Pipeline scales the inputs
+    Tools read the signature from the manifest without unpickling the model.
+
+    Serving side: CompiledInput turns a manifest into integer gather
+    indices over one wide canonical patient array, so each model's input is
+    a single `np.take` of that array instead of a newly built DataFrame
+    (Pipeline scaling is applied in place on the gathered block).
+
+    Usage:
+        python feature_manifest.py --backfill   -> write manifests for the artifacts in models/
+"""
+
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from medical_features import FEATURE_DEPENDENCIES
+from model_registry import MODEL_FILES
+
+MANIFEST_SUFFIX = '.features.json'
+
+def manifest_filename(name):
+    return os.path.splitext(MODEL_FILES[name])[0] + MANIFEST_SUFFIX
+
+def build_feature_manifest(name, model, X, source=None):
+    """Manifest for a fitted model and the feature frame X it was trained on."""
+    from native_models import split_model
+    _, scaler, order = split_model(model)
+    order = [str(c) for c in order]
+    features = []
+    for column in order:
+        values = X[column]
+        features.append({
+            'name': column,
+            # Logical dtype as parsed from the CSV (the dataset_store cache may hold narrower types)
+            'dtype': 'int64' if values.dtype.kind in 'biu' else 'float64',
+            'min': float(values.min()),
+            'max': float(values.max()),
+        })
+    return {
+        'model': name,
+        'artifact': MODEL_FILES[name],
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': source,
+        'rows': int(len(X)),
+        'features': features,
+        'engineered': {f: FEATURE_DEPENDENCIES[f] for f in order if f in FEATURE_DEPENDENCIES},
+        'preprocessing': None if scaler is None else 'standard_scaler',
+    }
+
+def write_feature_manifest(name, model, X, directory='.', source=None):
+    """Writes the manifest next to the artifact (trainers save into the working directory)."""
+    manifest = build_feature_manifest(name, model, X, source)
+    path = os.path.join(directory, manifest_filename(name))
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    print(f"Feature manifest saved: {path}")
+    return manifest
+
+def read_feature_manifest(name, model_path='models'):
+    """Returns the manifest dict, or None when the artifact has none."""
+    path = os.path.join(model_path, manifest_filename(name))
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def feature_order(name, model_path='models', model=None):
+    """Input column order from the manifest; falls back to probing the model (or model_path=None)."""
+    manifest = None if model_path is None else read_feature_manifest(name, model_path)
+    if manifest is not None:
+        return [f['name'] for f in manifest['features']]
+    from native_models import split_model
+    if model is None:
+        from model_registry import get_registry
+        model = get_registry(model_path).get(name)
+    return [str(c) for c in split_model(model)[2]]
+
+class CompiledInput:
+    """One model's inputs as gather indices over a canonical wide array, plus its scaler constants."""
+
+    def __init__(self, name, model, canonical_columns, model_path='models'):
+        from native_models import split_model
+        self.name = name
+        self.classifier, scaler, _ = split_model(model)
+        self.columns = feature_order(name, model_path, model)
+        missing = [c for c in self.columns if c not in canonical_columns]
+        if missing:
+            raise ValueError(f"Canonical array has no column for {name} inputs: {missing}")
+        self.indices = np.array([canonical_columns.index(c) for c in self.columns], dtype=np.intp)
+        self.mean = None if scaler is None else scaler.mean_
+        self.scale = None if scaler is None else scaler.scale_
+
+    def gather(self, wide):
+        """The model's input block (N x features) taken from the wide array."""
+        X = np.take(wide, self.indices, axis=1)
+        if self.mean is not None:
+            X -= self.mean
+            X /= self.scale
+        return X
+
+    def predict_proba(self, wide):
+        return self.classifier.predict_proba(self.gather(wide))
+
+    def predict(self, wide):
+        return self.classifier.predict(self.gather(wide))
+
+def backfill(model_path='models'):
+    """Writes manifests for existing artifacts, taking ranges from their processed training datasets."""
+    from model_registry import get_registry
+    from model_inputs import load_panel
+    from dataset_resolver import DATASETS, MODEL_DATASETS
+    registry = get_registry(model_path)
+    for name, dataset in MODEL_DATASETS.items():
+        write_feature_manifest(name, registry.get(name), load_panel(dataset), model_path, source=DATASETS[dataset])
+
+if __name__ == "__main__":
+    if '--backfill' in sys.argv:
+        backfill()
+    else:
+        print(__doc__)
@@ -0,0 +1,195 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Hyperparameter search with early stopping, shared by every trainer's
+    `--search` mode.
+    - Candidates: max_depth x learning_rate around the trainer's MODEL_PARAMS.
+    - Stratified K-fold CV; every (candidate, fold) fit runs in parallel in a
+      process pool. Each fit grows up to --max-trees trees and stops early on
+      its validation fold.
+    - Validation accuracy is recorded at a ladder of tree counts
+      (`iteration_range`). A tree count is only reported for a candidate if
+      every fold actually fitted that many trees (no extrapolation past an
+      early stop). For the best candidate at each tree count, the
+      single-row and 1k-row batch inference latency (p50) is measured: the
+      accuracy vs. inference-cost tradeoff.
+    - Selection: the smallest ensemble whose mean CV accuracy is within
+      --tolerance of the best score found.
+
+    Usage (from any trainer):
+        python train_gate_model.py --search
+        python train_HC_models/train_HC_stage_model.py --search --folds 10 --tolerance 0.01
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import StratifiedKFold
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import time_calls, latency_summary
+
+# Tree counts at which each fold's validation accuracy is recorded
+TREE_LADDER = [5, 10, 15, 20, 30, 40, 50, 75, 100, 125, 150, 200, 250, 300, 400, 500, 600, 800, 1000, 1500, 2000]
+LATENCY_CALLS = 300
+
+# Training data shared with the pool workers (sent once per worker, not per task)
+_DATA = {}
+
+def parse_search_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hyperparameter search with early stopping")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.005, help="Accuracy loss allowed vs the best score")
+    parser.add_argument('--max-trees', type=int, default=1000)
+    parser.add_argument('--early-stopping', type=int, default=30, help="Rounds without validation improvement")
+    parser.add_argument('--workers', type=int, default=None, help="Parallel fits (default: all cores)")
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return vars(args)
+
+def default_grid(base_params):
+    """max_depth one level either side, learning_rate x1 / x2 / x4 of the trainer's settings."""
+    depth = base_params.get('max_depth', 6)
+    rate = base_params.get('learning_rate', 0.3)
+    return {
+        'max_depth': sorted({max(2, depth - 1), depth, depth + 1}),
+        'learning_rate': [rate, min(rate * 2, 1.0), min(rate * 4, 1.0)],
+    }
+
+def _init_worker(X, y, n_threads):
+    _DATA['X'], _DATA['y'], _DATA['threads'] = X, y, n_threads
+
+def _fit_fold(params, train_idx, val_idx, checkpoints, early_stopping, keep_booster):
+    """Fits one fold with early stopping; returns accuracy at each checkpoint tree count (NaN past the fit)."""
+    X, y = _DATA['X'], _DATA['y']
+    model = xgb.XGBClassifier(**params, early_stopping_rounds=early_stopping, n_jobs=_DATA['threads'])
+    model.fit(X[train_idx], y[train_idx], eval_set=[(X[val_idx], y[val_idx])], verbose=False)
+
+    n_trees = model.get_booster().num_boosted_rounds()
+    accuracy = [
+        float(np.mean(model.predict(X[val_idx], iteration_range=(0, k)) == y[val_idx])) if k <= n_trees else np.nan
+        for k in checkpoints
+    ]
+    return {
+        'best_trees': model.best_iteration + 1,
+        'accuracy': accuracy,
+        'booster': model.get_booster().save_raw('ubj') if keep_booster else None,
+    }
+
+def measure_latency(raw_booster, n_trees, X):
+    """Inference cost of a booster truncated at n_trees: single-row p50 and 1k-row batch p50 (ms)."""
+    booster = xgb.Booster()
+    booster.load_model(bytearray(raw_booster))
+    booster.set_param({'nthread': 1})
+    if n_trees > booster.num_boosted_rounds():
+        raise ValueError(f"Booster has {booster.num_boosted_rounds()} trees; cannot time {n_trees}.")
+    row, batch = np.ascontiguousarray(X[:1]), np.ascontiguousarray(X[:1000])
+    predict = lambda data: booster.inplace_predict(data, iteration_range=(0, n_trees), validate_features=False)
+    return (latency_summary(time_calls(lambda: predict(row), LATENCY_CALLS, warmup=20))['p50_ms'],
+            latency_summary(time_calls(lambda: predict(batch), 30))['p50_ms'])
+
+def run_search(X, y, base_params, grid=None, **overrides):
+    """
+    Runs the search for one trainer and prints the tradeoff report.
+    Returns the recommended parameters (base params with the selected
+    max_depth, learning_rate and n_estimators) plus the full result table.
+    """
+    options = {**parse_search_args(), **overrides}
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    y = np.asarray(y).astype(int)
+    grid = grid or default_grid(base_params)
+    workers = options['workers'] or os.cpu_count()
+    base_trees = base_params.get('n_estimators', 100)
+
+    checkpoints = sorted({k for k in TREE_LADDER if k <= options['max_trees']} | {base_trees, options['max_trees']})
+    candidates = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    folds = list(StratifiedKFold(options['folds'], shuffle=True, random_state=42).split(X, y))
+
+    print(f"Search: {len(candidates)} candidates x {len(folds)} folds, up to {options['max_trees']} trees, "
+          f"early stopping after {options['early_stopping']} rounds, {workers} parallel fits\n")
+    start = time.perf_counter()
+    tasks = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(X, y, max(1, os.cpu_count() // workers))) as pool:
+        for c, candidate in enumerate(candidates):
+            params = {**base_params, **candidate, 'n_estimators': options['max_trees']}
+            for f, (train_idx, val_idx) in enumerate(folds):
+                tasks[c, f] = pool.submit(_fit_fold, params, train_idx, val_idx, checkpoints,
+                                          options['early_stopping'], f == 0)
+        fits = {key: task.result() for key, task in tasks.items()}
+    search_seconds = time.perf_counter() - start
+
+    # Mean CV accuracy per (candidate, tree count)
+    results = []
+    for c, candidate in enumerate(candidates):
+        accuracy = np.mean([fits[c, f]['accuracy'] for f in range(len(folds))], axis=0)
+        stopped = np.mean([fits[c, f]['best_trees'] for f in range(len(folds))])
+        for k, acc in zip(checkpoints, accuracy):
+            if np.isnan(acc):
+                continue  # At least one fold stopped before k trees
+            results.append({**candidate, 'n_estimators': k, 'accuracy': float(acc),
+                            'early_stop_trees': float(stopped), 'candidate': c})
+
+    best = max(r['accuracy'] for r in results)
+    within = [r for r in results if r['accuracy'] >= best - options['tolerance']]
+    selected = min(within, key=lambda r: (r['n_estimators'], -r['accuracy']))
+    current = next((r for r in results if r['n_estimators'] == base_trees
+                    and all(r[key] == base_params.get(key) for key in grid)), None)
+
+    # Inference cost of the frontier (best candidate at each ensemble size)
+    fitted = sorted({r['n_estimators'] for r in results})
+    frontier = [max((r for r in results if r['n_estimators'] == k), key=lambda r: r['accuracy'])
+                for k in fitted]
+    for r in frontier + [selected] + ([current] if current else []):
+        if 'p50_ms' not in r:
+            r['p50_ms'], r['batch_ms'] = measure_latency(fits[r['candidate'], 0]['booster'], r['n_estimators'], X)
+
+    # Report 1: each candidate at its early-stopping point
+    print(f"{'max_depth':>9} | {'learning_rate':>13} | {'Early stop (trees)':>18} | {'Best CV acc':>11} | {'at trees':>8}")
+    print("-" * 72)
+    for c, candidate in enumerate(candidates):
+        top = max((r for r in results if r['candidate'] == c), key=lambda r: (r['accuracy'], -r['n_estimators']))
+        print(f"{candidate['max_depth']:>9} | {candidate['learning_rate']:>13.4g} | {top['early_stop_trees']:>18.0f} | "
+              f"{top['accuracy'] * 100:>10.2f}% | {top['n_estimators']:>8}")
+    print("-" * 72)
+
+    # Report 2: accuracy / inference-cost frontier by ensemble size
+    print(f"\n{'Trees':>6} | {'Best CV acc':>11} | {'1-row p50 (ms)':>14} | {'1k-row p50 (ms)':>15} | "
+          f"{'max_depth':>9} | {'learning_rate':>13}")
+    print("-" * 86)
+    for r in frontier:
+        marker = '  <- selected' if r['n_estimators'] == selected['n_estimators'] else ''
+        print(f"{r['n_estimators']:>6} | {r['accuracy'] * 100:>10.2f}% | {r['p50_ms']:>14.4f} | {r['batch_ms']:>15.3f} | "
+              f"{r['max_depth']:>9} | {r['learning_rate']:>13.4g}{marker}")
+    print("-" * 86)
+
+    describe = lambda r: (f"{r['n_estimators']} trees, depth {r['max_depth']}, lr {r['learning_rate']:.4g} -> "
+                          f"{r['accuracy'] * 100:.2f}%, 1-row p50 {r['p50_ms']:.4f} ms, 1k-row p50 {r['batch_ms']:.3f} ms")
+    print(f"\nBest CV accuracy: {best * 100:.2f}% (tolerance {options['tolerance'] * 100:.2f} pts)")
+    if current:
+        print(f"Current settings: {describe(current)}")
+    else:
+        print(f"Current settings: {base_trees} trees not fitted in every fold (early stopping ended a fold sooner)")
+    print(f"Selected:         {describe(selected)}")
+    print(f"Search time: {search_seconds:.1f} s")
+
+    recommended = {**base_params, **{key: selected[key] for key in grid}, 'n_estimators': selected['n_estimators']}
+    print(f"\nRecommended MODEL_PARAMS: {recommended}")
+    return {'recommended': recommended, 'selected': selected, 'current': current, 'results': results}
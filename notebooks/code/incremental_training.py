@@ -0,0 +1,257 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Incremental (warm-start) retraining for the gate and HCV models.
+    Instead of a full retrain, the current booster in models/ is continued:
+        1. New labelled records (CSV, same raw layout as the model's dataset in
+           data/processed/) go through the trainer's own prepare_data().
+        2. A stratified slice of them is held out; the rest is used to append
+           --trees boosting rounds to the existing booster. Pipeline models keep
+           their fitted scaler: the existing trees split on its output.
+        3. Old and updated model are scored (accuracy, log loss) on the
+           held-out new records and, for gate / complications, on the
+           trainer's original test split. The stage / status trainers refit
+           on every row of their dataset, so none of it is unseen by the
+           live model and only the new-record hold-out is used.
+           Any regression beyond the tolerance rejects the update.
+        4. An accepted update is written as a new version,
+           models/versions/<artifact>.v<N>.pkl, with a JSON record (metrics,
+           rounds, base artifact SHA-256). --promote also replaces the live
+           artifact and refreshes models/manifest.json and its feature manifest.
+
+    Usage:
+        python incremental_training.py hcv_stage new_stage_records.csv
+        python incremental_training.py gate new_gate_records.csv --trees 30 --promote
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import train_test_split
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, CODE_DIR)
+sys.path.insert(0, os.path.join(CODE_DIR, 'train_HC_models'))
+from model_registry import MODEL_FILES, get_registry, sha256_file
+
+# Registry name -> trainer module (provides prepare_data(df=None))
+INCREMENTAL_MODELS = {
+    'gate': 'train_gate_model',
+    'hcv_stage': 'train_HC_stage_model',
+    'hcv_status': 'train_HC_status_model',
+    'hcv_complications': 'train_HC_complications',
+}
+
+# Trainers whose final fit uses every row of their dataset (no base rows left unseen)
+FULL_REFIT_MODELS = {'hcv_stage', 'hcv_status'}
+
+VERSIONS_DIR = os.path.join('models', 'versions')
+DEFAULT_TREES = 20
+HOLDOUT_FRACTION = 0.2
+# Largest accepted change on either held-out set (accuracy may drop / log loss may rise by this much)
+TOLERANCE = {'accuracy': 0.005, 'log_loss': 0.005}
+# sklearn-wrapper kwargs stored in older pickles that the booster no longer accepts
+LEGACY_PARAMS = {'use_label_encoder'}
+# sklearn-wrapper parameter names -> xgb.train names
+PARAM_ALIASES = {'random_state': 'seed', 'n_jobs': 'nthread'}
+
+def _prepare(name, df=None):
+    """Runs the trainer's prepare_data (quietly) on its dataset or on new raw records."""
+    import importlib
+    trainer = importlib.import_module(INCREMENTAL_MODELS[name])
+    with contextlib.redirect_stdout(io.StringIO()):
+        X, y = trainer.prepare_data(df)
+    return X, np.asarray(y)
+
+def _split(X, y, test_size, seed=42):
+    """Stratified split when every class has at least two rows, plain split otherwise."""
+    _, counts = np.unique(y, return_counts=True)
+    stratify = y if counts.min() >= 2 else None
+    return train_test_split(X, y, test_size=test_size, random_state=seed, stratify=stratify)
+
+def evaluate(model, X, y):
+    proba = model.predict_proba(X)
+    classes = model.classes_
+    return {
+        'accuracy': float(accuracy_score(y, classes[proba.argmax(axis=1)])),
+        'log_loss': float(log_loss(y, proba, labels=classes)),
+        'rows': int(len(y)),
+    }
+
+def continue_boosting(model, X, y, trees=DEFAULT_TREES):
+    """Returns a copy of `model` whose booster has `trees` more rounds fitted on (X, y)."""
+    from native_models import split_model
+    classifier, scaler, _ = split_model(model)
+    if scaler is not None:
+        X = model.named_steps['preprocessor'].transform(X)
+    booster = classifier.get_booster()
+    params = {PARAM_ALIASES.get(k, k): v for k, v in classifier.get_xgb_params().items()
+              if v is not None and k not in LEGACY_PARAMS}
+    dtrain = xgb.DMatrix(np.asarray(X, dtype=np.float64), label=y, feature_names=booster.feature_names)
+    # xgb.train copies the base booster, so `model` itself is left untouched
+    booster = xgb.train(params, dtrain, num_boost_round=trees, xgb_model=booster)
+
+    updated = copy.deepcopy(classifier)
+    updated.load_model(bytearray(booster.save_raw('ubj')))
+    updated.set_params(n_estimators=booster.num_boosted_rounds())
+    if scaler is None:
+        return updated
+    pipeline = copy.deepcopy(model)
+    pipeline.steps[-1] = ('classifier', updated)
+    return pipeline
+
+def regressions(metrics, tolerance=TOLERANCE):
+    """Held-out sets on which the updated model is worse than the current one."""
+    failed = []
+    for holdout, m in metrics.items():
+        if m['after']['accuracy'] < m['before']['accuracy'] - tolerance['accuracy']:
+            failed.append(f"{holdout}: accuracy {m['before']['accuracy']:.4f} -> {m['after']['accuracy']:.4f}")
+        if m['after']['log_loss'] > m['before']['log_loss'] + tolerance['log_loss']:
+            failed.append(f"{holdout}: log loss {m['before']['log_loss']:.4f} -> {m['after']['log_loss']:.4f}")
+    return failed
+
+def update_model(name, records, trees=DEFAULT_TREES, model_path='models',
+                 holdout_fraction=HOLDOUT_FRACTION, tolerance=TOLERANCE, seed=42):
+    """Warm-start update of one model on new records (DataFrame or CSV path). Returns (model, report)."""
+    if name not in INCREMENTAL_MODELS:
+        raise ValueError(f"No incremental mode for '{name}' (expected one of {list(INCREMENTAL_MODELS)})")
+    source = records if isinstance(records, str) else None
+    if source is not None:
+        records = pd.read_csv(source)
+    artifact = os.path.join(model_path, MODEL_FILES[name])
+    current = get_registry(model_path).get(name)  # SHA-256 verified against manifest.json
+
+    holdouts = {}
+    if name not in FULL_REFIT_MODELS:
+        X_base, y_base = _prepare(name)
+        _, X_base_test, _, y_base_test = train_test_split(
+            X_base, y_base, test_size=0.2, random_state=42, stratify=y_base
+        )  # Same split as the trainer: rows the live model was not fitted on
+        holdouts['base_test'] = (X_base_test, y_base_test)
+    X_new, y_new = _prepare(name, records)
+    X_fit, X_hold, y_fit, y_hold = _split(X_new, y_new, holdout_fraction, seed)
+    holdouts['new_holdout'] = (X_hold, y_hold)
+
+    start = time.perf_counter()
+    updated = continue_boosting(current, X_fit, y_fit, trees)
+    seconds = time.perf_counter() - start
+
+    metrics = {}
+    for holdout, (X, y) in holdouts.items():
+        metrics[holdout] = {'before': evaluate(current, X, y), 'after': evaluate(updated, X, y)}
+    failed = regressions(metrics, tolerance)
+
+    from native_models import split_model
+    report = {
+        'model': name,
+        'base_artifact': MODEL_FILES[name],
+        'base_sha256': sha256_file(artifact),
+        'records': source,
+        'new_rows': int(len(y_new)),
+        'fit_rows': int(len(y_fit)),
+        'rounds_before': split_model(current)[0].get_booster().num_boosted_rounds(),
+        'rounds_after': split_model(updated)[0].get_booster().num_boosted_rounds(),
+        'update_seconds': seconds,
+        'metrics': metrics,
+        'tolerance': tolerance,
+        'regressions': failed,
+        'accepted': not failed,
+    }
+    return updated, report
+
+def save_version(name, model, report, versions_dir=VERSIONS_DIR):
+    """Writes <artifact>.v<N>.pkl and its JSON record (N = next free version). Returns the pickle path."""
+    stem = os.path.splitext(MODEL_FILES[name])[0]
+    os.makedirs(versions_dir, exist_ok=True)
+    pattern = re.compile(rf'^{re.escape(stem)}\.v(\d+)\.pkl$')
+    existing = [int(m.group(1)) for m in map(pattern.match, os.listdir(versions_dir)) if m]
+    version = max(existing, default=0) + 1
+
+    path = os.path.join(versions_dir, f'{stem}.v{version}.pkl')
+    joblib.dump(model, path)
+    record = {'version': version, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'artifact': os.path.basename(path), 'sha256': sha256_file(path), **report}
+    with open(os.path.join(versions_dir, f'{stem}.v{version}.json'), 'w') as f:
+        json.dump(record, f, indent=2)
+        f.write('\n')
+    return path
+
+def promote(name, version_path, records=None, model_path='models'):
+    """Makes a saved version the live artifact and refreshes manifest.json and its feature manifest."""
+    from dataset_resolver import DATASETS, MODEL_DATASETS
+    from feature_manifest import write_feature_manifest
+    from model_registry import build_manifest
+    X, _ = _prepare(name)
+    source = DATASETS[MODEL_DATASETS[name]]
+    if records is not None:
+        if isinstance(records, str):
+            source += f" + {os.path.basename(records)}"
+            records = pd.read_csv(records)
+        else:
+            source += " + new records"
+        X = pd.concat([X, _prepare(name, records)[0]], ignore_index=True)
+    shutil.copyfile(version_path, os.path.join(model_path, MODEL_FILES[name]))
+    build_manifest(model_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        write_feature_manifest(name, joblib.load(version_path), X, model_path, source=source)
+
+def print_report(report):
+    print(f"Model '{report['model']}': {report['fit_rows']} of {report['new_rows']} new rows used for "
+          f"{report['rounds_after'] - report['rounds_before']} extra rounds "
+          f"({report['rounds_before']} -> {report['rounds_after']}) in {report['update_seconds']:.2f} s\n")
+    print(f"{'Held-out set':<12} | {'Rows':>6} | {'Accuracy before':>15} | {'after':>8} | "
+          f"{'Log loss before':>15} | {'after':>8}")
+    print("-" * 80)
+    for holdout, m in report['metrics'].items():
+        b, a = m['before'], m['after']
+        print(f"{holdout:<12} | {b['rows']:>6} | {b['accuracy'] * 100:>14.2f}% | {a['accuracy'] * 100:>7.2f}% | "
+              f"{b['log_loss']:>15.4f} | {a['log_loss']:>8.4f}")
+    print("-" * 80)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm-start retraining on new labelled records")
+    parser.add_argument('model', choices=list(INCREMENTAL_MODELS))
+    parser.add_argument('records', help="CSV of new records (raw layout of the model's dataset)")
+    parser.add_argument('--trees', type=int, default=DEFAULT_TREES, help="boosting rounds to append")
+    parser.add_argument('--holdout', type=float, default=HOLDOUT_FRACTION, help="share of new records held out")
+    parser.add_argument('--promote', action='store_true', help="replace the live artifact in models/")
+    parser.add_argument('--force', action='store_true', help="save the version even if metrics regress")
+    args = parser.parse_args()
+
+    model, report = update_model(args.model, args.records, args.trees, holdout_fraction=args.holdout)
+    print_report(report)
+    if not report['accepted']:
+        print("Held-out metrics regressed:\n  " + "\n  ".join(report['regressions']))
+        if not args.force:
+            sys.exit("Update rejected; no artifact written (use --force to keep it anyway).")
+    path = save_version(args.model, model, report)
+    print(f"Saved version: {path}")
+    if args.promote:
+        promote(args.model, path, args.records)
+        print(f"Promoted to {os.path.join('models', MODEL_FILES[args.model])} (manifest.json and feature manifest updated).")
+        print("Re-export the other backends: python native_models.py --export / python onnx_models.py --export")
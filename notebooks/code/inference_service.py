@@ -0,0 +1,294 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Long-running local inference service (asyncio, standard library only).
+
+    Endpoints (JSON over HTTP/1.1, keep-alive supported):
+        POST /predict/gate         {"features": [10 values]}
+        POST /predict/fatty_liver  {"features": [13 values]}
+        POST /predict/cancer       {"features": [8 values]}
+        POST /predict/hcv          {"features": [15 values]}  (LiverDiseasePredictor raw columns)
+        GET  /health, GET /models, GET /stats
+        GET  /metrics (Prometheus text), GET /metrics.json   (with --metrics)
+
+    "features" may also be an object keyed by column name.
+
+    Dynamic micro-batching: concurrent requests for the same endpoint are
+    queued for up to --max-wait-ms (or until --max-batch requests), scored
+    with ONE batched model call in a worker thread, and the results are fanned
+    back out to each caller.
+
+    Usage:
+        python inference_service.py --port 8080 --max-wait-ms 5 --max-batch 64
+        python inference_service.py --metrics   -> per-stage latency histograms (instrumentation.py)
+        python inference_service.py --backend onnx --onnx-threads 2   -> onnxruntime graphs (onnx_models.py)
+        python inference_service.py --backend bundle   -> one memory-mapped model bundle (model_bundle.py)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+from model_registry import get_registry
+from instrumentation import NULL_METRICS, PredictionMetrics
+from test_HC_ALL_models import LiverDiseasePredictor
+
+# Single-model endpoints (registry names)
+SINGLE_MODELS = ['gate', 'fatty_liver', 'cancer']
+
+# Largest accepted request body (a feature vector is well under 1 KB)
+MAX_BODY = 64 * 1024
+
+class MicroBatcher:
+    """Collects concurrent requests and scores them with one batched call."""
+
+    def __init__(self, name, score_fn, max_wait_ms=5.0, max_batch=64):
+        self.name = name
+        self.score_fn = score_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.stats = {'requests': 0, 'batches': 0, 'max_batch_seen': 0, 'score_seconds': 0.0}
+
+    async def submit(self, features):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((features, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # 1. Block for the first request, then gather more until the deadline or max size
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # 2. One batched model call (off the event loop)
+            X = np.array([features for features, _ in items], dtype=np.float64)
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, X)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # 3. Fan results back out
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+            self.stats['requests'] += len(items)
+            self.stats['batches'] += 1
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], len(items))
+            self.stats['score_seconds'] += time.perf_counter() - start
+
+class InferenceService:
+    def __init__(self, model_path='models', max_wait_ms=5.0, max_batch=64, metrics=False,
+                 backend='native', onnx_threads=1):
+        self.registry = get_registry(model_path)
+        self.metrics = PredictionMetrics() if metrics else NULL_METRICS
+        self.hcv = LiverDiseasePredictor(model_path=model_path, metrics=self.metrics,
+                                         backend=backend, onnx_threads=onnx_threads)
+        self.columns = {}
+        self.batchers = {}
+        self.tasks = []
+
+        for name in SINGLE_MODELS:
+            if backend == 'onnx':
+                from onnx_models import load_onnx_model
+                model = load_onnx_model(name, os.path.join(model_path, 'onnx'), onnx_threads)
+            elif backend == 'bundle':
+                from model_bundle import BUNDLE_FILENAME, get_bundle
+                model = get_bundle(os.path.join(model_path, BUNDLE_FILENAME)).get(name)
+            else:
+                model = self.registry.get(name)
+            self.columns[name] = [str(c) for c in model.feature_names_in_]
+            self.batchers[name] = MicroBatcher(name, self._single_model_scorer(name, model), max_wait_ms, max_batch)
+
+        if not self.hcv.load_models():
+            raise RuntimeError("HCV models could not be loaded (see the errors above).")
+        self.columns['hcv'] = list(self.hcv.raw_input_cols)
+        self.batchers['hcv'] = MicroBatcher('hcv', self._score_hcv, max_wait_ms, max_batch)
+
+    def _single_model_scorer(self, name, model):
+        metrics = self.metrics
+        def score(X):
+            with metrics.stage('model_call', name):
+                proba = model.predict_proba(X)[:, 1]
+            with metrics.stage('output_formatting', name):
+                results = [{'label': int(p > 0.5), 'probability': float(p)} for p in proba]
+            if metrics.enabled:
+                metrics.count('calls', name)
+                metrics.count('rows', name, len(results))
+            return results
+        return score
+
+    def _score_hcv(self, X):
+        # Response records are built inside the predictor's 'output_formatting' stage
+        return self.hcv.predict_batch(X, as_records=True)
+
+    def parse_features(self, name, payload):
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object with a 'features' field")
+        features = payload.get('features')
+        columns = self.columns[name]
+        if isinstance(features, dict):
+            missing = [c for c in columns if c not in features]
+            if missing:
+                raise ValueError(f"Missing features: {missing}")
+            features = [features[c] for c in columns]
+        if not isinstance(features, list) or len(features) != len(columns):
+            raise ValueError(f"'features' must be a list of {len(columns)} values in order: {columns}")
+        values = [float(v) for v in features]
+        if not all(math.isfinite(v) for v in values):
+            raise ValueError("Feature values must be finite numbers (no NaN or Infinity)")
+        return values
+
+    async def handle_request(self, method, path, body):
+        """Returns (status, payload) for one HTTP request."""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/models':
+            return 200, self.columns
+        if method == 'GET' and path == '/stats':
+            return 200, {name: b.stats for name, b in self.batchers.items()}
+        if method == 'GET' and path in ('/metrics', '/metrics.json'):
+            if not self.metrics.enabled:
+                return 404, {'error': 'Metrics are disabled (start the service with --metrics)'}
+            return 200, self.metrics.to_prometheus() if path == '/metrics' else self.metrics.snapshot()
+
+        if method == 'POST' and path.startswith('/predict/'):
+            name = path[len('/predict/'):]
+            if name not in self.batchers:
+                return 404, {'error': f"Unknown model '{name}'"}
+            try:
+                features = self.parse_features(name, json.loads(body or b'{}'))
+            except (ValueError, TypeError) as e:
+                return 400, {'error': str(e)}
+            return 200, await self.batchers[name].submit(features)
+
+        return 404, {'error': 'Not found'}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    header = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.write_response(writer, 400, {'error': 'Request header too large'})
+                    break
+                lines = header.decode('latin-1').split('\r\n')
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+                try:
+                    method, path, _ = lines[0].split(' ', 2)
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Unparseable request line or Content-Length: the stream cannot be resynchronized
+                    await self.write_response(writer, 400, {'error': 'Malformed HTTP request'})
+                    break
+                if length > MAX_BODY:
+                    await self.write_response(writer, 413, {'error': f"Request body exceeds {MAX_BODY} bytes"})
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b''
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    break
+
+                try:
+                    status, payload = await self.handle_request(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+                await self.write_response(writer, status, payload)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def write_response(writer, status, payload):
+        if isinstance(payload, str):  # Prometheus text exposition
+            data, content_type = payload.encode(), 'text/plain; version=0.0.4'
+        else:
+            data, content_type = json.dumps(payload).encode(), 'application/json'
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  500: 'Internal Server Error'}.get(status, 'Error')
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        # Keep references: the event loop holds tasks only weakly
+        self.tasks = [asyncio.create_task(batcher.run(), name=f'batcher-{name}')
+                      for name, batcher in self.batchers.items()]
+        try:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            print(f"AiLDS inference service listening on http://{host}:{port}")
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in self.tasks:
+                task.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="AiLDS asyncio inference service with micro-batching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model-path', default='models')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Max time a request waits for its batch")
+    parser.add_argument('--max-batch', type=int, default=64, help="Max requests scored in one model call")
+    parser.add_argument('--metrics', action='store_true', help="Record per-stage latency histograms (/metrics)")
+    parser.add_argument('--backend', choices=['native', 'onnx', 'bundle'], default='native')
+    parser.add_argument('--onnx-threads', type=int, default=1, help="onnxruntime intra-op threads per session")
+    args = parser.parse_args()
+
+    try:
+        service = InferenceService(args.model_path, args.max_wait_ms, args.max_batch, args.metrics,
+                                   args.backend, args.onnx_threads)
+    except Exception as e:
+        sys.exit(f"Startup failed: {e}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    NHANES ingestion for the fatty-liver dataset.
+    Builds the fatty-liver panel from the NHANES SAS transport files in
+    `data/raw/`:
+        BIOPRO_<cycle>.xpt  (standard biochemistry profile)
+        CBC_<cycle>.xpt     (complete blood count -> platelets)
+        HDL_<cycle>.xpt     (HDL cholesterol)
+
+    - Only the needed variables are decoded: the fixed-width XPORT records
+      are memory-mapped and just the kept 8-byte IBM floats are converted
+      (pandas' reader supplies the header; pd.read_sas would decode every
+      variable of every record).
+    - CBC and HDL are hash-joined onto the biochemistry panel by SEQN
+      (respondent sequence number), and NHANES codes are renamed to the
+      13 fatty-liver model columns. Only complete panels are kept.
+    - Incremental: each cycle (file suffix, e.g. H = 2013-2014) is written
+      as its own partition under `data/processed/nhanes/`, and the SHA-256 of
+      its raw files is recorded in `state.json` (with the SHA-256 of every
+      combined CSV written from them). Unchanged cycles are skipped;
+      adding the files of a new cycle only processes that cycle. The final
+      CSV is the concatenation of all partitions in cycle order.
+    - The combined CSV goes to `data/processed/nhanes/FattyLiver.csv` by
+      default, next to the partitions, so a run never touches the committed
+      training dataset. `--publish` replaces `data/processed/FattyLiver.csv`
+      instead; whenever the output is a registered dataset, its
+      checksums.json entry is refreshed so dataset_resolver keeps accepting it.
+
+    Usage:
+        python ingest_nhanes.py                      -> ingest new/changed cycles into data/processed/nhanes/
+        python ingest_nhanes.py --force              -> reprocess every cycle
+        python ingest_nhanes.py --publish            -> replace the training dataset (and its checksum)
+        python ingest_nhanes.py --output other.csv   -> write the combined dataset elsewhere
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dataset_resolver import CHECKSUM_FILENAME, DATASETS, registered_filename, update_checksums
+from dataset_store import DATA_DIR
+from model_registry import sha256_file
+
+RAW_DIR = os.path.join(os.path.dirname(DATA_DIR), 'raw')
+PARTITION_DIR = os.path.join(DATA_DIR, 'nhanes')
+STATE_FILENAME = 'state.json'
+DEFAULT_OUTPUT = os.path.join(PARTITION_DIR, DATASETS['fatty_liver'])
+PUBLISHED_OUTPUT = os.path.join(DATA_DIR, DATASETS['fatty_liver'])
+
+# NHANES file prefix -> {variable code: model column}
+NHANES_VARIABLES = {
+    'BIOPRO': {
+        'LBXSAL': 'Albumin',        # g/dL
+        'LBXSAPSI': 'ALP',          # U/L
+        'LBXSASSI': 'AST',          # U/L
+        'LBXSATSI': 'ALT',          # U/L
+        'LBXSCH': 'Cholesterol',    # mg/dL
+        'LBXSCR': 'Creatinine',     # mg/dL
+        'LBXSGL': 'Glucose',        # mg/dL
+        'LBXSGTSI': 'GGT',          # U/L
+        'LBXSTB': 'Bilirubin',      # mg/dL
+        'LBXSTR': 'Triglycerides',  # mg/dL
+        'LBXSUA': 'Uric_Acid',      # mg/dL
+    },
+    'CBC': {'LBXPLTSI': 'Platelets'},  # 1000 cells/uL
+    'HDL': {'LBDHDD': 'HDL'},          # mg/dL
+}
+
+# Output column order (SEQN + fatty-liver model inputs)
+OUTPUT_COLUMNS = [
+    'SEQN', 'Albumin', 'ALP', 'AST', 'ALT', 'Cholesterol', 'Creatinine',
+    'Glucose', 'GGT', 'Bilirubin', 'Triglycerides', 'Uric_Acid', 'Platelets', 'HDL'
+]
+
+def discover_cycles(raw_dir=RAW_DIR):
+    """Returns {cycle suffix: {prefix: path}} for every cycle with all three files present."""
+    cycles = {}
+    for path in glob.glob(os.path.join(raw_dir, '*.xpt')) + glob.glob(os.path.join(raw_dir, '*.XPT')):
+        match = re.fullmatch(r'([A-Z]+)_([A-Z]+)\.xpt', os.path.basename(path), re.IGNORECASE)
+        if match and match.group(1).upper() in NHANES_VARIABLES:
+            cycles.setdefault(match.group(2).upper(), {})[match.group(1).upper()] = path
+    return {c: files for c, files in sorted(cycles.items()) if len(files) == len(NHANES_VARIABLES)}
+
+def ibm_to_float64(fields):
+    """IBM hexadecimal floats ((n, width <= 8) big-endian bytes) -> float64; SAS missing codes -> NaN."""
+    padded = np.zeros((len(fields), 8), dtype=np.uint8)
+    padded[:, :fields.shape[1]] = fields  # Truncated fields drop trailing fraction bytes
+    raw = padded.view('>u8').ravel()
+    fraction = raw & np.uint64(0x00FFFFFFFFFFFFFF)
+    exponent = ((raw >> np.uint64(56)) & np.uint64(0x7F)).astype(np.int64)
+    values = np.ldexp(fraction.astype(np.float64), 4 * (exponent - 64) - 56)  # 0.fraction x 16^(exponent - 64)
+    values[(raw >> np.uint64(63)) == 1] *= -1
+    values[(fraction == 0) & ((raw >> np.uint64(56)) != 0)] = np.nan  # '.', '.A'-'.Z', '._'
+    return values
+
+def read_xpt_columns(path, columns):
+    """Reads only SEQN + `columns` (numeric variables) from a SAS transport file."""
+    keep = ['SEQN'] + list(columns)
+    with pd.read_sas(path, format='xport', iterator=True) as reader:  # Parses the header only
+        fields = {f['name'].decode().strip(): f for f in reader.fields}
+        record_length, record_start, rows = reader.record_length, reader.record_start, reader.nobs
+    missing = [c for c in keep if c not in fields or fields[c]['ntype'] != 'numeric']
+    if missing:
+        raise ValueError(f"{path} has no numeric variables {missing}")
+    records = np.memmap(path, dtype=np.uint8, mode='r', offset=record_start, shape=(rows, record_length))
+    return pd.DataFrame({
+        c: ibm_to_float64(records[:, fields[c]['npos']:fields[c]['npos'] + fields[c]['field_length']])
+        for c in keep
+    })
+
+def ingest_cycle(files):
+    """Joins one cycle's three files on SEQN and returns complete panels in OUTPUT_COLUMNS order."""
+    tables = {prefix: read_xpt_columns(files[prefix], codes) for prefix, codes in NHANES_VARIABLES.items()}
+    base = tables['BIOPRO']
+    seqn = base['SEQN'].to_numpy()
+
+    out = {'SEQN': seqn}
+    out.update({name: base[code].to_numpy() for code, name in NHANES_VARIABLES['BIOPRO'].items()})
+    for prefix in ('CBC', 'HDL'):
+        # Hash join: SEQN hash index of the right table, probed with the base SEQNs
+        right = tables[prefix]
+        position = pd.Index(right['SEQN'].to_numpy()).get_indexer(seqn)
+        for code, name in NHANES_VARIABLES[prefix].items():
+            values = np.append(right[code].to_numpy(dtype=np.float64), np.nan)
+            out[name] = values[position]  # position -1 -> trailing NaN (no match)
+
+    df = pd.DataFrame(out)[OUTPUT_COLUMNS]
+    df = df.dropna().reset_index(drop=True)
+    df['SEQN'] = df['SEQN'].astype(np.int64)
+    return df
+
+def load_state():
+    path = os.path.join(PARTITION_DIR, STATE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_state(state):
+    with open(os.path.join(PARTITION_DIR, STATE_FILENAME), 'w') as f:
+        json.dump(state, f, indent=2)
+        f.write('\n')
+
+def partition_path(cycle):
+    return os.path.join(PARTITION_DIR, f'FattyLiver_{cycle}.csv')
+
+def run_ingestion(output=DEFAULT_OUTPUT, force=False, raw_dir=RAW_DIR):
+    cycles = discover_cycles(raw_dir)
+    if not cycles:
+        print(f"No complete NHANES cycles (BIOPRO/CBC/HDL) found in {raw_dir}")
+        return None
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    state = load_state()
+
+    print(f"{'Cycle':<6} | {'Action':<9} | {'Rows':>6} | {'Time (s)':>8}")
+    print("-" * 40)
+    changed = False
+    for cycle, files in cycles.items():
+        hashes = {os.path.basename(p): sha256_file(p) for p in files.values()}
+        if not force and state.get(cycle) == hashes and os.path.exists(partition_path(cycle)):
+            print(f"{cycle:<6} | {'unchanged':<9} | {'-':>6} | {'-':>8}")
+            continue
+        start = time.perf_counter()
+        df = ingest_cycle(files)
+        df.to_csv(partition_path(cycle), index=False, float_format='%.10g')
+        state[cycle] = hashes
+        changed = True
+        print(f"{cycle:<6} | {'ingested':<9} | {len(df):>6} | {time.perf_counter() - start:>8.2f}")
+    print("-" * 40)
+    save_state(state)
+
+    # Output key: the combined CSV is only current if this ingest wrote it from these partitions
+    outputs = state.setdefault('outputs', {})
+    key = os.path.realpath(output)
+    if not changed and os.path.exists(output) and outputs.get(key) == sha256_file(output):
+        print(f"Nothing changed; {output} is up to date.")
+        return output
+
+    # Combine partitions (cheap: already joined and cleaned) in cycle order
+    with open(output, 'w', newline='') as out:
+        for i, cycle in enumerate(cycles):
+            with open(partition_path(cycle)) as part:
+                header = part.readline()
+                if i == 0:
+                    out.write(header)
+                out.writelines(part)
+    outputs[key] = sha256_file(output)
+    save_state(state)
+    print(f"Wrote {output}")
+    filename = registered_filename(output)
+    if filename is not None:
+        update_checksums([filename])
+        print(f"Updated {CHECKSUM_FILENAME} for {filename}")
+    return output
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild FattyLiver.csv from NHANES XPT files")
+    parser.add_argument('--output', default=None, help=f"Combined CSV (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--publish', action='store_true',
+                        help=f"Write {PUBLISHED_OUTPUT} (the training dataset) and refresh its checksum")
+    parser.add_argument('--raw-dir', default=RAW_DIR)
+    parser.add_argument('--force', action='store_true', help="Reprocess every cycle")
+    args = parser.parse_args()
+    if args.publish and args.output:
+        parser.error("--publish and --output are mutually exclusive")
+    run_ingestion(PUBLISHED_OUTPUT if args.publish else args.output or DEFAULT_OUTPUT, args.force, args.raw_dir)
@@ -0,0 +1,229 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Per-stage timing instrumentation for the prediction path.
+    Stages (label `stage`, per model label `model`):
+        feature_engineering -> input_assembly -> model_call -> output_formatting (-> report)
+    Every stage feeds a fixed-bucket latency histogram (one bisect + two
+    additions per observation); counters track calls and rows per model.
+
+    Export:
+        metrics.to_prometheus()   -> Prometheus text exposition format
+        metrics.snapshot()        -> JSON-serializable dict (count, sum, p50/p99 estimates, buckets)
+
+    Disabled (the default): components use NULL_METRICS, whose `stage()`
+    returns one shared no-op context manager, so nothing is timed or stored.
+
+    Usage:
+        predictor = LiverDiseasePredictor(metrics=PredictionMetrics())
+        python instrumentation.py   -> per-stage breakdown of LiverDiseasePredictor + disabled-path overhead
+"""
+
+import bisect
+import json
+import threading
+import time
+
+# Latency bucket upper bounds in seconds (Prometheus `le` labels)
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot: +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket (as Prometheus histogram_quantile)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+class _Timer:
+    __slots__ = ('histogram', 'lock', 'start')
+
+    def __init__(self, histogram, lock):
+        self.histogram = histogram
+        self.lock = lock
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.histogram.observe(elapsed)
+        return False
+
+class PredictionMetrics:
+    """Histograms keyed by (stage, model) and counters keyed by (counter, model)."""
+    enabled = True
+
+    def __init__(self, namespace='ailds'):
+        self.namespace = namespace
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage, model):
+        key = (stage, model)
+        if key not in self.histograms:
+            with self._lock:
+                self.histograms.setdefault(key, Histogram())
+        return self.histograms[key]
+
+    def stage(self, stage, model):
+        """Context manager timing one stage: `with metrics.stage('model_call', 'hcv_stage'): ...`"""
+        return _Timer(self.histogram(stage, model), self._lock)
+
+    def observe(self, stage, model, seconds):
+        histogram = self.histogram(stage, model)
+        with self._lock:
+            histogram.observe(seconds)
+
+    def count(self, counter, model, n=1):
+        with self._lock:
+            self.counters[counter, model] = self.counters.get((counter, model), 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            stages = [{
+                'stage': stage,
+                'model': model,
+                'count': h.count,
+                'sum_seconds': h.sum,
+                'mean_ms': h.sum / h.count * 1000 if h.count else None,
+                'p50_ms': h.quantile(0.5) * 1000 if h.count else None,
+                'p99_ms': h.quantile(0.99) * 1000 if h.count else None,
+                'buckets': dict(zip([str(b) for b in h.buckets] + ['+Inf'], h.counts)),
+            } for (stage, model), h in sorted(self.histograms.items())]
+            counters = [{'counter': c, 'model': m, 'value': v} for (c, m), v in sorted(self.counters.items())]
+        return {'created': time.time(), 'stages': stages, 'counters': counters}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        name = f"{self.namespace}_stage_seconds"
+        lines = [f"# HELP {name} Latency of prediction-path stages in seconds.",
+                 f"# TYPE {name} histogram"]
+        with self._lock:
+            for (stage, model), h in sorted(self.histograms.items()):
+                labels = f'stage="{stage}",model="{model}"'
+                cumulative = 0
+                for bound, c in zip([repr(b) for b in h.buckets] + ['+Inf'], h.counts):
+                    cumulative += c
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {h.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+            for counter in sorted({c for c, _ in self.counters}):
+                metric = f"{self.namespace}_{counter}_total"
+                lines += [f"# TYPE {metric} counter"]
+                lines += [f'{metric}{{model="{m}"}} {v}' for (c, m), v in sorted(self.counters.items()) if c == counter]
+        return '\n'.join(lines) + '\n'
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class NullMetrics:
+    """Disabled instrumentation: same interface, records nothing."""
+    enabled = False
+
+    def stage(self, stage, model):
+        return _NULL_TIMER
+
+    def observe(self, stage, model, seconds):
+        pass
+
+    def count(self, counter, model, n=1):
+        pass
+
+NULL_METRICS = NullMetrics()
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import os
+    import sys
+    import numpy as np
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+    from benchmark_utils import time_calls, latency_summary
+    from model_inputs import sample_inputs
+    from test_HC_ALL_models import LiverDiseasePredictor
+
+    patients = sample_inputs('hcv', 256).to_numpy(dtype=np.float64)
+    metrics = PredictionMetrics()
+    plain = LiverDiseasePredictor(model_path='models')
+    instrumented = LiverDiseasePredictor(model_path='models', metrics=metrics)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain.load_models()
+        instrumented.load_models()
+
+    disabled = latency_summary(time_calls(lambda: plain.predict_batch(patients[:1]), 500, warmup=20))
+    enabled = latency_summary(time_calls(lambda: instrumented.predict_batch(patients[:1]), 500, warmup=20))
+    metrics.reset()
+    for size in (1, 256):
+        for _ in range(200):
+            instrumented.predict_batch(patients[:size])
+
+    print(f"{'Stage':<20} | {'Model':<18} | {'Calls':>6} | {'Mean (ms)':>9} | {'p50 (ms)':>8} | {'p99 (ms)':>8}")
+    print("-" * 84)
+    for s in metrics.snapshot()['stages']:
+        print(f"{s['stage']:<20} | {s['model']:<18} | {s['count']:>6} | {s['mean_ms']:>9.3f} | "
+              f"{s['p50_ms']:>8.3f} | {s['p99_ms']:>8.3f}")
+    print("-" * 84)
+
+    # Cost of the disabled hooks themselves (5 stage hooks + 4 counters per predict_batch)
+    def null_hooks(n=1000):
+        for _ in range(n):
+            with NULL_METRICS.stage('model_call', 'hcv_stage'):
+                pass
+    null_timings = time_calls(null_hooks, 200)
+    per_hook_ns = float(np.median(null_timings)) / 1000 * 1e9
+    print(f"\nSingle-patient predict_batch p50: disabled {disabled['p50_ms']:.3f} ms | enabled {enabled['p50_ms']:.3f} ms")
+    print(f"Disabled hook cost: ~{per_hook_ns:.0f} ns each, "
+          f"{per_hook_ns * 9 / 1e6 / disabled['p50_ms'] * 100:.4f}% of a single-patient call")
@@ -0,0 +1,162 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Declarative clinical labeling rules, compiled to vectorized NumPy masks.
+    A rule set is plain data:
+        - conditions: named threshold tests  {name: (column, operator, value)}
+        - clauses:    positive if ANY clause holds; a clause holds when ALL of
+                      its conditions hold (OR of ANDs)
+    Each condition is evaluated once per batch as a boolean mask and the
+    clauses are combined with logical AND / OR, so labeling is one vectorized
+    pass. `label_chunks` applies the same compiled rule to a chunked stream.
+
+    Rule sets are swappable: register a new dict in RULE_SETS or load one
+    from JSON with RuleSet.from_json().
+
+    Usage:
+        python labeling_rules.py   -> check the NAFLD rule against the row-wise reference
+"""
+
+import json
+import numpy as np
+
+OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+# NAFLD target used by train_fatty_liver_model.py:
+# (Triglycerides > 150 AND (ALT > 40 OR GGT > 40)) OR (ALT > 40 AND GGT > 40)
+NAFLD_CLINICAL = {
+    'name': 'nafld_clinical',
+    'conditions': {
+        'trig_high': ['Triglycerides', '>', 150],
+        'alt_high': ['ALT', '>', 40],
+        'ggt_high': ['GGT', '>', 40],
+    },
+    'clauses': [
+        ['trig_high', 'alt_high'],
+        ['trig_high', 'ggt_high'],
+        ['alt_high', 'ggt_high'],
+    ],
+}
+
+RULE_SETS = {
+    'nafld_clinical': NAFLD_CLINICAL,
+}
+
+class RuleSet:
+    def __init__(self, name, conditions, clauses, positive=1, negative=0):
+        # An empty clause would hold for every row (AND of nothing) and an empty rule set has no mask
+        if not clauses:
+            raise ValueError(f"Rule set '{name}' has no clauses")
+        if any(len(clause) == 0 for clause in clauses):
+            raise ValueError(f"Rule set '{name}' has an empty clause (it would label every row positive)")
+        for op in (c[1] for c in conditions.values()):
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator '{op}' (allowed: {list(OPERATORS)})")
+        for clause in clauses:
+            unknown = [c for c in clause if c not in conditions]
+            if unknown:
+                raise ValueError(f"Clause refers to undefined conditions: {unknown}")
+        self.name = name
+        self.conditions = {k: tuple(v) for k, v in conditions.items()}
+        self.clauses = [list(c) for c in clauses]
+        self.positive = positive
+        self.negative = negative
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(spec['name'], spec['conditions'], spec['clauses'],
+                   spec.get('positive', 1), spec.get('negative', 0))
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def columns(self):
+        """Input columns the rule set reads."""
+        return sorted({column for column, _, _ in self.conditions.values()})
+
+    def masks(self, data):
+        """One boolean mask per condition. `data` is a DataFrame or a dict of 1-D arrays."""
+        return {
+            name: OPERATORS[op](np.asarray(data[column], dtype=np.float64), value)
+            for name, (column, op, value) in self.conditions.items()
+        }
+
+    def match(self, data):
+        """Boolean mask of rows the rule set labels positive."""
+        masks = self.masks(data)
+        n = len(next(iter(masks.values())))
+        result = np.zeros(n, dtype=bool)
+        for clause in self.clauses:
+            result |= np.logical_and.reduce([masks[c] for c in clause])
+        return result
+
+    def label(self, data):
+        """int64 labels (positive / negative) for every row."""
+        return np.where(self.match(data), self.positive, self.negative).astype(np.int64)
+
+    def label_chunks(self, chunks):
+        """Labels a chunked stream (e.g. pd.read_csv(..., chunksize=N)); yields one array per chunk."""
+        for chunk in chunks:
+            yield self.label(chunk)
+
+def get_rule_set(name):
+    return RuleSet.from_dict(RULE_SETS[name])
+
+if __name__ == "__main__":
+    import os
+    import time
+    import pandas as pd
+
+    def clinical_diagnosis_logic(row):
+        """Original row-wise rule from train_fatty_liver_model.py (reference)."""
+        trig_high = row['Triglycerides'] > 150
+        alt_high = row['ALT'] > 40
+        ggt_high = row['GGT'] > 40
+        if (trig_high and (alt_high or ggt_high)) or (alt_high and ggt_high):
+            return 1
+        return 0
+
+    df = pd.read_csv(os.path.join('data', 'processed', 'FattyLiver.csv'))
+    df.columns = df.columns.str.strip()
+    df = df.apply(pd.to_numeric, errors='coerce').dropna()
+    big = pd.concat([df] * 50, ignore_index=True)
+    rules = get_rule_set('nafld_clinical')
+
+    start = time.perf_counter()
+    expected = big.apply(clinical_diagnosis_logic, axis=1)
+    row_wise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = rules.label(big)
+    vectorized = time.perf_counter() - start
+
+    chunked = np.concatenate(list(rules.label_chunks(big[i:i + 10000] for i in range(0, len(big), 10000))))
+    identical = np.array_equal(expected.to_numpy(), got) and expected.to_numpy().dtype == got.dtype
+    print(f"Rows labeled:        {len(big):,}")
+    print(f"Row-wise df.apply:   {row_wise * 1000:.1f} ms")
+    print(f"Compiled rule set:   {vectorized * 1000:.1f} ms ({row_wise / vectorized:.0f}x faster)")
+    print(f"Bit-identical:       {identical} (chunked stream: {np.array_equal(chunked, got)})")
+    print(f"Positive rate:       {got.mean() * 100:.2f}%")
@@ -0,0 +1,94 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Shared feature-engineering kernel for the Hepatitis C models.
+    Single source of truth for APRI, ALBI and the interaction terms, used by
+    the stage/status trainers and by LiverDiseasePredictor at inference time.
+
+    All features are computed in one vectorized pass over float64 arrays and
+    written into a preallocated (N x 5) output buffer.
+"""
+
+import numpy as np
+
+# Output column order of the kernel (stage/status models use ordered subsets)
+ENGINEERED_FEATURES = [
+    'APRI', 'ALBI_Score', 'Bilirubin_Albumin', 'Copper_Platelets', 'Bili_Alb_Ratio'
+]
+
+# Raw lab columns the kernel depends on
+SOURCE_COLUMNS = ['Bilirubin', 'Albumin', 'Copper', 'SGOT', 'Platelets']
+
+# Engineered feature -> raw columns it is computed from
+FEATURE_DEPENDENCIES = {
+    'APRI': ['SGOT', 'Platelets'],
+    'ALBI_Score': ['Bilirubin', 'Albumin'],
+    'Bilirubin_Albumin': ['Bilirubin', 'Albumin'],
+    'Copper_Platelets': ['Copper', 'Platelets'],
+    'Bili_Alb_Ratio': ['Bilirubin', 'Albumin'],
+}
+
+def compute_medical_features(bilirubin, albumin, copper, sgot, platelets, out=None):
+    """
+    Computes every engineered feature for a batch in a single pass.
+    Inputs are 1-D float arrays of equal length; `out` is an optional
+    preallocated (N x 5) float64 buffer (columns in ENGINEERED_FEATURES order).
+    """
+    n = len(bilirubin)
+    if out is None:
+        out = np.empty((n, len(ENGINEERED_FEATURES)), dtype=np.float64)
+    tmp = np.empty(n, dtype=np.float64)
+
+    # 1. APRI: AST to Platelet Ratio Index
+    apri = out[:, 0]
+    np.add(platelets, 0.1, out=tmp)
+    np.divide(sgot, 40.0, out=apri)
+    np.divide(apri, tmp, out=apri)
+    np.multiply(apri, 100, out=apri)
+
+    # 2. ALBI Score (Log-based liver function assessment)
+    albi = out[:, 1]
+    np.maximum(bilirubin, 0.1, out=albi)
+    np.multiply(albi, 17.1, out=albi)
+    np.log10(albi, out=albi)
+    np.multiply(albi, 0.66, out=albi)
+    np.multiply(albumin, 10, out=tmp)
+    np.multiply(tmp, -0.085, out=tmp)
+    np.add(albi, tmp, out=albi)
+
+    # 3. Liver Function Synthesis (Bilirubin x Albumin)
+    np.multiply(bilirubin, albumin, out=out[:, 2])
+
+    # 4. Copper/Platelet Ratio
+    np.add(platelets, 1, out=tmp)
+    np.divide(copper, tmp, out=out[:, 3])
+
+    # 5. Bilirubin to Albumin Ratio
+    np.add(albumin, 0.1, out=tmp)
+    np.divide(bilirubin, tmp, out=out[:, 4])
+
+    return out
+
+def add_medical_features(df, features=ENGINEERED_FEATURES):
+    """
+    Appends the requested engineered features to a DataFrame in place
+    (in ENGINEERED_FEATURES order) and returns it.
+    """
+    cols = [np.ascontiguousarray(df[c].to_numpy(dtype=np.float64)) for c in SOURCE_COLUMNS]
+    values = compute_medical_features(*cols)
+    for name in [f for f in ENGINEERED_FEATURES if f in features]:
+        df[name] = values[:, ENGINEERED_FEATURES.index(name)]
+    return df
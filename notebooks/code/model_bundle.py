@@ -0,0 +1,264 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Single-file bundle of all six models (models/ailds_models.bundle).
+    Layout:
+        [24-byte preamble]  magic 'AILDSBND', format version, header length
+        [JSON index]        per model: blob offset/length/SHA-256, native sidecar
+                            (column order, classes, StandardScaler constants),
+                            feature manifest, source pickle SHA-256
+        [booster blobs]     XGBoost native UBJSON, each starting on a 4 KB page
+    Loading: ModelBundle memory-maps the file read-only and parses only the
+    index. `get(name)` materializes one NativeModel on first use, so a worker
+    builds only the models it serves. The file is read through the OS page
+    cache, whose pages are shared by every process that maps the bundle, and
+    no sklearn Pipeline/ColumnTransformer graph is unpickled.
+
+    Usage:
+        python model_bundle.py --build                -> pack models/ into the bundle (with parity check)
+        python model_bundle.py --memory --workers 4   -> per-process memory: bundle vs per-pickle loading
+        LiverDiseasePredictor(backend='bundle') / inference_service.py --backend bundle
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_registry import MODEL_FILES
+
+BUNDLE_FILENAME = 'ailds_models.bundle'
+MAGIC = b'AILDSBND'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sIIQ')  # magic, format version, reserved, index length
+ALIGNMENT = 4096
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def build_bundle(model_path='models', output=None):
+    """Packs every registered model of model_path into one bundle file. Returns its index."""
+    from feature_manifest import read_feature_manifest
+    from model_registry import get_registry
+    from native_models import build_sidecar
+
+    registry = get_registry(model_path)
+    output = output or os.path.join(model_path, BUNDLE_FILENAME)
+    blobs, models = [], {}
+    for name in MODEL_FILES:
+        booster, sidecar = build_sidecar(name, registry.get(name))
+        blob = bytes(booster.save_raw('ubj'))
+        blobs.append(blob)
+        models[name] = {
+            'length': len(blob),
+            'sha256': hashlib.sha256(blob).hexdigest(),
+            'sidecar': sidecar,
+            'manifest': read_feature_manifest(name, model_path),
+            'source': {'artifact': MODEL_FILES[name], 'sha256': registry.manifest.get(MODEL_FILES[name], {}).get('sha256')},
+        }
+
+    # Offsets depend on the index size and the index holds the offsets: size it with placeholders first
+    index = {'format': FORMAT_VERSION, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'models': models}
+    for entry in models.values():
+        entry['offset'] = 0
+    header_end = PREAMBLE.size + len(json.dumps(index).encode()) + 64 * len(models)
+    offset = _align(header_end)
+    for entry, blob in zip(models.values(), blobs):
+        entry['offset'] = offset
+        offset = _align(offset + len(blob))
+    encoded = json.dumps(index).encode()
+    if PREAMBLE.size + len(encoded) > models[next(iter(models))]['offset']:
+        raise RuntimeError("Bundle index outgrew its reserved space.")
+
+    tmp = output + '.part'
+    with open(tmp, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(encoded)))
+        f.write(encoded)
+        for entry, blob in zip(models.values(), blobs):
+            f.seek(entry['offset'])
+            f.write(blob)
+        f.truncate(offset)
+    os.replace(tmp, output)
+    return index
+
+class ModelBundle:
+    """Read-only, memory-mapped bundle; models are materialized on first `get(name)`."""
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        self.verify = verify
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, length = PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a model bundle.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has bundle format {version}; this loader reads format {FORMAT_VERSION}.")
+        self.index = json.loads(self._map[PREAMBLE.size:PREAMBLE.size + length])
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.load_times = {}
+
+    @property
+    def names(self):
+        return list(self.index['models'])
+
+    def _entry(self, name):
+        if name not in self.index['models']:
+            raise KeyError(f"Model '{name}' is not in {self.path}. Available: {self.names}")
+        return self.index['models'][name]
+
+    def manifest(self, name):
+        """Feature manifest stored with the model (see feature_manifest.py)."""
+        return self._entry(name)['manifest']
+
+    def get(self, name):
+        """Returns the NativeModel, building it from the mapped booster blob on first use."""
+        model = self._cache.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._cache:
+                import xgboost as xgb
+                from native_models import NativeModel
+                start = time.perf_counter()
+                entry = self._entry(name)
+                blob = memoryview(self._map)[entry['offset']:entry['offset'] + entry['length']]
+                if self.verify and hashlib.sha256(blob).hexdigest() != entry['sha256']:
+                    raise ValueError(f"Checksum mismatch for '{name}' in {self.path}.")
+                booster = xgb.Booster()
+                booster.load_model(bytearray(blob))
+                blob.release()
+                self._cache[name] = NativeModel(booster, entry['sidecar'])
+                self.load_times[name] = time.perf_counter() - start
+        return self._cache[name]
+
+    def warm_up(self, names=None):
+        for name in names or self.names:
+            self.get(name)
+        return dict(self.load_times)
+
+    def is_loaded(self, name):
+        return name in self._cache
+
+# One mapping per bundle file, shared by every caller in the process
+_BUNDLES = {}
+
+def get_bundle(path=os.path.join('models', BUNDLE_FILENAME)):
+    key = os.path.abspath(path)
+    if key not in _BUNDLES:
+        _BUNDLES[key] = ModelBundle(path)
+    return _BUNDLES[key]
+
+def check_parity(path, model_path='models', rows=500):
+    """Max |probability difference| per model between the bundle and the pickles."""
+    from model_inputs import sample_inputs
+    from model_registry import get_registry
+    bundle, registry = ModelBundle(path), get_registry(model_path)
+    diffs = {}
+    for name in bundle.names:
+        X = sample_inputs(name, rows)
+        diffs[name] = float(np.abs(bundle.get(name).predict_proba(X) - registry.get(name).predict_proba(X)).max())
+    return diffs
+
+def worker(mode, model_path):
+    """Loads all six models the given way, scores one row each, reports, then waits for stdin to close."""
+    import pandas as pd
+    import xgboost as xgb
+    from benchmark_utils import read_memory_mb
+    baseline = read_memory_mb()  # Interpreter + numpy/pandas/xgboost (which imports sklearn)
+    start = time.perf_counter()
+    if mode == 'bundle':
+        source = ModelBundle(os.path.join(model_path, BUNDLE_FILENAME))
+    else:
+        from model_registry import ModelRegistry
+        source = ModelRegistry(model_path)
+    models = {name: source.get(name) for name in MODEL_FILES}
+    startup = time.perf_counter() - start
+    for model in models.values():
+        columns = [str(c) for c in model.feature_names_in_]
+        if mode == 'bundle':
+            model.predict_proba(np.zeros((1, len(columns))))
+        else:
+            model.predict_proba(pd.DataFrame(np.zeros((1, len(columns))), columns=model.feature_names_in_))
+    print(json.dumps({'startup_ms': startup * 1000, 'baseline_uss_mb': baseline['uss_mb'],
+                      'modules': len(sys.modules)}), flush=True)
+    sys.stdin.read()
+
+def memory_report(workers=4, model_path='models'):
+    """Starts `workers` processes per loading mode side by side and reports their memory."""
+    import subprocess
+    from benchmark_utils import read_memory_mb
+    model_path = os.path.abspath(model_path)
+    print(f"{workers} worker processes per mode, each holding all {len(MODEL_FILES)} models\n")
+    print(f"{'Mode':<8} | {'Load (ms)':>9} | {'RSS (MB)':>8} | {'PSS (MB)':>8} | {'USS (MB)':>8} | "
+          f"{'Models USS (MB)':>15} | {'Total USS (MB)':>14} | {'Files':>5} | {'Modules':>7}")
+    print("-" * 105)
+    for mode in ('pickle', 'bundle'):
+        procs = [subprocess.Popen([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--worker', mode,
+                                   '--model-path', model_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(workers)]
+        reports = [json.loads(p.stdout.readline()) for p in procs]
+        # Re-read once every worker is up, so pages shared between them are split in PSS
+        memory = [read_memory_mb(p.pid) for p in procs]
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+        mean = lambda key, rows: sum(r[key] for r in rows) / len(rows)
+        files = len(MODEL_FILES) + 1 if mode == 'pickle' else 1  # Pickles + manifest.json / one bundle
+        models_uss = mean('uss_mb', memory) - mean('baseline_uss_mb', reports)
+        print(f"{mode:<8} | {mean('startup_ms', reports):>9.1f} | {mean('rss_mb', memory):>8.1f} | "
+              f"{mean('pss_mb', memory):>8.1f} | {mean('uss_mb', memory):>8.1f} | {models_uss:>15.1f} | "
+              f"{sum(m['uss_mb'] for m in memory):>14.1f} | {files:>5} | {reports[0]['modules']:>7}")
+    print("-" * 105)
+    print("Per-process means. PSS splits shared pages between the processes mapping them; USS counts private pages.")
+    print("Models USS: private memory added by loading the six models (above the numpy/pandas/xgboost baseline).")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Single-file memory-mapped model bundle")
+    parser.add_argument('--build', action='store_true')
+    parser.add_argument('--memory', action='store_true')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--model-path', default='models')
+    parser.add_argument('--worker', choices=['pickle', 'bundle'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.model_path)
+    elif args.build:
+        path = os.path.join(args.model_path, BUNDLE_FILENAME)
+        index = build_bundle(args.model_path, path)
+        diffs = check_parity(path, args.model_path)
+        print(f"{'Model':<18} | {'Offset':>9} | {'Booster (KB)':>12} | {'Max |dp|':>10}")
+        print("-" * 60)
+        for name, entry in index['models'].items():
+            print(f"{name:<18} | {entry['offset']:>9} | {entry['length'] / 1024:>12.1f} | {diffs[name]:>10.2e}")
+        print("-" * 60)
+        print(f"Wrote {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+        if max(diffs.values()) > 1e-6:
+            sys.exit("Bundle does not match the pickles.")
+    elif args.memory:
+        memory_report(args.workers, args.model_path)
+    else:
+        parser.print_help()
@@ -0,0 +1,67 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Realistic model inputs for parity checks and benchmarks.
+    Rows are resampled from the processed dataset each model was trained on
+    (dataset_resolver.MODEL_DATASETS, the mapping the trainers use) and
+    returned in the model's exact input column order
+    (engineered HCV features are added with the shared kernel).
+"""
+
+import numpy as np
+
+from dataset_resolver import MODEL_DATASETS, resolve
+from dataset_store import load_dataset
+from medical_features import add_medical_features
+
+# The raw HCV panel ('hcv', LiverDiseasePredictor input) is sampled from the full HCV dataset
+HCV_PANEL_DATASET = 'hepatitis_c'
+
+# Raw 15-column HCV panel (LiverDiseasePredictor input)
+HCV_RAW_COLUMNS = [
+    'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
+    'Tryglicerides', 'Platelets', 'Prothrombin', 'Age', 'Sex',
+    'Ascites', 'Hepatomegaly', 'Spiders', 'Edema'
+]
+
+_PANELS = {}
+
+def panel_dataset(name):
+    """Logical dataset (see dataset_resolver.DATASETS) a model or 'hcv' is sampled from."""
+    return HCV_PANEL_DATASET if name == 'hcv' else MODEL_DATASETS[name]
+
+def load_panel(dataset):
+    """Loads a processed dataset once per process (numeric, no missing values)."""
+    if dataset not in _PANELS:
+        df = load_dataset(resolve(dataset))
+        df.columns = df.columns.str.strip(' ')
+        df = df.dropna().reset_index(drop=True)
+        _PANELS[dataset] = add_medical_features(df) if 'SGOT' in df.columns else df
+    return _PANELS[dataset]
+
+def input_columns(name):
+    """Input column order of a model ('hcv' = the raw 15-column panel)."""
+    if name == 'hcv':
+        return HCV_RAW_COLUMNS
+    from model_registry import get_registry
+    return list(get_registry('models').get(name).feature_names_in_)
+
+def sample_inputs(name, n, seed=42):
+    """Returns N resampled rows as a DataFrame in the model's input column order."""
+    df = load_panel(panel_dataset(name))
+    rng = np.random.default_rng(seed)
+    rows = df.iloc[rng.integers(0, len(df), size=n)]
+    return rows[input_columns(name)].reset_index(drop=True)
@@ -0,0 +1,166 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Single local registry over the `models/` directory.
+    - Lazy: each model is unpickled on first `get(name)` and cached in memory,
+      so repeated calls (from any script in the process) never unpickle twice.
+    - Verified: every file is checked against the SHA-256 manifest
+      (`models/manifest.json`) before it is loaded.
+    - Offline: no network on the hot path. GitHub is only contacted once,
+      when a file is missing locally (e.g. a fresh Colab session).
+
+    Usage:
+        python model_registry.py                  -> verify and warm up all models
+        python model_registry.py --build-manifest -> rewrite models/manifest.json
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import joblib
+import requests
+
+REPO_BASE_URL = "https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/models/"
+MANIFEST_FILENAME = 'manifest.json'
+DOWNLOAD_TIMEOUT = 60  # Seconds
+
+# Logical model name -> artifact in models/
+MODEL_FILES = {
+    'gate': 'gate_model.pkl',
+    'fatty_liver': 'fatty_liver_model.pkl',
+    'cancer': 'cancer_model.pkl',
+    'hcv_stage': 'hepatitisC_stage_model.pkl',
+    'hcv_status': 'hepatitisC_status_model.pkl',
+    'hcv_complications': 'hepatitisC_complications.pkl',
+}
+
+def sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_manifest(model_path='models'):
+    """Writes models/manifest.json with the SHA-256 and size of every registered artifact."""
+    manifest = {}
+    for name, filename in MODEL_FILES.items():
+        path = os.path.join(model_path, filename)
+        manifest[filename] = {'sha256': sha256_file(path), 'bytes': os.path.getsize(path)}
+    with open(os.path.join(model_path, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+class ModelRegistry:
+    def __init__(self, model_path='models', verify=True):
+        self.model_path = model_path
+        self.verify = verify
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._manifest = None
+        self.load_times = {}
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            path = os.path.join(self.model_path, MANIFEST_FILENAME)
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {}  # Every verified load then fails in check()
+        return self._manifest
+
+    def path(self, name):
+        if name not in MODEL_FILES:
+            raise KeyError(f"Unknown model '{name}'. Available: {list(MODEL_FILES)}")
+        return os.path.join(self.model_path, MODEL_FILES[name])
+
+    def ensure_local(self, name):
+        """Returns the local artifact path, downloading it once from GitHub if missing."""
+        path = self.path(name)
+        if not os.path.exists(path):
+            filename = MODEL_FILES[name]
+            print(f"  Model '{filename}' missing locally. Downloading from GitHub...")
+            os.makedirs(self.model_path, exist_ok=True)
+            response = requests.get(REPO_BASE_URL + filename, timeout=DOWNLOAD_TIMEOUT)
+            response.raise_for_status()
+            with open(path + '.part', 'wb') as f:
+                f.write(response.content)
+            os.replace(path + '.part', path)  # Never leave a truncated pickle behind
+        return path
+
+    def check(self, name):
+        """Verifies an artifact against the manifest. Raises ValueError if it is unlisted or mismatched."""
+        path = self.ensure_local(name)
+        expected = self.manifest.get(MODEL_FILES[name])
+        if expected is None:
+            raise ValueError(f"{MODEL_FILES[name]} is not listed in {os.path.join(self.model_path, MANIFEST_FILENAME)} "
+                             f"(rebuild it with: python model_registry.py --build-manifest).")
+        if sha256_file(path) != expected['sha256']:
+            raise ValueError(f"Checksum mismatch for {path}: file does not match {MANIFEST_FILENAME}.")
+        return path
+
+    def get(self, name):
+        """Returns the in-memory model, loading and verifying it on first use."""
+        model = self._cache.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._cache:
+                start = time.perf_counter()
+                path = self.check(name) if self.verify else self.ensure_local(name)
+                self._cache[name] = joblib.load(path)
+                self.load_times[name] = time.perf_counter() - start
+        return self._cache[name]
+
+    def warm_up(self, names=None):
+        """Loads (and verifies) the given models, or all of them, ahead of the first request."""
+        for name in names or MODEL_FILES:
+            self.get(name)
+        return dict(self.load_times)
+
+    def is_loaded(self, name):
+        return name in self._cache
+
+# One shared registry per models directory, so every caller in the process reuses the cache
+_REGISTRIES = {}
+
+def get_registry(model_path='models'):
+    key = os.path.abspath(model_path)
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = ModelRegistry(model_path)
+    return _REGISTRIES[key]
+
+if __name__ == "__main__":
+    if '--build-manifest' in sys.argv:
+        manifest = build_manifest('models')
+        print(f"Wrote {os.path.join('models', MANIFEST_FILENAME)} ({len(manifest)} artifacts).")
+        sys.exit(0)
+
+    registry = get_registry('models')
+    timings = registry.warm_up()
+    print(f"{'Model':<20} | {'File':<30} | {'Load (ms)'}")
+    print("-" * 65)
+    for name, seconds in timings.items():
+        print(f"{name:<20} | {MODEL_FILES[name]:<30} | {seconds*1000:.1f}")
+    print("-" * 65)
+    print("All models verified against manifest and cached in memory.")
@@ -0,0 +1,142 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Native XGBoost artifact format.
+    - Export: writes every booster in `models/` as XGBoost's native UBJSON
+      (`models/native/<name>.ubj`) plus a small JSON sidecar with the input
+      column order, StandardScaler means/scales (Pipeline models) and classes.
+    - Load: `load_native_model(name)` rebuilds a ready-to-predict object from
+      those two files without unpickling sklearn Pipeline/ColumnTransformer graphs.
+
+    Usage:
+        python native_models.py --export   -> export all models and check parity
+"""
+
+import json
+import os
+import sys
+import numpy as np
+import xgboost as xgb
+
+NATIVE_DIR = os.path.join('models', 'native')
+
+def split_model(model):
+    """Returns (XGBClassifier, scaler or None, input column order) for plain and Pipeline models."""
+    if hasattr(model, 'named_steps'):
+        preprocessor = model.named_steps['preprocessor']
+        classifier = model.named_steps['classifier']
+        scaler, num_cols = None, []
+        for name, transformer, cols in preprocessor.transformers_:
+            if name == 'num':
+                scaler, num_cols = transformer, list(cols)
+            elif name == 'cat' and len(cols):
+                raise NotImplementedError("Categorical (one-hot) columns are not supported by the native format.")
+        return classifier, scaler, num_cols
+    return model, None, list(model.feature_names_in_)
+
+def build_sidecar(name, model):
+    """Returns (booster, sidecar) for a pickled model: everything NativeModel needs besides the trees."""
+    classifier, scaler, feature_names = split_model(model)
+    booster = classifier.get_booster()
+    config = json.loads(booster.save_config())
+    return booster, {
+        'name': name,
+        'feature_names': feature_names,
+        'classes': [int(c) for c in classifier.classes_],
+        'objective': config['learner']['objective']['name'],
+        'scaler': None if scaler is None else {
+            'mean': scaler.mean_.tolist(),
+            'scale': scaler.scale_.tolist(),
+        },
+    }
+
+def export_model(name, model, native_dir=NATIVE_DIR):
+    """Writes <name>.ubj (booster) and <name>.json (sidecar) into native_dir."""
+    booster, sidecar = build_sidecar(name, model)
+    os.makedirs(native_dir, exist_ok=True)
+    booster.save_model(os.path.join(native_dir, f'{name}.ubj'))
+    with open(os.path.join(native_dir, f'{name}.json'), 'w') as f:
+        json.dump(sidecar, f, indent=2)
+        f.write('\n')
+    return sidecar
+
+class NativeModel:
+    """Ready-to-predict model rebuilt from a native booster and its sidecar."""
+
+    def __init__(self, booster, sidecar):
+        self.booster = booster
+        self.name = sidecar['name']
+        self.feature_names_in_ = np.array(sidecar['feature_names'], dtype=object)
+        self.classes_ = np.array(sidecar['classes'])
+        self.objective = sidecar['objective']
+        scaler = sidecar['scaler']
+        self.mean_ = None if scaler is None else np.array(scaler['mean'])
+        self.scale_ = None if scaler is None else np.array(scaler['scale'])
+
+    def transform(self, X):
+        """Orders columns (DataFrames) and applies the stored StandardScaler, if any."""
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if self.mean_ is not None:
+            X = (X - self.mean_) / self.scale_
+        return X
+
+    def predict_proba(self, X):
+        proba = self.booster.inplace_predict(self.transform(X), validate_features=False)
+        if proba.ndim == 1:
+            proba = np.column_stack([1 - proba, proba])
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def load_native_model(name, native_dir=NATIVE_DIR):
+    """Loads <name>.ubj + <name>.json from native_dir into a NativeModel."""
+    with open(os.path.join(native_dir, f'{name}.json')) as f:
+        sidecar = json.load(f)
+    booster = xgb.Booster(model_file=os.path.join(native_dir, f'{name}.ubj'))
+    return NativeModel(booster, sidecar)
+
+def export_all(native_dir=NATIVE_DIR):
+    """Exports every registered model and checks predict_proba parity against the pickle."""
+    from model_registry import MODEL_FILES, get_registry
+    from model_inputs import sample_inputs
+
+    registry = get_registry('models')
+    print(f"{'Model':<20} | {'Booster (KB)':>12} | {'Pickle (KB)':>11} | {'Max |diff|'}")
+    print("-" * 65)
+    for name in MODEL_FILES:
+        model = registry.get(name)
+        export_model(name, model, native_dir)
+        native = load_native_model(name, native_dir)
+
+        X = sample_inputs(name, 500)
+        diff = np.abs(native.predict_proba(X) - model.predict_proba(X)).max()
+        if diff > 1e-6:
+            raise ValueError(f"Native export of '{name}' does not match the pickle (max diff {diff}).")
+
+        ubj_kb = os.path.getsize(os.path.join(native_dir, f'{name}.ubj')) / 1024
+        pkl_kb = os.path.getsize(registry.path(name)) / 1024
+        print(f"{name:<20} | {ubj_kb:>12.1f} | {pkl_kb:>11.1f} | {diff:.2e}")
+    print("-" * 65)
+    print(f"Native artifacts written to {native_dir}/")
+
+if __name__ == "__main__":
+    if '--export' in sys.argv:
+        export_all()
+    else:
+        print("Usage: python native_models.py --export")
@@ -0,0 +1,228 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    ONNX export and onnxruntime (CPU) backend for all six models.
+    Each artifact becomes models/onnx/<name>.onnx plus a JSON sidecar:
+        input (N x features, float64, manifest column order)
+          -> Sub(mean) -> Div(scale)      (Pipeline models: StandardScaler, in float64)
+          -> Cast(float32)                (what XGBoost does with its input)
+          -> TreeEnsembleClassifier       (onnxmltools XGBoost converter)
+          -> label, probabilities
+    Scaling stays in float64 on purpose: the stage/status trees split on
+    scaled values that sit exactly on their thresholds, and a float32 scaler
+    flips those splits.
+
+    OnnxModel mirrors the sklearn interface (predict_proba / predict /
+    feature_names_in_ / classes_), so it plugs into LiverDiseasePredictor
+    (backend='onnx') and the inference service (--backend onnx).
+    Every export is checked for parity against the pickle.
+
+    Usage:
+        python onnx_models.py --export                 -> write models/onnx/ (with parity check)
+        python onnx_models.py --benchmark --threads 1  -> native vs onnxruntime latency / throughput
+"""
+
+import copy
+import json
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_registry import MODEL_FILES
+
+ONNX_DIR = os.path.join('models', 'onnx')
+TARGET_OPSET = {'': 17, 'ai.onnx.ml': 3}
+PARITY_ROWS = 5000
+PARITY_ATOL = 1e-5
+
+def _register_xgboost_converter():
+    from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+    from skl2onnx import update_registered_converter
+    from skl2onnx.common.shape_calculator import calculate_linear_classifier_output_shapes
+    from xgboost import XGBClassifier
+    update_registered_converter(
+        XGBClassifier, 'XGBoostXGBClassifier', calculate_linear_classifier_output_shapes, convert_xgboost,
+        options={'nocl': [True, False], 'zipmap': [True, False, 'columns']}
+    )
+
+def to_onnx(model):
+    """Converts a pickled model (plain XGBClassifier or scaler Pipeline) into an ONNX ModelProto."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    from native_models import split_model
+
+    _register_xgboost_converter()
+    classifier, scaler, feature_names = split_model(model)
+    # The converter only accepts f0..fN feature names; column order is kept by the sidecar
+    classifier = copy.deepcopy(classifier)
+    classifier.get_booster().feature_names = None
+
+    n = len(feature_names)
+    proto = convert_sklearn(
+        classifier, initial_types=[('features_f32', FloatTensorType([None, n]))],
+        options={id(classifier): {'zipmap': False}}, target_opset=TARGET_OPSET
+    )
+
+    # Float64 front end: (x - mean) / scale in double, then the cast XGBoost applies
+    graph = proto.graph
+    front = []
+    if scaler is None:
+        front.append(helper.make_node('Cast', ['input'], ['features_f32'], to=TensorProto.FLOAT))
+    else:
+        graph.initializer.extend([
+            numpy_helper.from_array(np.asarray(scaler.mean_, dtype=np.float64), 'scaler_mean'),
+            numpy_helper.from_array(np.asarray(scaler.scale_, dtype=np.float64), 'scaler_scale'),
+        ])
+        front += [
+            helper.make_node('Sub', ['input', 'scaler_mean'], ['centered']),
+            helper.make_node('Div', ['centered', 'scaler_scale'], ['standardized']),
+            helper.make_node('Cast', ['standardized'], ['features_f32'], to=TensorProto.FLOAT),
+        ]
+    nodes = front + list(graph.node)
+    del graph.node[:]
+    graph.node.extend(nodes)
+    del graph.input[:]
+    graph.input.append(helper.make_tensor_value_info('input', TensorProto.DOUBLE, [None, n]))
+    onnx.checker.check_model(proto)
+    return proto, {
+        'feature_names': [str(c) for c in feature_names],
+        'classes': [int(c) for c in classifier.classes_],
+        'scaled': scaler is not None,
+    }
+
+class OnnxModel:
+    """onnxruntime session with the sklearn predict interface (float64 input in feature order)."""
+
+    def __init__(self, path, sidecar, intra_op_threads=1):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.name = sidecar['name']
+        self.feature_names_in_ = np.array(sidecar['feature_names'], dtype=object)
+        self.classes_ = np.array(sidecar['classes'])
+        self._outputs = ['probabilities']
+
+    def _input(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def predict_proba(self, X):
+        return self.session.run(self._outputs, {'input': self._input(X)})[0]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def export_model(name, model, onnx_dir=ONNX_DIR):
+    """Writes <name>.onnx and <name>.json into onnx_dir. Returns the sidecar."""
+    proto, sidecar = to_onnx(model)
+    sidecar = {'name': name, 'artifact': MODEL_FILES[name], **sidecar}
+    os.makedirs(onnx_dir, exist_ok=True)
+    with open(os.path.join(onnx_dir, f'{name}.onnx'), 'wb') as f:
+        f.write(proto.SerializeToString())
+    with open(os.path.join(onnx_dir, f'{name}.json'), 'w') as f:
+        json.dump(sidecar, f, indent=2)
+        f.write('\n')
+    return sidecar
+
+def load_onnx_model(name, onnx_dir=ONNX_DIR, intra_op_threads=1):
+    with open(os.path.join(onnx_dir, f'{name}.json')) as f:
+        sidecar = json.load(f)
+    return OnnxModel(os.path.join(onnx_dir, f'{name}.onnx'), sidecar, intra_op_threads)
+
+def check_parity(name, model, onnx_model, rows=PARITY_ROWS):
+    """Max |probability difference| and label agreement on resampled training rows."""
+    from model_inputs import sample_inputs
+    X = sample_inputs(name, rows)
+    expected = model.predict_proba(X)
+    got = onnx_model.predict_proba(X.to_numpy(dtype=np.float64))
+    return float(np.abs(expected - got).max()), float(np.mean(expected.argmax(1) == got.argmax(1)))
+
+def export_all(onnx_dir=ONNX_DIR, model_path='models'):
+    from model_registry import get_registry
+    registry = get_registry(model_path)
+
+    print(f"{'Model':<18} | {'Graph (KB)':>10} | {'Max |dp|':>10} | {'Label agreement':>15} | {'Status'}")
+    print("-" * 72)
+    failed = []
+    for name in MODEL_FILES:
+        model = registry.get(name)
+        export_model(name, model, onnx_dir)
+        diff, agreement = check_parity(name, model, load_onnx_model(name, onnx_dir))
+        ok = diff <= PARITY_ATOL and agreement == 1.0
+        if not ok:
+            failed.append(name)
+        size = os.path.getsize(os.path.join(onnx_dir, f'{name}.onnx')) / 1024
+        print(f"{name:<18} | {size:>10.1f} | {diff:>10.2e} | {agreement * 100:>14.2f}% | {'OK' if ok else 'PARITY FAILED'}")
+    print("-" * 72)
+    if failed:
+        sys.exit(f"Parity check failed for: {failed}")
+
+def run_benchmark(threads=1):
+    import contextlib
+    import io
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+    from benchmark_utils import time_calls, latency_summary
+    from model_inputs import sample_inputs
+    from model_registry import get_registry
+    from test_HC_ALL_models import LiverDiseasePredictor
+
+    registry = get_registry('models')
+    targets = {}
+    for name in MODEL_FILES:
+        X = sample_inputs(name, 10000)
+        native, onnx_model = registry.get(name), load_onnx_model(name, intra_op_threads=threads)
+        values = X.to_numpy(dtype=np.float64)
+        targets[name] = (lambda n, X=X, m=native: m.predict_proba(X.iloc[:n]),
+                         lambda n, v=values, m=onnx_model: m.predict_proba(v[:n]))
+    with contextlib.redirect_stdout(io.StringIO()):
+        hcv_native = LiverDiseasePredictor(model_path='models')
+        hcv_onnx = LiverDiseasePredictor(model_path='models', backend='onnx', onnx_threads=threads)
+        hcv_native.load_models()
+        hcv_onnx.load_models()
+    panel = sample_inputs('hcv', 10000).to_numpy(dtype=np.float64)
+    targets['hcv'] = (lambda n: hcv_native.predict_batch(panel[:n]), lambda n: hcv_onnx.predict_batch(panel[:n]))
+
+    print(f"Native (pickle, DataFrame input) vs onnxruntime ({threads} intra-op thread(s)), p50 latency\n")
+    print(f"{'Model':<18} | {'Batch':>6} | {'Native (ms)':>11} | {'ONNX (ms)':>9} | {'Speedup':>7} | {'ONNX rows/s':>12}")
+    print("-" * 80)
+    for name, (native, onnx_fn) in targets.items():
+        for size in (1, 256, 10000):
+            repeats = 200 if size == 1 else 50 if size == 256 else 10
+            a = latency_summary(time_calls(lambda: native(size), repeats))['p50_ms']
+            b = latency_summary(time_calls(lambda: onnx_fn(size), repeats))['p50_ms']
+            print(f"{name:<18} | {size:>6} | {a:>11.3f} | {b:>9.3f} | {a / b:>6.1f}x | {size / b * 1000:>12,.0f}")
+    print("-" * 80)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="ONNX export / onnxruntime backend")
+    parser.add_argument('--export', action='store_true')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--threads', type=int, default=1, help="onnxruntime intra-op threads")
+    args = parser.parse_args()
+    if args.export:
+        export_all()
+    if args.benchmark:
+        run_benchmark(args.threads)
+    if not (args.export or args.benchmark):
+        parser.print_help()
@@ -0,0 +1,239 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Streaming batch scorer for CSV exports of any size.
+    The input is read in fixed-size chunks, columns are validated once against
+    the model's `feature_names_in_`, each chunk is scored with one batched
+    call and the results are appended to a CSV or JSONL file straight away.
+    Only a few chunks are ever in memory, so peak memory depends on
+    --chunk-rows and not on the file size.
+
+    Models: any registry name (gate, fatty_liver, cancer, hcv_stage,
+    hcv_status, hcv_complications) or 'hcv' for the full LiverDiseasePredictor
+    report from the raw 15-column panel. Missing engineered HCV features
+    (APRI, ALBI_Score, ...) are computed from the raw labs with the shared kernel.
+
+    With --pipeline, reading, scoring and writing run in three threads
+    linked by bounded queues, so I/O overlaps with model time.
+
+    Usage:
+        python stream_score.py cancer exports/screening.csv scores.csv
+        python stream_score.py hcv exports/hcv_panel.csv report.jsonl --chunk-rows 20000 --pipeline
+        python stream_score.py gate big.csv out.csv --id-column PatientID
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+from model_registry import MODEL_FILES, get_registry
+from medical_features import ENGINEERED_FEATURES, SOURCE_COLUMNS, add_medical_features
+from benchmark_utils import read_peak_rss_mb
+
+# Chunks allowed in flight between pipeline stages (bounds memory)
+QUEUE_DEPTH = 2
+_DONE = object()
+
+class ChunkScorer:
+    """Validates input columns once and scores DataFrame chunks with one batched call each."""
+
+    def __init__(self, name, model_path='models'):
+        self.name = name
+        if name == 'hcv':
+            from test_HC_ALL_models import LiverDiseasePredictor
+            self.model = LiverDiseasePredictor(model_path=model_path)
+            if not self.model.load_models():
+                raise ValueError("HCV models could not be loaded.")
+            self.columns = list(self.model.raw_input_cols)
+            self.classes = None
+        else:
+            self.model = get_registry(model_path).get(name)
+            self.columns = [str(c) for c in self.model.feature_names_in_]
+            self.classes = np.asarray(self.model.classes_)
+        self.derived = []
+
+    def validate(self, header):
+        """Checks the CSV header; returns the columns to read. Raises ValueError on missing inputs."""
+        missing = [c for c in self.columns if c not in header]
+        derivable = [c for c in missing if c in ENGINEERED_FEATURES]
+        if derivable and all(c in header for c in SOURCE_COLUMNS):
+            self.derived = derivable
+            missing = [c for c in missing if c not in derivable]
+        if missing:
+            raise ValueError(f"Input is missing columns required by '{self.name}': {missing}")
+        return [c for c in header if c in self.columns or c in SOURCE_COLUMNS]
+
+    def score(self, chunk):
+        """Returns a DataFrame of results for one chunk (same row order)."""
+        if self.derived:
+            add_medical_features(chunk, self.derived)
+        X = chunk[self.columns].apply(pd.to_numeric, errors='coerce')
+
+        if self.name == 'hcv':
+            return pd.DataFrame(self.model.predict_batch(X.to_numpy(dtype=np.float64)))
+
+        proba = self.model.predict_proba(X)
+        result = pd.DataFrame({'label': self.classes[np.argmax(proba, axis=1)]})
+        if proba.shape[1] == 2:
+            result['probability'] = proba[:, 1]
+        else:
+            for i, c in enumerate(self.classes):
+                result[f'proba_{c}'] = proba[:, i]
+        return result
+
+def read_header(path):
+    header = pd.read_csv(path, nrows=0).columns
+    return list(header.str.strip(' '))
+
+def iter_chunks(path, usecols, chunk_rows):
+    """Yields stripped-header DataFrame chunks restricted to the needed columns."""
+    raw_header = pd.read_csv(path, nrows=0).columns
+    keep = [c for c in raw_header if c.strip(' ') in usecols]
+    for chunk in pd.read_csv(path, usecols=keep, chunksize=chunk_rows):
+        chunk.columns = chunk.columns.str.strip(' ')
+        yield chunk
+
+class ResultWriter:
+    """Appends result chunks to CSV (header once) or JSONL."""
+
+    def __init__(self, path, fmt=None):
+        self.fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        self.file = open(path, 'w', newline='')
+        self.first = True
+
+    def write(self, df):
+        if self.fmt == 'jsonl':
+            if len(df):
+                self.file.write(df.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+        else:
+            df.to_csv(self.file, header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        self.file.close()
+
+def _attach_ids(result, chunk, id_column):
+    if id_column:
+        result.insert(0, id_column, chunk[id_column].to_numpy())
+    return result
+
+def score_file(name, input_path, output_path, chunk_rows=50000, fmt=None,
+               id_column=None, pipeline=False, model_path='models'):
+    """Scores input_path chunk by chunk into output_path. Returns run statistics."""
+    scorer = ChunkScorer(name, model_path)
+    header = read_header(input_path)
+    usecols = scorer.validate(header)
+    if id_column:
+        if id_column not in header:
+            raise ValueError(f"ID column '{id_column}' not found in input.")
+        usecols.append(id_column)
+
+    writer = ResultWriter(output_path, fmt)
+    stats = {'rows': 0, 'chunks': 0}
+    start = time.perf_counter()
+    try:
+        chunks = iter_chunks(input_path, usecols, chunk_rows)
+        if not pipeline:
+            for chunk in chunks:
+                writer.write(_attach_ids(scorer.score(chunk), chunk, id_column))
+                stats['rows'] += len(chunk)
+                stats['chunks'] += 1
+        else:
+            _run_pipeline(chunks, scorer, writer, id_column, stats)
+    finally:
+        writer.close()
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['rows_per_second'] = stats['rows'] / max(stats['seconds'], 1e-9)
+    stats['peak_rss_mb'] = read_peak_rss_mb()
+    return stats
+
+def _run_pipeline(chunks, scorer, writer, id_column, stats):
+    """Reader and scorer threads feed the writer (this thread) through bounded queues."""
+    to_score = queue.Queue(QUEUE_DEPTH)
+    to_write = queue.Queue(QUEUE_DEPTH)
+    errors = []
+
+    def reader():
+        try:
+            for chunk in chunks:
+                to_score.put(chunk)
+        except Exception as e:
+            errors.append(e)
+        to_score.put(_DONE)
+
+    def scoring():
+        while True:
+            chunk = to_score.get()
+            if chunk is _DONE:
+                break
+            try:
+                to_write.put((len(chunk), _attach_ids(scorer.score(chunk), chunk, id_column)))
+            except Exception as e:
+                errors.append(e)
+                while to_score.get() is not _DONE:  # Drain so the reader can finish
+                    pass
+                break
+        to_write.put(_DONE)
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=scoring, daemon=True)]
+    for t in threads:
+        t.start()
+    while True:
+        item = to_write.get()
+        if item is _DONE:
+            break
+        n, result = item
+        writer.write(result)
+        stats['rows'] += n
+        stats['chunks'] += 1
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream-score a large CSV with one AiLDS model")
+    parser.add_argument('model', choices=list(MODEL_FILES) + ['hcv'])
+    parser.add_argument('input', help="Input CSV")
+    parser.add_argument('output', help="Output .csv or .jsonl")
+    parser.add_argument('--chunk-rows', type=int, default=50000)
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help="Default: from output extension")
+    parser.add_argument('--id-column', default=None, help="Input column copied to every output row")
+    parser.add_argument('--pipeline', action='store_true', help="Overlap reading, scoring and writing")
+    parser.add_argument('--model-path', default='models')
+    args = parser.parse_args()
+
+    try:
+        stats = score_file(args.model, args.input, args.output, args.chunk_rows, args.format,
+                           args.id_column, args.pipeline, args.model_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Scored {stats['rows']:,} rows in {stats['chunks']} chunks -> {args.output}")
+    print(f"Time: {stats['seconds']:.2f} s ({stats['rows_per_second']:,.0f} rows/s) | "
+          f"Peak RSS: {stats['peak_rss_mb']:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Synthetic patient generator for load and scale testing.
+    For each input schema (gate, fatty_liver, cancer, hcv raw panel) a
+    Gaussian copula is fitted to the processed dataset:
+        - marginals:    the empirical distribution of every column
+                        (interpolated for continuous columns, exact observed
+                        levels for discrete ones such as Sex / Edema)
+        - correlations: the correlation matrix of the columns' normal scores
+    Sampling is vectorized: one multivariate normal draw per chunk, mapped
+    through the normal CDF and each column's empirical quantile function.
+    Rows come out in the model's input column order, so they can be fed
+    straight to stream_score.py or the inference service.
+
+    A fixed seed gives the same rows for any chunk size.
+
+    Usage:
+        python synthetic_patients.py gate 1000000 --output gate_synthetic.csv
+        python synthetic_patients.py hcv 5000000 --output hcv_synthetic.csv --chunk-rows 200000
+        python synthetic_patients.py cancer 100000      -> fidelity report only (no output file)
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_inputs import input_columns, load_panel, panel_dataset
+
+SCHEMAS = ['gate', 'fatty_liver', 'cancer', 'hcv']
+DISCRETE_LEVELS = 10  # Columns with at most this many distinct values keep exact levels
+DEFAULT_CHUNK_ROWS = 100000
+
+class PatientGenerator:
+    def __init__(self, data, columns):
+        data = np.asarray(data, dtype=np.float64)
+        n = len(data)
+        self.columns = [str(c) for c in columns]
+        self.sorted_values = [np.sort(data[:, j]) for j in range(data.shape[1])]
+        self.discrete = [len(np.unique(v)) <= DISCRETE_LEVELS for v in self.sorted_values]
+        self.integer = [bool(np.all(v % 1 == 0)) for v in self.sorted_values]
+        self.probabilities = (np.arange(n) + 0.5) / n
+
+        # Normal scores (average ranks -> probit) carry the dependence structure
+        ranks = pd.DataFrame(data).rank(method='average').to_numpy()
+        scores = ndtri(ranks / (n + 1))
+        corr = np.corrcoef(scores, rowvar=False)
+        corr = np.nan_to_num(corr, nan=0.0)
+        np.fill_diagonal(corr, 1.0)
+        self.correlation = corr
+        self.cholesky = np.linalg.cholesky(self._nearest_pd(corr))
+
+    @staticmethod
+    def _nearest_pd(corr, floor=1e-6):
+        """Clips negative eigenvalues (ties / constant columns) so Cholesky succeeds."""
+        values, vectors = np.linalg.eigh(corr)
+        fixed = vectors @ np.diag(np.maximum(values, floor)) @ vectors.T
+        d = np.sqrt(np.diag(fixed))
+        return fixed / np.outer(d, d)
+
+    @classmethod
+    def fit(cls, name):
+        """Fits the generator for one schema on its processed dataset."""
+        if name not in SCHEMAS:
+            raise ValueError(f"Unknown schema '{name}' (expected one of {SCHEMAS})")
+        columns = input_columns(name)
+        return cls(load_panel(panel_dataset(name))[columns], columns)
+
+    def _quantiles(self, u):
+        out = np.empty_like(u)
+        for j, values in enumerate(self.sorted_values):
+            if self.discrete[j]:
+                out[:, j] = values[np.minimum((u[:, j] * len(values)).astype(np.int64), len(values) - 1)]
+            else:
+                out[:, j] = np.interp(u[:, j], self.probabilities, values)
+                if self.integer[j]:
+                    np.round(out[:, j], out=out[:, j])
+        return out
+
+    def sample(self, n, rng):
+        """Draws N rows (DataFrame in the schema's column order) from a numpy Generator."""
+        z = rng.standard_normal((n, len(self.columns))) @ self.cholesky.T
+        return pd.DataFrame(self._quantiles(ndtr(z)), columns=self.columns, copy=False)
+
+    def iter_chunks(self, n, chunk_rows=DEFAULT_CHUNK_ROWS, seed=42):
+        """Yields N rows in chunks of at most `chunk_rows`; same seed -> same rows for any chunk size."""
+        rng = np.random.default_rng(seed)
+        for start in range(0, n, chunk_rows):
+            yield self.sample(min(chunk_rows, n - start), rng)
+
+def generate_csv(name, n, output, chunk_rows=DEFAULT_CHUNK_ROWS, seed=42):
+    """Writes N synthetic rows for a schema to CSV, one chunk at a time. Returns rows written."""
+    generator = PatientGenerator.fit(name)
+    written = 0
+    for i, chunk in enumerate(generator.iter_chunks(n, chunk_rows, seed)):
+        chunk.to_csv(output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        written += len(chunk)
+    return written
+
+def fidelity_report(name, n, seed=42):
+    """Compares marginals and correlations of N synthetic rows against the source dataset."""
+    generator = PatientGenerator.fit(name)
+    source = load_panel(panel_dataset(name))[input_columns(name)]
+    start = time.perf_counter()
+    synthetic = pd.concat(generator.iter_chunks(n, seed=seed), ignore_index=True)
+    seconds = time.perf_counter() - start
+
+    print(f"Schema '{name}': {len(source)} source rows -> {n:,} synthetic rows in {seconds:.2f} s "
+          f"({n / seconds:,.0f} rows/s)\n")
+    print(f"{'Column':<38} | {'Source mean':>11} | {'Synth mean':>11} | {'Source std':>10} | {'Synth std':>10}")
+    print("-" * 92)
+    for column in generator.columns:
+        print(f"{column.strip():<38} | {source[column].mean():>11.3f} | {synthetic[column].mean():>11.3f} | "
+              f"{source[column].std():>10.3f} | {synthetic[column].std():>10.3f}")
+    print("-" * 92)
+    diff = np.abs(source.corr(method='spearman').to_numpy() - synthetic.corr(method='spearman').to_numpy())
+    print(f"Spearman correlation, max abs difference: {np.nanmax(diff):.3f} (mean {np.nanmean(diff):.3f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic patient generator (Gaussian copula)")
+    parser.add_argument('schema', choices=SCHEMAS)
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--output', default=None, help="CSV to write (omit for a fidelity report)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.output:
+        start = time.perf_counter()
+        written = generate_csv(args.schema, args.rows, args.output, args.chunk_rows, args.seed)
+        seconds = time.perf_counter() - start
+        print(f"Wrote {written:,} '{args.schema}' rows to {args.output} in {seconds:.1f} s")
+    else:
+        fidelity_report(args.schema, args.rows, args.seed)
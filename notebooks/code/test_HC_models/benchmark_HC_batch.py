@@ -0,0 +1,151 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Throughput comparison between the legacy per-row HCV path
+    (baseline run_diagnosis: one `_prepare_dataframes` + 3 model calls per patient)
+    and the vectorized `LiverDiseasePredictor.predict_batch` (3 model calls per batch).
+    The legacy path is a frozen copy of the baseline code, including its own
+    `math.log10` feature math, so the parity check also guards the shared
+    medical_features kernel used by predict_batch.
+"""
+
+import math
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from test_HC_ALL_models import LiverDiseasePredictor
+from model_inputs import HCV_RAW_COLUMNS, sample_inputs
+
+# Batch sizes to compare (per-row path is capped to keep runs short)
+BATCH_SIZES = [10, 100, 1000, 10000]
+MAX_PER_ROW = 1000
+
+# --- Frozen baseline (per-row) code: do not route through the shared kernel or manifests ---
+
+# A. Stage Model (19 Features)
+STAGE_COLS = [
+    'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
+    'Tryglicerides', 'Platelets', 'Prothrombin', 'Status', 'Age', 'Sex',
+    'Ascites', 'Hepatomegaly', 'Spiders', 'Edema', 'APRI',
+    'Bilirubin_Albumin', 'Copper_Platelets'
+]
+
+# B. Status Model (18 Features)
+STATUS_COLS = [
+    'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
+    'Tryglicerides', 'Platelets', 'Prothrombin', 'Age', 'Sex',
+    'Ascites', 'Hepatomegaly', 'Spiders', 'Edema', 'APRI',
+    'ALBI_Score', 'Bili_Alb_Ratio'
+]
+
+# C. Complications Model (14 Features)
+COMP_COLS = [
+    'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
+    'Tryglicerides', 'Platelets', 'Prothrombin', 'Age', 'Sex',
+    'Hepatomegaly', 'Spiders', 'Edema'
+]
+
+def legacy_prepare_dataframes(row):
+    """Calculates medical indices and constructs specific DataFrames (baseline code)."""
+    # 1. Feature Engineering
+    apri = ((row['SGOT'] / 40.0) / (row['Platelets'] + 0.1)) * 100
+    bili_adj = max(row['Bilirubin'], 0.1)
+    albi = (math.log10(bili_adj * 17.1) * 0.66) + (row['Albumin'] * 10 * -0.085)
+
+    bili_alb = row['Bilirubin'] * row['Albumin']
+    copper_plat = row['Copper'] / (row['Platelets'] + 1)
+    bili_alb_ratio = row['Bilirubin'] / (row['Albumin'] + 0.1)
+
+    data = row.to_dict()
+    data['APRI'] = apri
+    data['ALBI_Score'] = albi
+    data['Bilirubin_Albumin'] = bili_alb
+    data['Copper_Platelets'] = copper_plat
+    data['Bili_Alb_Ratio'] = bili_alb_ratio
+    data['Status'] = 0
+
+    # 2. Construct Model-Specific DataFrames
+    df_stage = pd.DataFrame([data], columns=STAGE_COLS)
+    df_status = pd.DataFrame([data], columns=STATUS_COLS)
+    df_comp = pd.DataFrame([data], columns=COMP_COLS)
+    return df_stage, df_status, df_comp, apri, albi
+
+def predict_per_row(models, patients):
+    """Legacy path: loops over rows exactly as the baseline run_diagnosis did."""
+    df_input = pd.DataFrame(patients, columns=HCV_RAW_COLUMNS)
+    stages, ascites, deaths, apris, albis = [], [], [], [], []
+    for i in range(len(df_input)):
+        df_stage, df_status, df_comp, apri, albi = legacy_prepare_dataframes(df_input.iloc[i])
+        stage_pred = models['stage'].predict(df_stage)[0]
+        if stage_pred == 0: stage_pred = 1
+        stages.append(stage_pred)
+        ascites.append(models['comp'].predict_proba(df_comp)[:, 1][0])
+        deaths.append(models['status'].predict_proba(df_status)[:, 1][0])
+        apris.append(apri)
+        albis.append(albi)
+    return np.array(stages), np.array(ascites), np.array(deaths), np.array(apris), np.array(albis)
+
+# --- End of frozen baseline code ---
+
+def make_patients(n, seed=42):
+    """Builds N realistic HCV panels by resampling the processed dataset (model_inputs)."""
+    return sample_inputs('hcv', n, seed).to_numpy(dtype=float)
+
+def run_benchmark():
+    predictor = LiverDiseasePredictor(model_path='models')
+    if not predictor.load_models():
+        sys.exit(1)
+
+    # 1. Parity Check
+    sample = make_patients(200)
+    stages, ascites, deaths, apri, albi = predict_per_row(predictor.models, sample)
+    batch = predictor.predict_batch(sample)
+    assert np.array_equal(stages, batch['stage']), "Stage mismatch between paths"
+    assert np.allclose(ascites, batch['ascites_risk']), "Ascites risk mismatch between paths"
+    assert np.allclose(deaths, batch['death_risk']), "Death risk mismatch between paths"
+    assert np.allclose(apri, batch['apri']), "APRI mismatch between paths"
+    assert np.allclose(albi, batch['albi']), "ALBI mismatch between paths"
+    print("Parity check passed: batch outputs match the baseline per-row code.\n")
+
+    # 2. Throughput
+    print(f"{'Batch Size':<12} | {'Per-Row (rows/s)':<18} | {'Batch (rows/s)':<16} | {'Speedup'}")
+    print("-" * 65)
+    for n in BATCH_SIZES:
+        patients = make_patients(n)
+
+        start = time.perf_counter()
+        predictor.predict_batch(patients)
+        batch_rate = n / (time.perf_counter() - start)
+
+        if n <= MAX_PER_ROW:
+            start = time.perf_counter()
+            predict_per_row(predictor.models, patients)
+            row_rate = n / (time.perf_counter() - start)
+            row_text = f"{row_rate:,.0f}"
+            speedup = f"{batch_rate / row_rate:,.1f}x"
+        else:
+            row_text, speedup = "skipped", "-"
+
+        print(f"{n:<12} | {row_text:<18} | {batch_rate:<16,.0f} | {speedup}")
+    print("-" * 65)
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -17,19 +17,33 @@ Project: AI-Liver-Diseases-Diagnosis-System
 """
 
 import pandas as pd
-import joblib
 import numpy as np
-import math
 import os
 import sys
-import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from medical_features import ENGINEERED_FEATURES, SOURCE_COLUMNS, compute_medical_features
+from model_registry import get_registry
+from instrumentation import NULL_METRICS
+from feature_manifest import CompiledInput
+
+# Predictor model keys -> registry names (metric labels)
+MODEL_NAMES = {
+    'stage': 'hcv_stage',
+    'status': 'hcv_status',
+    'comp': 'hcv_complications'
+}
 
 class LiverDiseasePredictor:
-    def __init__(self, model_path='models'):
+    def __init__(self, model_path='models', metrics=None, backend='native', onnx_threads=1):
         self.model_path = model_path
         self.models = {}
-        # Base URL for Raw GitHub Files (Used for auto-download)
-        self.repo_url = "https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/models/"
+        # 'native' = pickled models, 'onnx' = onnxruntime graphs from models/onnx (onnx_models.py),
+        # 'bundle' = memory-mapped models/ailds_models.bundle (model_bundle.py)
+        self.backend = backend
+        self.onnx_threads = onnx_threads
+        # Optional per-stage timing (instrumentation.PredictionMetrics); disabled by default
+        self.metrics = metrics or NULL_METRICS
 
         # Standard 15-column input structure
         self.raw_input_cols = [
@@ -38,49 +52,40 @@ class LiverDiseasePredictor:
             'Ascites', 'Hepatomegaly', 'Spiders', 'Edema'
         ]
 
-    def _download_file(self, filename):
-        """Helper to download a missing model file directly from GitHub."""
-        url = self.repo_url + filename
-        local_path = os.path.join(self.model_path, filename)
-
-        print(f"  Model '{filename}' missing locally. Downloading from GitHub...")
-        try:
-            os.makedirs(self.model_path, exist_ok=True)
-            response = requests.get(url)
-            response.raise_for_status()
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-            print(f" Downloaded: {local_path}")
-            return True
-        except Exception as e:
-            print(f" Failed to download {filename}: {e}")
-            return False
+        # Canonical wide patient array: raw panel + engineered features + Status.
+        # Each model's input is gathered from it by index (models/<artifact>.features.json).
+        self.wide_cols = self.raw_input_cols + ENGINEERED_FEATURES + ['Status']
+        self.inputs = {}
+
+        # Batch output record (one per patient)
+        self.result_dtype = np.dtype([
+            ('stage', np.int8),
+            ('ascites_risk', np.float64),
+            ('death_risk', np.float64),
+            ('apri', np.float64),
+            ('albi', np.float64),
+            ('assessment', 'U8')
+        ])
 
     def load_models(self):
-        """Loads models. If a file is missing, it attempts to download it."""
-        # UPDATED: Exact filenames as per your GitHub repo
-        filenames = {
-            'stage': 'hepatitisC_stage_model.pkl',
-            'status': 'hepatitisC_status_model.pkl',
-            'comp': 'hepatitisC_complications.pkl'  # Corrected Name
-        }
-
+        """Loads the three HCV models through the shared local model registry."""
         print(f"Initializing AiLDS Models...")
+        registry = get_registry(self.model_path)
         all_loaded = True
 
-        for key, name in filenames.items():
-            path = os.path.join(self.model_path, name)
-
-            # 1. Check existence, if not -> Download
-            if not os.path.exists(path):
-                success = self._download_file(name)
-                if not success:
-                    all_loaded = False
-                    continue
-
-            # 2. Load Model
+        for key, name in MODEL_NAMES.items():
             try:
-                self.models[key] = joblib.load(path)
+                if self.backend == 'onnx':
+                    from onnx_models import load_onnx_model
+                    self.models[key] = load_onnx_model(name, os.path.join(self.model_path, 'onnx'), self.onnx_threads)
+                elif self.backend == 'bundle':
+                    from model_bundle import BUNDLE_FILENAME, get_bundle
+                    self.models[key] = get_bundle(os.path.join(self.model_path, BUNDLE_FILENAME)).get(name)
+                else:
+                    self.models[key] = registry.get(name)
+                # Bundle models carry their column order; no manifest files are read
+                manifest_path = None if self.backend == 'bundle' else self.model_path
+                self.inputs[key] = CompiledInput(name, self.models[key], self.wide_cols, manifest_path)
             except Exception as e:
                 print(f"Error loading {name}: {e}")
                 all_loaded = False
@@ -92,89 +97,102 @@ class LiverDiseasePredictor:
             print("Critical Error: One or more models could not be loaded.\n")
             return False
 
-    def _prepare_dataframes(self, row):
+    def predict_batch(self, patients, as_records=False):
         """
-        Calculates medical indices and constructs specific DataFrames.
+        Vectorized batch inference for an N x 15 array or DataFrame.
+        Engineered features are computed once for the whole batch and each of
+        the stage, status and complications models is called exactly once.
+        Returns a structured NumPy array with one record per patient
+        (as_records=True: a list of JSON-ready dicts instead, see to_records).
         """
-        # 1. Feature Engineering
-        apri = ((row['SGOT'] / 40.0) / (row['Platelets'] + 0.1)) * 100
-        bili_adj = max(row['Bilirubin'], 0.1)
-        albi = (math.log10(bili_adj * 17.1) * 0.66) + (row['Albumin'] * 10 * -0.085)
-
-        bili_alb = row['Bilirubin'] * row['Albumin']
-        copper_plat = row['Copper'] / (row['Platelets'] + 1)
-        bili_alb_ratio = row['Bilirubin'] / (row['Albumin'] + 0.1)
-
-        data = row.to_dict()
-        data['APRI'] = apri
-        data['ALBI_Score'] = albi
-        data['Bilirubin_Albumin'] = bili_alb
-        data['Copper_Platelets'] = copper_plat
-        data['Bili_Alb_Ratio'] = bili_alb_ratio
-        data['Status'] = 0
-
-        # 2. Construct Model-Specific DataFrames
-
-        # A. Stage Model (19 Features)
-        stage_cols = [
-            'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
-            'Tryglicerides', 'Platelets', 'Prothrombin', 'Status', 'Age', 'Sex',
-            'Ascites', 'Hepatomegaly', 'Spiders', 'Edema', 'APRI',
-            'Bilirubin_Albumin', 'Copper_Platelets'
-        ]
-        df_stage = pd.DataFrame([data], columns=stage_cols)
-
-        # B. Status Model (18 Features)
-        status_cols = [
-            'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
-            'Tryglicerides', 'Platelets', 'Prothrombin', 'Age', 'Sex',
-            'Ascites', 'Hepatomegaly', 'Spiders', 'Edema', 'APRI',
-            'ALBI_Score', 'Bili_Alb_Ratio'
-        ]
-        df_status = pd.DataFrame([data], columns=status_cols)
-
-        # C. Complications Model (14 Features)
-        comp_cols = [
-            'Bilirubin', 'Cholesterol', 'Albumin', 'Copper', 'Alk_Phos', 'SGOT',
-            'Tryglicerides', 'Platelets', 'Prothrombin', 'Age', 'Sex',
-            'Hepatomegaly', 'Spiders', 'Edema'
-        ]
-        df_comp = pd.DataFrame([data], columns=comp_cols)
-
-        return df_stage, df_status, df_comp, apri, albi
+        if not self.models and not self.load_models():
+            return None
+
+        metrics = self.metrics
+
+        # 1. Feature Engineering (whole batch, written straight into the wide buffer)
+        with metrics.stage('feature_engineering', 'hcv'):
+            if isinstance(patients, pd.DataFrame):
+                patients = patients[self.raw_input_cols].to_numpy(dtype=float)
+            raw = np.ascontiguousarray(patients, dtype=float)
+            n_raw = len(self.raw_input_cols)
+            wide = np.empty((len(raw), len(self.wide_cols)), dtype=np.float64)
+            wide[:, :n_raw] = raw
+            sources = [raw[:, self.raw_input_cols.index(c)] for c in SOURCE_COLUMNS]
+            compute_medical_features(*sources, out=wide[:, n_raw:-1])
+            wide[:, -1] = 0  # Status
+
+        # 2. Model inputs: one index gather per model from the wide array (scaled in place for Pipelines)
+        with metrics.stage('input_assembly', 'hcv'):
+            X_stage = self.inputs['stage'].gather(wide)
+            X_comp = self.inputs['comp'].gather(wide)
+            X_status = self.inputs['status'].gather(wide)
+
+        # 3. One call per model
+        with metrics.stage('model_call', MODEL_NAMES['stage']):
+            stage = self.inputs['stage'].classifier.predict(X_stage)
+        stage = np.where(stage == 0, 1, stage)  # Correction map
+        with metrics.stage('model_call', MODEL_NAMES['comp']):
+            ascites_risk = self.inputs['comp'].classifier.predict_proba(X_comp)[:, 1]
+        with metrics.stage('model_call', MODEL_NAMES['status']):
+            death_risk = self.inputs['status'].classifier.predict_proba(X_status)[:, 1]
+
+        # 4. Assessment Tier
+        with metrics.stage('output_formatting', 'hcv'):
+            assessment = np.select(
+                [death_risk > 0.5, ascites_risk > 0.5],
+                ['CRITICAL', 'WARNING'],
+                default='STABLE'
+            )
+
+            results = np.empty(len(wide), dtype=self.result_dtype)
+            results['stage'] = stage
+            results['ascites_risk'] = ascites_risk
+            results['death_risk'] = death_risk
+            results['apri'] = wide[:, self.wide_cols.index('APRI')]
+            results['albi'] = wide[:, self.wide_cols.index('ALBI_Score')]
+            results['assessment'] = assessment
+            if as_records:
+                results = self.to_records(results)
+
+        if metrics.enabled:
+            metrics.count('calls', 'hcv')
+            metrics.count('rows', 'hcv', len(results))
+        return results
+
+    @staticmethod
+    def to_records(results):
+        """Structured batch result -> one dict of plain Python values per patient."""
+        return [{
+            'stage': int(r['stage']),
+            'ascites_risk': float(r['ascites_risk']),
+            'death_risk': float(r['death_risk']),
+            'apri': float(r['apri']),
+            'albi': float(r['albi']),
+            'assessment': str(r['assessment']),
+        } for r in results]
 
     def run_diagnosis(self, patients_list):
-        if not self.models and not self.load_models():
+        results = self.predict_batch(patients_list)
+        if results is None:
             return
 
-        df_input = pd.DataFrame(patients_list, columns=self.raw_input_cols)
-
-        for i in range(len(df_input)):
-            patient_row = df_input.iloc[i]
-            df_stage, df_status, df_comp, apri, albi = self._prepare_dataframes(patient_row)
-
-            # --- INFERENCE ---
-            # 1. Stage
-            stage_pred = self.models['stage'].predict(df_stage)[0]
-            if stage_pred == 0: stage_pred = 1 # Correction map
-
-            # 2. Ascites Risk
-            ascites_risk = self.models['comp'].predict_proba(df_comp)[:, 1][0]
-
-            # 3. Mortality Risk
-            death_risk = self.models['status'].predict_proba(df_status)[:, 1][0]
+        with self.metrics.stage('report', 'hcv'):
+            self._print_reports(results)
 
+    def _print_reports(self, results):
+        for i, res in enumerate(results):
             # --- REPORT ---
             print(f"Case #{i+1} | AI Clinical Report")
             print("-" * 50)
-            print(f"Indices:      APRI: {apri:.2f} | ALBI: {albi:.2f}")
-            print(f"AI Stage:     Stage {stage_pred} (Histological)")
-            print(f"Ascites Risk: {ascites_risk*100:.1f}%")
-            print(f"Survival Risk:{death_risk*100:.1f}%")
+            print(f"Indices:      APRI: {res['apri']:.2f} | ALBI: {res['albi']:.2f}")
+            print(f"AI Stage:     Stage {res['stage']} (Histological)")
+            print(f"Ascites Risk: {res['ascites_risk']*100:.1f}%")
+            print(f"Survival Risk:{res['death_risk']*100:.1f}%")
 
-            if death_risk > 0.5:
+            if res['assessment'] == 'CRITICAL':
                 print(" ASSESSMENT:   CRITICAL - Immediate intervention required.")
-            elif ascites_risk > 0.5:
+            elif res['assessment'] == 'WARNING':
                 print(" ASSESSMENT:   WARNING - High risk of decompensation.")
             else:
                 print(" ASSESSMENT:   STABLE - Continue routine monitoring.")
@@ -14,43 +14,21 @@ Created by: Yahya Zuher
 Project: AI-Liver-Diseases-Diagnosis-System
 """
 
-import pandas as pd
-import joblib
-import os
-import requests
-import io
+from fast_predictor import get_fast_predictor, parse_backend_args
 
-def load_model():
+def load_model(backend='native', onnx_threads=1):
     """
-    Downloads and loads the trained XGBoost model from GitHub.
+    Loads the trained XGBoost model from the local model registry
+    (verified against models/manifest.json and cached in memory) and
+    wraps it in the shared single-patient FastPredictor
+    (backend='onnx': the exported onnxruntime graph instead).
     """
-    model_url = 'https://github.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/raw/main/models/cancer_model.pkl'
-
-    try:
-        print(f"Connecting to GitHub to fetch: {model_url.split('/')[-1]}...")
-        response = requests.get(model_url)
-
-        # Check if the download was successful
-        if response.status_code == 200:
-            # Use BytesIO to let joblib read the binary content directly from RAM
-            return joblib.load(io.BytesIO(response.content))
-        else:
-            raise Exception(f"Download failed. Status code: {response.status_code}")
-
-    except Exception as e:
-        print(f"Cloud Load Failed: {e}")
-        # Fallback: Check if the file exists locally
-        model_filename = 'cancer_model.pkl'
-        if os.path.exists(model_filename):
-            print("Local backup found. Loading from disk...")
-            return joblib.load(model_filename)
-        else:
-            raise FileNotFoundError("Critical Error: Cancer model not found online or locally.")
+    return get_fast_predictor('cancer', backend=backend, onnx_threads=onnx_threads)
 
 if __name__ == "__main__":
     # Initialize model
     try:
-        model = load_model()
+        predictor = load_model(**parse_backend_args())
         print("Cancer Model loaded successfully!")
     except Exception as e:
         print(f"Initialization Error: {e}")
@@ -78,12 +56,15 @@ if __name__ == "__main__":
     print(f"{'Clinical Scenario':<45} | {'Diagnosis':<15} | {'Risk Probability'}")
     print("-" * 85)
 
-    for case in cases:
-        df_test = pd.DataFrame([case['Data']], columns=columns)
+    # Single-patient fast path: plain vector in the model's feature order (no DataFrame)
+    if predictor.feature_names != columns:
+        print(f"Feature order mismatch: model expects {predictor.feature_names}")
+        exit()
 
+    for case in cases:
         # Generate prediction and probability
-        prediction = model.predict(df_test)[0]
-        probability = model.predict_proba(df_test)[0][1]
+        probability = predictor.predict_proba_one(case['Data'])[1]
+        prediction = 1 if probability > 0.5 else 0
 
         # UI Formatting
         result_text = "🔴 HIGH RISK" if prediction == 1 else "🟢 HEALTHY"
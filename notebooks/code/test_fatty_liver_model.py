@@ -13,40 +13,21 @@ Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشر
 Created by: Yahya Zuher
 Project: AI-Liver-Diseases-Diagnosis-System
 """
-import pandas as pd
-import joblib
-import os
-import requests
-import io
+from fast_predictor import get_fast_predictor, parse_backend_args
 
-def load_model():
-    model_url = 'https://github.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/raw/main/models/fatty_liver_model.pkl'
-
-    try:
-        print(f"Connecting to GitHub to fetch model...")
-        response = requests.get(model_url)
-
-        # Check if the download was successful (HTTP 200)
-        if response.status_code == 200:
-            # Wrap the raw bytes in a BytesIO object so joblib can read it like a file
-            return joblib.load(io.BytesIO(response.content))
-        else:
-            raise Exception(f"Failed to download model. Status code: {response.status_code}")
-
-    except Exception as e:
-        print(f"Cloud Load Failed: {e}")
-        # Fallback: Try to find the file locally if the internet is down
-        model_filename = 'fatty_liver_model.pkl'
-        if os.path.exists(model_filename):
-            print("Local backup found. Loading from disk...")
-            return joblib.load(model_filename)
-        else:
-            raise FileNotFoundError("Critical Error: Model not found online or locally.")
+def load_model(backend='native', onnx_threads=1):
+    """
+    Loads the trained XGBoost model from the local model registry
+    (verified against models/manifest.json and cached in memory) and
+    wraps it in the shared single-patient FastPredictor
+    (backend='onnx': the exported onnxruntime graph instead).
+    """
+    return get_fast_predictor('fatty_liver', backend=backend, onnx_threads=onnx_threads)
 
 if __name__ == "__main__":
     try:
-        model = load_model()
-        print("Model loaded successfully from GitHub!")
+        predictor = load_model(**parse_backend_args())
+        print("Model loaded successfully!")
     except Exception as e:
         print(f"Initialization Error: {e}")
         exit()
@@ -76,12 +57,14 @@ if __name__ == "__main__":
     print(f"{'Clinical Scenario':<45} | {'Final Diagnosis'}")
     print("-" * 75)
 
-    for case in cases:
-        # Create DataFrame for prediction
-        df_test = pd.DataFrame([case['Data']], columns=columns)
+    # Single-patient fast path: plain vector in the model's feature order (no DataFrame)
+    if predictor.feature_names != columns:
+        print(f"Feature order mismatch: model expects {predictor.feature_names}")
+        exit()
 
+    for case in cases:
         # Get result (0 = Healthy, 1 = NAFLD)
-        prediction = model.predict(df_test)[0]
+        prediction = predictor.predict_one(case['Data'])
         result_text = "🔴 PATIENT (NAFLD)" if prediction == 1 else "🟢 HEALTHY"
 
         print(f"{case['Case']:<45} | {result_text}")
@@ -14,44 +14,13 @@ Created by: Yahya Zuher
 Project: AI-Liver-Diseases-Diagnosis-System
 """
 
-import pandas as pd
-import joblib
-import os
 import sys
-import requests
-
-# Configuration
-MODEL_FILENAME = 'gate_model.pkl'
-
-# Direct link to the raw binary model file
-GITHUB_MODEL_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/models/gate_model.pkl'
-
-def download_model_if_missing():
-    if not os.path.exists(MODEL_FILENAME):
-        print(f"Model '{MODEL_FILENAME}' not found locally.")
-        print(f"Downloading pre-trained model from GitHub...")
-
-        try:
-            response = requests.get(GITHUB_MODEL_URL)
-            response.raise_for_status() # Check for HTTP errors
-
-            with open(MODEL_FILENAME, 'wb') as f:
-                f.write(response.content)
-
-            print("Download successful. Model saved locally.")
-
-        except Exception as e:
-            print(f"Error downloading model: {e}")
-            sys.exit(1)
-    else:
-        print(f"Loading local model: {MODEL_FILENAME}")
-
-def run_prediction_tests():
-    # 1. Ensure Model is Available
-    download_model_if_missing()
+from fast_predictor import get_fast_predictor, parse_backend_args
 
+def run_prediction_tests(backend='native', onnx_threads=1):
+    # 1. Load Model (local registry, verified against models/manifest.json)
     try:
-        model = joblib.load(MODEL_FILENAME)
+        predictor = get_fast_predictor('gate', backend=backend, onnx_threads=onnx_threads)
     except Exception as e:
         print(f"Error loading model file: {e}")
         sys.exit(1)
@@ -72,21 +41,16 @@ def run_prediction_tests():
         [18, 0, 0.6, 0.1, 140, 15,  18,  7.8, 4.2, 1.20]  # Case 10: Healthy
     ]
 
-    # 3. DataFrame Creation
-    # Uses feature_names_in_ to ensure compatibility with the trained model
-    try:
-        correct_columns = model.feature_names_in_
-        patients_df = pd.DataFrame(new_patients_data, columns=correct_columns)
-    except AttributeError:
-        # Fallback if attribute is missing
-        cols = ['Age', 'Gender', 'Total_Bilirubin', 'Direct_Bilirubin', 'Alkaline_Phosphotase',
-                'Alamine_Aminotransferase', 'Aspartate_Aminotransferase', 'Total_Protiens',
-                'Albumin', 'Albumin_and_Globulin_Ratio']
-        patients_df = pd.DataFrame(new_patients_data, columns=cols)
+    # 3. Feature Check
+    # The vectors above follow the model's training order (predictor.feature_names,
+    # the raw dataset headers); only their length can be checked here
+    if len(predictor.feature_names) != len(new_patients_data[0]):
+        print(f"Feature count mismatch: model expects {predictor.feature_names}")
+        sys.exit(1)
 
-    # 4. Prediction
+    # 4. Prediction (single-patient fast path: plain vector, no DataFrame)
     print("\nRunning diagnostics on test cases...")
-    predictions = model.predict(patients_df)
+    predictions = [predictor.predict_one(row) for row in new_patients_data]
 
     # 5. Result Display
     print("-" * 75)
@@ -122,4 +86,4 @@ def run_prediction_tests():
     print("-" * 75)
 
 if __name__ == "__main__":
-    run_prediction_tests()
+    run_prediction_tests(**parse_backend_args())
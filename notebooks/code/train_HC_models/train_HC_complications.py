@@ -22,32 +22,50 @@ import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import joblib
-import requests
-import io
+import os
 import sys
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from feature_manifest import write_feature_manifest
+from dataset_resolver import DATASETS, resolve
+from dataset_store import load_dataset
+
 # --- Configuration ---
-DATA_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/data/processed/HepatitisC.csv'
-MODEL_FILENAME = 'hepatitis_complications.pkl'
+DATASET = 'hepatitis_c'
+MODEL_FILENAME = 'hepatitisC_complications.pkl'
 CONFUSION_MATRIX_FILENAME = 'confusion_matrix_complications.png'
 
 def load_data():
-    """Fetches the dataset directly from the GitHub repository."""
-    print(f" Downloading dataset from GitHub...")
+    """Loads the local, checksum-verified dataset (see dataset_resolver.py)."""
+    print(f" Loading dataset {DATASETS[DATASET]}...")
     try:
-        response = requests.get(DATA_URL)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text))
+        df = load_dataset(resolve(DATASET))
         print(f" Dataset loaded successfully: {len(df)} records.")
         return df
     except Exception as e:
-        sys.exit(f" Error downloading data: {e}")
-
-def train_model():
+        sys.exit(f" Error loading data: {e}")
+
+# XGBoost Classifier settings (scale_pos_weight is set from the training split)
+MODEL_PARAMS = {
+    'n_estimators': 150,       # Number of trees
+    'learning_rate': 0.05,     # Step size shrinkage
+    'max_depth': 4,            # Tree depth (prevent overfitting)
+    'subsample': 0.8,          # Data sampling ratio per tree
+    'colsample_bytree': 0.8,   # Feature sampling ratio
+    'eval_metric': 'logloss',
+    'random_state': 42,
+}
+
+def class_ratio(y):
+    """Negative / positive ratio used as scale_pos_weight (balances Ascites cases)."""
+    return float(len(y[y == 0])) / len(y[y == 1])
+
+def prepare_data(df=None):
+    """Loads the dataset (or takes new raw records `df`) and returns (X, y) ready for training."""
     # 1. Load Data
-    df = load_data()
+    df = load_data() if df is None else df
 
     print("\n Starting Complications Model Training...")
 
@@ -59,6 +77,10 @@ def train_model():
     y = df['Ascites']
 
     print(f" Features used ({len(X.columns)}): {list(X.columns)}")
+    return X, y
+
+def train_model(n_jobs=None):
+    X, y = prepare_data()
 
     # 3. Split Data (80% Train, 20% Test)
     X_train, X_test, y_train, y_test = train_test_split(
@@ -67,19 +89,10 @@ def train_model():
 
     # 4. Handle Class Imbalance (Calculate Ratio)
     # This ensures the model pays attention to the minority class (Ascites cases)
-    ratio = float(len(y_train[y_train == 0])) / len(y_train[y_train == 1])
+    ratio = class_ratio(y_train)
 
     # 5. Initialize XGBoost Classifier
-    model = xgb.XGBClassifier(
-        n_estimators=150,       # Number of trees
-        learning_rate=0.05,     # Step size shrinkage
-        max_depth=4,            # Tree depth (prevent overfitting)
-        subsample=0.8,          # Data sampling ratio per tree
-        colsample_bytree=0.8,   # Feature sampling ratio
-        scale_pos_weight=ratio, # Automatically balance classes
-        eval_metric='logloss',
-        random_state=42
-    )
+    model = xgb.XGBClassifier(**MODEL_PARAMS, scale_pos_weight=ratio, n_jobs=n_jobs)
 
     # 6. Train
     print(" Training XGBoost model...")
@@ -126,7 +139,13 @@ def train_model():
     # 8. Save
     print(f" Saving model to {MODEL_FILENAME}...")
     joblib.dump(model, MODEL_FILENAME)
+    write_feature_manifest('hcv_complications', model, X, source=DATASETS[DATASET])
     print(f" Model saved successfully.")
 
 if __name__ == "__main__":
-    train_model()
+    if '--search' in sys.argv:
+        from hyperparam_search import run_search
+        X, y = prepare_data()
+        run_search(X, y, {**MODEL_PARAMS, 'scale_pos_weight': class_ratio(y)})
+    else:
+        train_model()
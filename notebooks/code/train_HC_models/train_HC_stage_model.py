@@ -35,9 +35,17 @@ import sys
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from medical_features import add_medical_features
+from feature_manifest import write_feature_manifest
+from dataset_resolver import DATASETS, resolve
+from dataset_store import load_dataset
+
+# Engineered features used by the stage model (see medical_features.py)
+STAGE_FEATURES = ['APRI', 'Bilirubin_Albumin', 'Copper_Platelets']
+
 # --- Configuration ---
-DATASET_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/data/processed/hepatitisC_Stage.csv'
-LOCAL_FILENAME = 'hepatitisC_Stage.csv'
+DATASET = 'hepatitis_c_stage'
 MODEL_FILENAME = 'hepatitisC_stage_model.pkl'
 CONFUSION_MATRIX_FILENAME = 'confusion_matrix_stage.png'
 
@@ -49,35 +57,34 @@ COLUMN_NAMES = [
 ]
 
 def get_dataset():
-    """Downloads dataset if not available locally."""
-    if not os.path.exists(LOCAL_FILENAME):
-        try:
-            print("⬇Downloading dataset...")
-            df = pd.read_csv(DATASET_URL)
-            if len(df.columns) == len(COLUMN_NAMES):
-                df.columns = COLUMN_NAMES
-            df.to_csv(LOCAL_FILENAME, index=False)
-        except Exception as e:
-            sys.exit(f"Error downloading data: {e}")
-    return pd.read_csv(LOCAL_FILENAME)
-
-def add_medical_features(df):
-    """Calculates APRI score and other medical interaction terms."""
-    df_eng = df.copy()
-    # APRI: AST to Platelet Ratio Index
-    df_eng['APRI'] = ((df_eng['SGOT'] / 40.0) / (df_eng['Platelets'] + 0.1)) * 100
-    # Liver Function Synthesis
-    df_eng['Bilirubin_Albumin'] = df_eng['Bilirubin'] * df_eng['Albumin']
-    # Copper/Platelet Ratio
-    df_eng['Copper_Platelets'] = df_eng['Copper'] / (df_eng['Platelets'] + 1)
-    return df_eng
-
-def train():
-    print("Starting Training Pipeline...")
-
+    """Loads the local, checksum-verified dataset."""
+    try:
+        return load_dataset(resolve(DATASET))
+    except Exception as e:
+        sys.exit(f"Error loading data: {e}")
+
+# XGBoost Model (Optimized Parameters)
+MODEL_PARAMS = {
+    'n_estimators': 200,
+    'learning_rate': 0.01,
+    'max_depth': 3,
+    'min_child_weight': 5,
+    'gamma': 0.1,
+    'subsample': 0.7,
+    'colsample_bytree': 0.8,
+    'objective': 'multi:softprob',  # Multi-class classification
+    'num_class': 3,                 # 3 specific classes (Stage 1, 2, 3)
+    'eval_metric': 'mlogloss',
+    'random_state': 42,
+}
+
+def prepare_data(df=None):
+    """Loads the dataset (or takes new raw records `df`), adds the engineered features and returns (X, y)."""
     # 1. Load & Engineer Features
-    df = get_dataset()
-    df = add_medical_features(df)
+    df = get_dataset() if df is None else df
+    if len(df.columns) == len(COLUMN_NAMES):
+        df = df.set_axis(COLUMN_NAMES, axis=1)
+    df = add_medical_features(df, STAGE_FEATURES)
 
     # 2. Prepare Data
     X = df.drop(columns=['Stage'])
@@ -87,6 +94,12 @@ def train():
     # This is necessary because XGBoost expects classes starting from 0
     y = pd.to_numeric(y, errors='coerce').fillna(0).astype(int)
     y = y.map({1: 0, 2: 1, 3: 2}).astype(int)
+    return X, y
+
+def train(n_jobs=-1):
+    print("Starting Training Pipeline...")
+
+    X, y = prepare_data()
 
     # 3. Preprocessing
     numeric_features = X.select_dtypes(include=['number']).columns
@@ -97,23 +110,10 @@ def train():
         ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
     ])
 
-    # 4. XGBoost Model (Optimized Parameters)
+    # 4. XGBoost Model
     model = Pipeline([
         ('preprocessor', preprocessor),
-        ('classifier', xgb.XGBClassifier(
-            n_estimators=200,
-            learning_rate=0.01,
-            max_depth=3,
-            min_child_weight=5,
-            gamma=0.1,
-            subsample=0.7,
-            colsample_bytree=0.8,
-            objective='multi:softprob', # Multi-class classification
-            num_class=3,                # 3 specific classes (Stage 1, 2, 3)
-            eval_metric='mlogloss',
-            n_jobs=-1,
-            random_state=42
-        ))
+        ('classifier', xgb.XGBClassifier(**MODEL_PARAMS, n_jobs=n_jobs))
     ])
 
     # 5. Train & Evaluate
@@ -159,7 +159,12 @@ def train():
     print("Retraining on full data and saving...")
     model.fit(X, y)
     joblib.dump(model, MODEL_FILENAME)
+    write_feature_manifest('hcv_stage', model, X, source=DATASETS[DATASET])
     print(f"Saved: {MODEL_FILENAME}")
 
 if __name__ == "__main__":
-    train()
+    if '--search' in sys.argv:
+        from hyperparam_search import run_search
+        run_search(*prepare_data(), MODEL_PARAMS)
+    else:
+        train()
@@ -31,50 +31,61 @@ import sys
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# --- Configuration (GitHub Integration) ---
-RAW_DATA_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/data/processed/hepatitisC_status.csv'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from medical_features import add_medical_features
+from feature_manifest import write_feature_manifest
+from dataset_resolver import DATASETS, resolve
+from dataset_store import load_dataset
+
+# Engineered features used by the status model (see medical_features.py)
+STATUS_FEATURES = ['APRI', 'ALBI_Score', 'Bili_Alb_Ratio']
+
+# --- Configuration ---
+DATASET = 'hepatitis_c_status'
 MODEL_FILENAME = 'hepatitisC_status_model.pkl'
 CONFUSION_MATRIX_FILENAME = 'confusion_matrix_status.png'
 
 def get_live_dataset():
-    """Downloads the dataset from GitHub."""
+    """Loads the local, checksum-verified dataset (see dataset_resolver.py)."""
     try:
-        print(f"⬇Downloading dataset from GitHub...")
-        df = pd.read_csv(RAW_DATA_URL)
+        print(f"Loading dataset {DATASETS[DATASET]}...")
+        df = load_dataset(resolve(DATASET))
         print(f"Successfully loaded {len(df)} records.")
         return df
     except Exception as e:
-        sys.exit(f"Critical Error: Could not fetch data. {e}")
-
-def add_medical_features(df):
-    """Adds ALBI and APRI features for high-precision mortality prediction."""
-    df_eng = df.copy()
-
-    # 1. APRI Score
-    df_eng['APRI'] = ((df_eng['SGOT'] / 40.0) / (df_eng['Platelets'] + 0.1)) * 100
-
-    # 2. ALBI Score (Log-based liver function assessment)
-    df_eng['ALBI_Score'] = (np.log10(df_eng['Bilirubin'].clip(lower=0.1) * 17.1) * 0.66) + \
-                            (df_eng['Albumin'] * 10 * -0.085)
-
-    # 3. Bilirubin to Albumin Ratio
-    df_eng['Bili_Alb_Ratio'] = df_eng['Bilirubin'] / (df_eng['Albumin'] + 0.1)
-
-    return df_eng
-
-def run_pipeline():
-    print("Starting Automated Training Pipeline...")
-
-    # 1. Get Data from GitHub
-    df = get_live_dataset()
+        sys.exit(f"Critical Error: Could not load data. {e}")
+
+# XGBoost Model Configuration (Tuned for 125/187 ratio)
+MODEL_PARAMS = {
+    'n_estimators': 250,
+    'learning_rate': 0.03,
+    'max_depth': 4,
+    'scale_pos_weight': 1.5,  # Balance for your specific dataset
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'objective': 'binary:logistic',
+    'eval_metric': 'logloss',
+    'random_state': 42,
+}
+
+def prepare_data(df=None):
+    """Loads the dataset (or takes new raw records `df`), adds the engineered features and returns (X, y)."""
+    # 1. Get Data
+    df = get_live_dataset() if df is None else df
 
     # 2. Add Engineered Features
-    df = add_medical_features(df)
+    df = add_medical_features(df, STATUS_FEATURES)
 
     # 3. Define Features & Target
     # We exclude 'Status' (Target) and 'Stage' (due to its low accuracy)
     X = df.drop(columns=['Status', 'Stage'], errors='ignore')
     y = df['Status'].astype(int)
+    return X, y
+
+def run_pipeline(n_jobs=None):
+    print("Starting Automated Training Pipeline...")
+
+    X, y = prepare_data()
 
     # 4. Preprocessing Layers
     numeric_features = X.select_dtypes(include=['number']).columns
@@ -85,20 +96,10 @@ def run_pipeline():
         ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
     ])
 
-    # 5. XGBoost Model Configuration (Tuned for 125/187 ratio)
+    # 5. XGBoost Model
     model = Pipeline([
         ('preprocessor', preprocessor),
-        ('classifier', xgb.XGBClassifier(
-            n_estimators=250,
-            learning_rate=0.03,
-            max_depth=4,
-            scale_pos_weight=1.5, # Balance for your specific dataset
-            subsample=0.8,
-            colsample_bytree=0.8,
-            objective='binary:logistic',
-            eval_metric='logloss',
-            random_state=42
-        ))
+        ('classifier', xgb.XGBClassifier(**MODEL_PARAMS, n_jobs=n_jobs))
     ])
 
     # 6. Stratified Train-Test Split (80/20)
@@ -149,6 +150,11 @@ def run_pipeline():
     print(f"Saving model locally: {MODEL_FILENAME}")
     model.fit(X, y) # Retrain on full dataset
     joblib.dump(model, MODEL_FILENAME)
+    write_feature_manifest('hcv_status', model, X, source=DATASETS[DATASET])
 
 if __name__ == "__main__":
-    run_pipeline()
+    if '--search' in sys.argv:
+        from hyperparam_search import run_search
+        run_search(*prepare_data(), MODEL_PARAMS)
+    else:
+        run_pipeline()
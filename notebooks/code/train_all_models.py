@@ -0,0 +1,172 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Parallel training orchestrator for all six AiLDS models.
+    Every trainer runs at the same time in its own process. The CPU budget
+    (--cores, default: all cores) is split between the jobs, and each job's
+    XGBoost `n_jobs` (plus the OpenMP/BLAS pools, through threadpoolctl) is
+    set to its share, so the threads of the jobs running at once never add
+    up to more than --cores. Spare cores go to the costliest jobs (dataset
+    rows x trees from each trainer's MODEL_PARAMS). With fewer cores than
+    jobs, at most --cores single-threaded trainers run at once, heaviest first.
+
+    - Plots use the non-interactive Agg backend: `plt.show()` never blocks,
+      and confusion matrices are still saved where the trainers save them.
+    - Each trainer writes its artifact into --output-dir and its console
+      output into --output-dir/logs/<model>.log.
+    - Datasets come from the local, checksum-verified data/processed/ copy
+      (dataset_resolver.py); they are verified and their columnar caches
+      (dataset_store.py) built once, before the workers start.
+    - A timing summary is printed and written to training_summary.json.
+
+    Usage:
+        python train_all_models.py                               -> all six models, all cores
+        python train_all_models.py --cores 8 --only gate cancer  -> subset on an 8-core budget
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from threadpoolctl import threadpool_limits
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, CODE_DIR)
+sys.path.insert(0, os.path.join(CODE_DIR, 'train_HC_models'))
+from model_registry import MODEL_FILES
+from feature_manifest import manifest_filename
+from dataset_resolver import DATASETS, MODEL_DATASETS, preload
+from dataset_store import build_cache, read_schema
+
+# Registry name -> (trainer module, entry function)
+TRAINERS = {
+    'gate': ('train_gate_model', 'train_liver_prediction_model'),
+    'fatty_liver': ('train_fatty_liver_model', 'train_model'),
+    'cancer': ('train_cancer_model', 'train_model'),
+    'hcv_stage': ('train_HC_stage_model', 'train'),
+    'hcv_status': ('train_HC_status_model', 'run_pipeline'),
+    'hcv_complications': ('train_HC_complications', 'train_model'),
+}
+
+def training_cost(name):
+    """Relative training cost: dataset rows x trees (n_estimators rounds, one tree per class for multi-class)."""
+    params = importlib.import_module(TRAINERS[name][0]).MODEL_PARAMS
+    filename = DATASETS[MODEL_DATASETS[name]]
+    rows = (read_schema(filename) or build_cache(filename))['rows']
+    return rows * params.get('n_estimators', 100) * params.get('num_class', 1)
+
+def allocate_threads(names, cores, costs):
+    """Threads per job; summed over the jobs that run at the same time, never more than `cores`."""
+    if cores < len(names):
+        # Only `cores` jobs run at once (one per pool worker): one thread each
+        return {name: 1 for name in names}
+    share, spare = divmod(cores, len(names))
+    threads = {name: share for name in names}
+    for name in sorted(names, key=lambda n: -costs[n])[:spare]:
+        threads[name] += 1
+    return threads
+
+def _mtime(path):
+    """Modification time in ns, or None if the file does not exist."""
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+def run_trainer(name, n_threads, output_dir):
+    """Runs one trainer in this (worker) process. Returns its timing / artifact record."""
+    os.makedirs(os.path.join(output_dir, 'logs'), exist_ok=True)
+    os.chdir(output_dir)  # Trainers save artifacts in the working directory
+
+    module_name, function_name = TRAINERS[name]
+    record = {'model': name, 'threads': n_threads, 'ok': False, 'error': None}
+    # An artifact left by an earlier run must not count as this run's output
+    previous = _mtime(MODEL_FILES[name])
+    start = time.perf_counter()
+    with open(os.path.join('logs', f'{name}.log'), 'w') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            import matplotlib
+            matplotlib.use('Agg')
+            trainer = importlib.import_module(module_name)
+            # After the import, so every OpenMP/BLAS library the trainer uses is loaded and limited
+            with threadpool_limits(limits=n_threads):
+                getattr(trainer, function_name)(n_jobs=n_threads)
+            written = _mtime(MODEL_FILES[name])
+            record['ok'] = written is not None and written != previous
+            if not record['ok']:
+                record['error'] = f"{MODEL_FILES[name]} was not written"
+        except BaseException as e:  # Trainers exit via SystemExit on data errors
+            traceback.print_exc()
+            record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = time.perf_counter() - start
+    if record['ok']:
+        record['artifact'] = os.path.join(output_dir, MODEL_FILES[name])
+        record['bytes'] = os.path.getsize(MODEL_FILES[name])
+        if os.path.exists(manifest_filename(name)):
+            record['manifest'] = os.path.join(output_dir, manifest_filename(name))
+    return record
+
+def train_all(names=None, cores=None, output_dir='trained_models'):
+    names = list(names or TRAINERS)
+    cores = cores or os.cpu_count()
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    # Verify every dataset and build its cache once here: a bad checksum stops the run before any job starts
+    preload({MODEL_DATASETS[name] for name in names})
+    # Trainers import pyplot: headless backend before the first import (workers inherit the modules)
+    os.environ['MPLBACKEND'] = 'Agg'
+    costs = {name: training_cost(name) for name in names}
+    threads = allocate_threads(names, cores, costs)
+
+    print(f"Training {len(names)} models in parallel on a {cores}-core budget -> {output_dir}\n")
+    start = time.perf_counter()
+    # More jobs than cores: run at most `cores` at once, heaviest first
+    order = sorted(names, key=lambda n: -costs[n])
+    with ProcessPoolExecutor(max_workers=min(len(names), cores)) as pool:
+        futures = {name: pool.submit(run_trainer, name, threads[name], output_dir) for name in order}
+        records = [futures[name].result() for name in names]
+    wall = time.perf_counter() - start
+
+    print(f"{'Model':<18} | {'Threads':>7} | {'Time (s)':>8} | {'Artifact':<30} | {'Status'}")
+    print("-" * 84)
+    for r in records:
+        status = 'OK' if r['ok'] else f"FAILED ({r['error']})"
+        print(f"{r['model']:<18} | {r['threads']:>7} | {r['seconds']:>8.2f} | {MODEL_FILES[r['model']]:<30} | {status}")
+    print("-" * 84)
+    serial = sum(r['seconds'] for r in records)
+    print(f"Wall time: {wall:.2f} s | Slowest model: {max(r['seconds'] for r in records):.2f} s | "
+          f"Sum of model times: {serial:.2f} s")
+    print(f"Logs: {os.path.join(output_dir, 'logs')}")
+
+    summary = {'cores': cores, 'wall_seconds': wall, 'sum_model_seconds': serial, 'models': records}
+    with open(os.path.join(output_dir, 'training_summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train all AiLDS models in parallel")
+    parser.add_argument('--cores', type=int, default=None, help="CPU budget shared by all jobs (default: all)")
+    parser.add_argument('--only', nargs='+', choices=list(TRAINERS), default=None)
+    parser.add_argument('--output-dir', default='trained_models')
+    args = parser.parse_args()
+    if args.cores is not None and args.cores < 1:
+        parser.error("--cores must be at least 1")
+    summary = train_all(args.only, args.cores, args.output_dir)
+    if not all(r['ok'] for r in summary['models']):
+        sys.exit(1)
@@ -20,40 +20,44 @@ import pandas as pd
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
-from sklearn.preprocessing import LabelEncoder
 import joblib
 import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from feature_manifest import write_feature_manifest
+from dataset_resolver import DATASETS, resolve
+from dataset_store import load_dataset
+
 # Configuration
-DATASET_FILENAME = 'Liver_Patient_Dataset_Cleaned_19k.csv'
+DATASET = 'liver_patients_19k'
 MODEL_FILENAME = 'gate_model.pkl'
 
-# Direct link to the raw CSV file on GitHub
-GITHUB_RAW_URL = 'https://raw.githubusercontent.com/yahyazuher/AI-Liver-Diseases-Diagnosis-System/main/data/processed/Liver_Patient_Dataset_Cleaned_19k.csv'
-
-def download_dataset_if_missing():
-    if not os.path.exists(DATASET_FILENAME):
+# Hyperparameters are set to prevent overfitting on the cleaned dataset
+MODEL_PARAMS = {
+    'n_estimators': 200,
+    'learning_rate': 0.05,
+    'max_depth': 4,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'eval_metric': 'logloss',
+    'random_state': 42,
+}
+
+# Dataset target -> model class
+LABEL_MAP = {1: 0, 2: 1}
+
+def prepare_data(df=None):
+    """Loads the dataset (or takes new raw records `df`) and returns (X, y) ready for training."""
+    # 1. Data Acquisition (local data/processed/, checksum-verified)
+    if df is None:
+        print("Loading dataset...")
         try:
-            print(f"Dataset not found locally. Downloading from {GITHUB_RAW_URL}...")
-            # Read CSV directly from the raw GitHub URL
-            df = pd.read_csv(GITHUB_RAW_URL)
-            # Save to local disk for future runs
-            df.to_csv(DATASET_FILENAME, index=False)
-            print("Download successful. Dataset saved locally.")
+            df = load_dataset(resolve(DATASET))
         except Exception as e:
-            print(f"Error downloading dataset: {e}")
+            print(f"Error loading dataset: {e}")
             sys.exit(1)
 
-def train_liver_prediction_model():
-    print("Starting Liver Disease Prediction Pipeline...")
-
-    # 1. Data Acquisition
-    download_dataset_if_missing()
-
-    print("Loading dataset...")
-    df = pd.read_csv(DATASET_FILENAME)
-
     # Remove any inadvertent missing values
     df = df.dropna()
 
@@ -63,8 +67,17 @@ def train_liver_prediction_model():
 
     # 2. Label Encoding
     # Transforms target labels: 1 (Patient) -> 0, 2 (Healthy) -> 1
-    le = LabelEncoder()
-    y = le.fit_transform(y)
+    # (fixed mapping, so a batch of new records with one class is encoded the same way)
+    unknown = sorted(set(y.unique().tolist()) - set(LABEL_MAP))
+    if unknown:
+        raise ValueError(f"Unexpected target labels {unknown} (expected 1 = Patient, 2 = Healthy)")
+    y = y.map(LABEL_MAP).to_numpy()
+    return X, y
+
+def train_liver_prediction_model(n_jobs=None):
+    print("Starting Liver Disease Prediction Pipeline...")
+
+    X, y = prepare_data()
 
     # 3. Train-Test Split
     # Stratify ensures the training and test sets have the same proportion of class labels
@@ -74,16 +87,7 @@ def train_liver_prediction_model():
 
     # 4. Model Initialization
     print("Training XGBoost Classifier...")
-    # Hyperparameters are set to prevent overfitting on the cleaned dataset
-    model = xgb.XGBClassifier(
-        n_estimators=200,
-        learning_rate=0.05,
-        max_depth=4,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        eval_metric='logloss',
-        random_state=42
-    )
+    model = xgb.XGBClassifier(**MODEL_PARAMS, n_jobs=n_jobs)
 
     # 5. Model Training
     model.fit(X_train, y_train)
@@ -102,6 +106,11 @@ def train_liver_prediction_model():
     # Save the trained model to a file
     joblib.dump(model, MODEL_FILENAME)
     print(f"Model saved successfully: {MODEL_FILENAME}")
+    write_feature_manifest('gate', model, X, source=DATASETS[DATASET])
 
 if __name__ == "__main__":
-    train_liver_prediction_model()
+    if '--search' in sys.argv:
+        from hyperparam_search import run_search
+        run_search(*prepare_data(), MODEL_PARAMS)
+    else:
+        train_liver_prediction_model()
@@ -0,0 +1,198 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Array-backed tree evaluator.
+    `compile_booster` flattens every tree of a trained XGBoost booster into
+    contiguous arrays (feature index, float32 threshold, children, default
+    direction, leaf value). `CompiledModel` then evaluates all trees of a batch
+    together, level by level, with a handful of vectorized NumPy gathers per
+    level - no DataFrame, no DMatrix, no XGBoost predict call.
+
+    Split rule (same as XGBoost): go left if float32(x) < threshold,
+    missing values (NaN) follow the learned default direction.
+"""
+
+import json
+import numpy as np
+
+class CompiledTrees:
+    """Flattened forest. Leaves point to themselves, so extra levels are no-ops."""
+
+    def __init__(self, feature, threshold, children, default_right, value,
+                 roots, tree_group, max_depth, base_margin, objective, n_features):
+        self.feature = feature              # int32  [nodes]
+        self.threshold = threshold          # float32[nodes]
+        self.children = children            # int32  [nodes * 2] (left, right)
+        self.default_right = default_right  # int8   [nodes]
+        self.value = value                  # float32[nodes] (0 for internal nodes)
+        self.roots = roots                  # int32  [trees]
+        self.tree_group = tree_group        # int32  [trees] (class of each tree)
+        self.max_depth = max_depth
+        self.base_margin = base_margin      # float64[groups]
+        self.objective = objective
+        self.n_features = n_features
+        self.n_groups = len(base_margin)
+        # Tree -> class one-hot, turns per-tree leaf values into per-class margins
+        self.group_matrix = np.zeros((len(roots), self.n_groups), dtype=np.float32)
+        self.group_matrix[np.arange(len(roots)), tree_group] = 1.0
+
+    def split_thresholds(self):
+        """Sorted unique float32 split thresholds of every feature (empty if never split on)."""
+        internal = self.children[0::2] != np.arange(len(self.feature), dtype=np.int32)
+        return [np.unique(self.threshold[internal & (self.feature == f)]) for f in range(self.n_features)]
+
+    def arrays(self):
+        """All flat arrays by name (used for serialization)."""
+        return {
+            'feature': self.feature, 'threshold': self.threshold, 'children': self.children,
+            'default_right': self.default_right, 'value': self.value,
+            'roots': self.roots, 'tree_group': self.tree_group,
+        }
+
+def _base_margin(base_scores, objective):
+    """Converts the stored base_score into margin space for the given objective."""
+    base = np.array(base_scores, dtype=np.float64)
+    if objective == 'binary:logistic':
+        return np.log(base / (1 - base))
+    return base
+
+def compile_booster(booster):
+    """Flattens an xgboost.Booster into a CompiledTrees instance."""
+    learner = json.loads(booster.save_raw('json').decode())['learner']
+    objective = learner['objective']['name']
+    if objective not in ('binary:logistic', 'multi:softprob', 'multi:softmax'):
+        raise NotImplementedError(f"Objective '{objective}' is not supported by the tree compiler.")
+    model = learner['gradient_booster']['model']
+    params = learner['learner_model_param']
+    base_scores = [float(v) for v in params['base_score'].strip('[]').split(',')]
+
+    feature, threshold, children, default_right, value, roots = [], [], [], [], [], []
+    max_depth, offset = 0, 0
+    for tree in model['trees']:
+        if any(tree['split_type']):
+            raise NotImplementedError("Categorical splits are not supported by the tree compiler.")
+        left = np.array(tree['left_children'], dtype=np.int32)
+        right = np.array(tree['right_children'], dtype=np.int32)
+        cond = np.array(tree['split_conditions'], dtype=np.float32)
+        n = len(left)
+        is_leaf = left == -1
+        node_ids = np.arange(n, dtype=np.int32)
+
+        feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+        threshold.append(np.where(is_leaf, np.float32(0), cond))
+        pair = np.empty((n, 2), dtype=np.int32)
+        pair[:, 0] = np.where(is_leaf, node_ids, left) + offset
+        pair[:, 1] = np.where(is_leaf, node_ids, right) + offset
+        children.append(pair.ravel())
+        default_right.append((~np.array(tree['default_left'], dtype=bool)).astype(np.int8))
+        value.append(np.where(is_leaf, cond, np.float32(0)))
+        roots.append(offset)
+
+        # Depth of every node (parents always precede children in XGBoost's layout)
+        depth = np.zeros(n, dtype=np.int32)
+        for node in range(n):
+            if not is_leaf[node]:
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+        max_depth = max(max_depth, int(depth.max()))
+        offset += n
+
+    return CompiledTrees(
+        feature=np.concatenate(feature),
+        threshold=np.concatenate(threshold),
+        children=np.concatenate(children),
+        default_right=np.concatenate(default_right),
+        value=np.concatenate(value),
+        roots=np.array(roots, dtype=np.int32),
+        tree_group=np.array(model['tree_info'], dtype=np.int32),
+        max_depth=max_depth,
+        base_margin=_base_margin(base_scores, objective),
+        objective=objective,
+        n_features=int(params['num_feature']),
+    )
+
+# Rows walked together; keeps the (rows x trees) index arrays cache-resident
+BLOCK_ROWS = 256
+
+def _walk_block(trees, X):
+    """Walks all trees for one float32 block level by level; returns (rows x groups) margins."""
+    n = len(X)
+    flat_X = X.ravel()
+    row_offset = (np.arange(n, dtype=np.int32) * np.int32(trees.n_features))[:, None]
+    nodes = np.broadcast_to(trees.roots, (n, len(trees.roots))).copy()
+    has_missing = np.isnan(flat_X).any()
+
+    for _ in range(trees.max_depth):
+        x = flat_X.take(row_offset + trees.feature.take(nodes))
+        go_right = ~(x < trees.threshold.take(nodes))
+        if has_missing:
+            go_right = np.where(np.isnan(x), trees.default_right.take(nodes).astype(bool), go_right)
+        nodes = trees.children.take(2 * nodes + go_right)
+
+    return trees.value.take(nodes) @ trees.group_matrix + trees.base_margin
+
+def predict_margin(trees, X):
+    """Evaluates a float32 (N x features) batch; returns (N x groups) margins."""
+    if len(X) <= BLOCK_ROWS:
+        return _walk_block(trees, X)
+    margin = np.empty((len(X), trees.n_groups), dtype=np.float64)
+    for start in range(0, len(X), BLOCK_ROWS):
+        margin[start:start + BLOCK_ROWS] = _walk_block(trees, X[start:start + BLOCK_ROWS])
+    return margin
+
+class CompiledModel:
+    """
+    Drop-in predict/predict_proba over compiled trees.
+    Accepts plain or Pipeline (StandardScaler) models from the registry,
+    and NativeModel objects from native_models.py.
+    """
+
+    def __init__(self, trees, feature_names, classes, mean=None, scale=None):
+        self.trees = trees
+        self.feature_names_in_ = np.array(feature_names, dtype=object)
+        self.classes_ = np.asarray(classes)
+        self.mean_ = mean
+        self.scale_ = scale
+
+    @classmethod
+    def from_model(cls, model):
+        from native_models import NativeModel, split_model
+        if isinstance(model, NativeModel):
+            return cls(compile_booster(model.booster), model.feature_names_in_,
+                       model.classes_, model.mean_, model.scale_)
+        classifier, scaler, feature_names = split_model(model)
+        mean = None if scaler is None else scaler.mean_
+        scale = None if scaler is None else scaler.scale_
+        return cls(compile_booster(classifier.get_booster()), feature_names,
+                   classifier.classes_, mean, scale)
+
+    def transform(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        if self.mean_ is not None:
+            X = (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def predict_proba(self, X):
+        margin = predict_margin(self.trees, self.transform(X))
+        if self.trees.objective == 'binary:logistic':
+            p = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1 - p, p])
+        margin = margin - margin.max(axis=1, keepdims=True)
+        e = np.exp(margin)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -0,0 +1,221 @@
+"""
+[IMPORTANT NOTE / ملاحظة هامة]
+--------------------------------------------------
+English: This script is specifically designed and optimized to run in the GOOGLE COLAB environment.
+- It is configured to automatically download models and training files directly from GitHub.
+- Copy-pasting this code to other environments (local IDEs) may require adjustments
+  to file paths and library configurations.
+
+Arabic: Google Colab هذا الكود مخصص ومجهز للعمل مباشرة داخل بيئة
+- GitHub لضمان التشغيل الفوري تم إعداد الكود ليقوم بتحميل النماذج وملفات التدريب تلقائياً من
+- نسخ هذا الكود وتشغيله في تطبيقات أو بيئات أخرى قد يتطلب تعديلات في مسارات الملفات وإعدادات المكتبات.
+--------------------------------------------------
+Created by: Yahya Zuher
+Project: AI-Liver-Diseases-Diagnosis-System
+
+Description:
+    Pre-forked multi-process inference worker pool (Linux / fork start method).
+    The parent loads all six models from `models/` once, freezes them out of
+    the garbage collector (gc.freeze, so GC passes do not dirty shared pages)
+    and forks N workers that share those pages copy-on-write. Batches are
+    split into chunks and spread over the workers through one shared task queue.
+    Each worker runs XGBoost single-threaded, so N workers use N cores; the
+    thread count is set in the parent before forking (restored on close), so
+    workers never write to the shared model pages themselves.
+    `map` tags every chunk with a per-call id, drains its own chunks on error
+    and raises if a worker dies or no result arrives within `timeout` seconds.
+
+    Usage:
+        python worker_pool.py --max-workers 32   -> scaling + per-worker memory report
+"""
+
+import argparse
+import gc
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_HC_models'))
+from benchmark_utils import read_memory_mb
+from model_registry import MODEL_FILES, get_registry
+from test_HC_ALL_models import LiverDiseasePredictor
+
+TASK_TIMEOUT = 120.0  # Seconds `map` waits for the next chunk result
+POLL_SECONDS = 1.0    # Worker liveness check interval while waiting
+
+# Models loaded by the parent before forking (inherited by every worker)
+_STATE = {}
+
+def load_shared_models(model_path='models'):
+    registry = get_registry(model_path)
+    registry.warm_up()
+    hcv = LiverDiseasePredictor(model_path=model_path)
+    hcv.load_models()
+    _STATE['registry'] = registry
+    _STATE['hcv'] = hcv
+
+def score_batch(endpoint, X):
+    """gate / fatty_liver / cancer -> positive-class probability; hcv -> structured results."""
+    if endpoint == 'hcv':
+        return _STATE['hcv'].predict_batch(X)
+    return _STATE['registry'].get(endpoint).predict_proba(X)[:, 1]
+
+def _set_model_threads(n_jobs):
+    """Sets XGBoost threads on every loaded model; returns the previous n_jobs per model."""
+    previous = {}
+    for name in MODEL_FILES:
+        model = _STATE['registry'].get(name)
+        classifier = model.named_steps['classifier'] if hasattr(model, 'named_steps') else model
+        previous[name] = classifier.get_params()['n_jobs']
+        jobs = n_jobs[name] if isinstance(n_jobs, dict) else n_jobs
+        classifier.set_params(n_jobs=jobs)
+        classifier.get_booster().set_param({'nthread': jobs if jobs and jobs > 0 else 0})  # 0 = all cores
+    return previous
+
+def _worker_main(tasks, results):
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        call_id, chunk, endpoint, X = task
+        try:
+            results.put((call_id, chunk, score_batch(endpoint, X), None))
+        except Exception as e:
+            results.put((call_id, chunk, None, repr(e)))
+
+class WorkerPool:
+    def __init__(self, n_workers=None, model_path='models'):
+        self.n_workers = n_workers or os.cpu_count()
+        self.model_path = model_path
+        self.workers = []
+        self._calls = itertools.count()
+        self._saved_threads = None
+
+    def start(self):
+        if 'registry' not in _STATE:
+            load_shared_models(self.model_path)
+        # Single-threaded XGBoost (cores are shared across workers), set before the
+        # fork so the workers inherit it without writing to the shared pages
+        self._saved_threads = _set_model_threads(1)
+        # Move every loaded object to the permanent generation before forking
+        gc.collect()
+        gc.freeze()
+
+        ctx = mp.get_context('fork')
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+        self.workers = [
+            ctx.Process(target=_worker_main, args=(self.tasks, self.results), daemon=True)
+            for _ in range(self.n_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def _check_workers(self):
+        dead = [w for w in self.workers if not w.is_alive()]
+        if dead:
+            codes = ', '.join(f'pid {w.pid}: exit {w.exitcode}' for w in dead)
+            raise RuntimeError(f"{len(dead)} worker(s) died ({codes}); close and restart the pool.")
+
+    def _next_result(self, deadline):
+        """Next (call_id, chunk, result, error), checking worker liveness while waiting."""
+        while True:
+            try:
+                return self.results.get(timeout=max(0.0, min(POLL_SECONDS, deadline - time.monotonic())))
+            except queue.Empty:
+                self._check_workers()
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("No result from the worker pool within the timeout.")
+
+    def map(self, endpoint, X, chunk_rows=512, timeout=TASK_TIMEOUT):
+        """Scores X in chunks across the workers; results come back in input order."""
+        self._check_workers()
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            # Same result type as score_batch, without a round trip to the workers
+            return np.empty(0, dtype=_STATE['hcv'].result_dtype if endpoint == 'hcv' else np.float32)
+        call_id = next(self._calls)
+        chunks = range(0, len(X), chunk_rows)
+        for i, start in enumerate(chunks):
+            self.tasks.put((call_id, i, endpoint, X[start:start + chunk_rows]))
+
+        parts = [None] * len(chunks)
+        errors = []
+        pending = len(chunks)
+        while pending:
+            result_call, chunk, result, error = self._next_result(time.monotonic() + timeout)
+            if result_call != call_id:
+                continue  # Left over from an earlier call that timed out
+            pending -= 1
+            if error:
+                errors.append(f"chunk {chunk}: {error}")
+            else:
+                parts[chunk] = result
+        # Every chunk of this call has been received, so nothing is left queued for the next call
+        if errors:
+            raise RuntimeError(f"Worker failed on {len(errors)} of {len(chunks)} chunks; first {errors[0]}")
+        return np.concatenate(parts)
+
+    def memory(self):
+        return [read_memory_mb(w.pid) for w in self.workers]
+
+    def close(self):
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self.workers = []
+        gc.unfreeze()
+        if self._saved_threads is not None:
+            _set_model_threads(self._saved_threads)
+            self._saved_threads = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+def run_scaling_report(max_workers, endpoint='hcv', rows=20480, chunk_rows=512):
+    from model_inputs import sample_inputs
+
+    load_shared_models('models')
+    X = sample_inputs(endpoint, rows).to_numpy(dtype=np.float64)
+    parent = read_memory_mb()
+    print(f"Parent after loading all models: RSS {parent['rss_mb']:.1f} MB\n")
+
+    counts = sorted({1, max_workers} | {2 ** k for k in range(1, max_workers.bit_length()) if 2 ** k < max_workers})
+    print(f"Endpoint '{endpoint}': {rows} rows in chunks of {chunk_rows} (CPUs available: {os.cpu_count()})\n")
+    print(f"{'Workers':>7} | {'Rows/s':>10} | {'Speedup':>7} | {'RSS/worker (MB)':>15} | "
+          f"{'PSS/worker (MB)':>15} | {'USS/worker (MB)':>15}")
+    print("-" * 84)
+    baseline = None
+    for n in counts:
+        with WorkerPool(n) as pool:
+            pool.map(endpoint, X[:chunk_rows * n], chunk_rows)  # warm-up every worker
+            start = time.perf_counter()
+            pool.map(endpoint, X, chunk_rows)
+            rate = rows / (time.perf_counter() - start)
+            mem = pool.memory()
+        baseline = baseline or rate
+        avg = lambda key: np.mean([m[key] for m in mem])
+        print(f"{n:>7} | {rate:>10,.0f} | {rate / baseline:>6.2f}x | {avg('rss_mb'):>15.1f} | "
+              f"{avg('pss_mb'):>15.1f} | {avg('uss_mb'):>15.1f}")
+    print("-" * 84)
+    print("RSS counts shared pages in full; PSS splits them across sharers; USS is private to the worker.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-forked AiLDS inference worker pool")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--endpoint', default='hcv', choices=['gate', 'fatty_liver', 'cancer', 'hcv'])
+    parser.add_argument('--rows', type=int, default=20480)
+    args = parser.parse_args()
+    run_scaling_report(args.max_workers, args.endpoint, args.rows)